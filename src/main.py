@@ -6,7 +6,14 @@ Source for rules: Wikipedia - "Texas Hold em"
 #####################################################################################
 """
 
+import argparse
+
+from src.poker.blind_schedule import BlindSchedule
+from src.poker.enums.computer_playing_style import ComputerPlayingStyle
+from src.poker.enums.variant import Variant
 from src.poker.game import Game
+from src.poker.utils import cfr, equity
+from src.poker.utils.profiler import Profiler
 
 
 # TODO: Continue major refactor for readability, including smaller functions
@@ -17,7 +24,36 @@ from src.poker.game import Game
 # TODO: Look for bugs
 # TODO: Expand on current functionality
 def main():
-    Game().play()
+    parser = argparse.ArgumentParser(description="Texas Hold 'Em Poker")
+    parser.add_argument('--variant', choices=[variant.name.lower() for variant in Variant], default='holdem',
+                        help='the poker variant to play')
+    parser.add_argument('--styles', nargs='+', choices=[style.name for style in ComputerPlayingStyle],
+                        help='computer playing styles to pick from, defaults to every style but MCTS')
+    parser.add_argument('--run-it', type=int, default=1, metavar='TIMES',
+                        help='times to deal the rest of the board when players are all-in')
+    parser.add_argument('--blinds', metavar='FILE',
+                        help='JSON file with the blind and ante structure to play')
+    parser.add_argument('--profile', metavar='TRACE_FILE',
+                        help='time the game engine and write a Chrome trace file when the game ends')
+    parser.add_argument('--equity-cache', metavar='FILE',
+                        help='hand equity cache for computer players, filled with python -m src.poker.utils.equity')
+    parser.add_argument('--strategies', nargs='+', metavar='FILE', default=[],
+                        help='solved subgame strategies for computer players, from python -m src.poker.utils.cfr')
+    args = parser.parse_args()
+    if args.equity_cache:
+        equity.shared_calculator.cache = equity.EquityCache(args.equity_cache, read_only=True)
+    cfr.shared_tables.extend(cfr.StrategyTable(path, read_only=True) for path in args.strategies)
+    blind_schedule = BlindSchedule.from_file(args.blinds) if args.blinds else None
+    profiler = Profiler() if args.profile else None
+    try:
+        game = Game(blind_schedule, profiler, variant=Variant[args.variant.upper()],
+                    playing_styles=[ComputerPlayingStyle[style] for style in args.styles] if args.styles else None)
+        game.run_it_times = args.run_it
+        game.play()
+    finally:
+        if profiler:
+            profiler.export_chrome_trace(args.profile)
+            print(profiler.summary())
 
 
 if __name__ == '__main__':
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+
+
+class BlindLevel:
+    """A single level of a tournament blind structure.
+
+    A level lasts for a number of hands or a number of seconds. The last level
+    of a schedule may leave both unset, in which case it lasts until the end.
+
+    Attributes:
+        small_blind: The small blind bet during this level
+        big_blind: The big blind bet during this level
+        ante: The amount every player antes before each hand
+        hands: The number of hands the level lasts, or None
+        seconds: The number of seconds the level lasts, or None
+    """
+
+    def __init__(self, small_blind: int, big_blind: int, ante: int = 0,
+                 hands: int | None = None, seconds: float | None = None) -> None:
+        if small_blind < 0 or big_blind <= 0 or ante < 0:
+            raise ValueError(f'Illegal blind level. Blinds must be positive and ante cannot be negative '
+                             f'(got small blind {small_blind}, big blind {big_blind}, ante {ante}).')
+        if small_blind > big_blind:
+            raise ValueError(f'Illegal blind level. Small blind of {small_blind} '
+                             f'is greater than big blind of {big_blind}.')
+        if hands is not None and seconds is not None:
+            raise ValueError('Illegal blind level. A level lasts a number of hands or seconds, not both.')
+        if (hands is not None and hands <= 0) or (seconds is not None and seconds <= 0):
+            raise ValueError('Illegal blind level. Level duration must be positive.')
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.ante = ante
+        self.hands = hands
+        self.seconds = seconds
+
+    @classmethod
+    def from_dict(cls, data: dict) -> BlindLevel:
+        return cls(small_blind=data.get('small_blind', data['big_blind'] // 2),
+                   big_blind=data['big_blind'],
+                   ante=data.get('ante', 0),
+                   hands=data.get('hands'),
+                   seconds=data.get('seconds'))
+
+    def __str__(self) -> str:
+        """Returns a readable string representation of a BlindLevel.
+
+        Example:
+            50/100 ante 10
+        """
+        level_str = f'{self.small_blind}/{self.big_blind}'
+        if self.ante:
+            level_str += f' ante {self.ante}'
+        return level_str
+
+
+class BlindSchedule:
+    """A blind and ante structure shared by every table in a run.
+
+    The schedule keeps one clock for the whole run, so all tables sharing it
+    play at the same level. Hand-based levels count the hands dealt at the
+    busiest table, and time-based levels count seconds since the level began.
+
+    Attributes:
+        levels: The blind levels in the order they are played
+        level_index: The index of the level currently in play
+    """
+
+    def __init__(self, levels: list[BlindLevel], clock: Callable[[], float] = time.monotonic) -> None:
+        if not levels:
+            raise ValueError('A blind schedule needs at least one level.')
+        self.levels = levels
+        self.level_index = 0
+        self.hands_played = 0
+        self._clock = clock
+        self._level_start_hand = 0
+        self._level_start_time: float | None = None
+
+    @classmethod
+    def from_file(cls, path: str) -> BlindSchedule:
+        """Loads a blind schedule from a JSON file.
+
+        The file holds a list of levels, either at the top level or under a
+        "levels" key. Example:
+            {"levels": [{"small_blind": 10, "big_blind": 20, "hands": 10},
+                        {"small_blind": 25, "big_blind": 50, "ante": 5, "seconds": 600},
+                        {"small_blind": 50, "big_blind": 100, "ante": 10}]}
+
+        Args:
+            path: The path of the JSON file
+        """
+        # Imported here so that importing the engine does not pay for it
+        import json
+
+        with open(path) as file:
+            data = json.load(file)
+        if isinstance(data, dict):
+            data = data['levels']
+        return cls([BlindLevel.from_dict(level) for level in data])
+
+    @property
+    def current_level(self) -> BlindLevel:
+        return self.levels[self.level_index]
+
+    def advance(self, hands_played: int) -> BlindLevel:
+        """Moves the schedule forward and returns the level now in play.
+
+        Args:
+            hands_played: The number of hands a table has played so far
+        """
+        now = self._clock()
+        if self._level_start_time is None:
+            self._level_start_time = now
+        self.hands_played = max(self.hands_played, hands_played)
+        while self.level_index < len(self.levels) - 1:
+            level = self.current_level
+            if level.hands is not None and self.hands_played - self._level_start_hand >= level.hands:
+                self._level_start_hand += level.hands
+                self._level_start_time = now
+            elif level.seconds is not None and now - self._level_start_time >= level.seconds:
+                self._level_start_hand = self.hands_played
+                self._level_start_time += level.seconds
+            else:
+                break
+            self.level_index += 1
+        return self.current_level
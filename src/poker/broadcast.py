@@ -0,0 +1,150 @@
+"""
+#######################################################################################################################
+Fans the state of a table out to many subscribers as deltas. The state is a flat set of fields, such as the board, the
+pots, and each seat's name, chips, bet, and flags. Each change to the table is encoded once, as a line holding only the
+fields that changed, and the same encoded line is handed to every subscriber, so the work done per change grows with
+the size of the change, not with the size of the table times the number of subscribers.
+
+    KEYFRAME <seq> <key>=<value>...     Every field, sent to a subscriber when it subscribes
+    DELTA <seq> <key>=<value>... <key>  The fields that changed, and the keys of fields that were removed
+
+Each line is numbered, so a subscriber's replica can check that it has not missed a delta.
+#######################################################################################################################
+"""
+
+from __future__ import annotations
+
+from typing import Protocol
+
+from src.poker.card import Card
+from src.poker.players.player import Player
+from src.poker.table import Table
+
+
+class Subscriber(Protocol):
+    def send_line(self, data: bytes) -> None:
+        """Receives an encoded line, ending with a line break. The same bytes are given to every subscriber."""
+
+
+def card_code(card: Card) -> str:
+    """Returns how a card is written in a line, e.g. 10H or AS."""
+    return f'{card.rank_symbol}{card.suit_value}'
+
+
+def table_fields(players: list[Player], table: Table) -> dict[str, str]:
+    """Returns the fields of a table's state, with the players given in seat order."""
+    fields = {'board': ','.join(card_code(card) for card in table.community) or '-',
+              'pots': ','.join(str(pot[0]) for pot in table.pots) or '-'}
+    for seat, player in enumerate(players):
+        fields[f'name{seat}'] = player.name
+        fields[f'chips{seat}'] = str(player.chips)
+        fields[f'bet{seat}'] = str(player.bet)
+        fields[f'flags{seat}'] = ''.join(flag for flag, is_set in (('D', player.is_dealer), ('F', player.is_folded),
+                                                                   ('A', player.is_all_in),
+                                                                   ('O', not player.is_in_game)) if is_set)
+    return fields
+
+
+class TableBroadcaster:
+    """Sends the changes to a table's state to every subscriber.
+
+    Attributes:
+        fields: The current state of the table
+        seq: The number of the last change
+        subscribers: The subscribers that are sent every change
+    """
+
+    def __init__(self) -> None:
+        self.fields: dict[str, str] = {}
+        self.seq = 0
+        self.subscribers: set[Subscriber] = set()
+        self._keyframe: bytes | None = None
+
+    def subscribe(self, subscriber: Subscriber) -> None:
+        """Sends a subscriber the keyframe of the current state, then every change after it."""
+        self.subscribers.add(subscriber)
+        subscriber.send_line(self.keyframe())
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self.subscribers.discard(subscriber)
+
+    def update(self, fields: dict[str, str]) -> bytes | None:
+        """Sends every subscriber the delta from the current state to a new one.
+
+        Returns:
+            The encoded delta, or None if nothing changed
+        """
+        changes = [f'{key}={value}' for key, value in fields.items() if self.fields.get(key) != value]
+        changes += [key for key in self.fields if key not in fields]
+        if not changes:
+            return None
+        self.fields = dict(fields)
+        self.seq += 1
+        self._keyframe = None
+        data = f'DELTA {self.seq} {" ".join(changes)}\n'.encode()
+        self.send_line(data)
+        return data
+
+    def send_line(self, data: bytes) -> None:
+        """Sends every subscriber the same encoded line."""
+        for subscriber in self.subscribers:
+            subscriber.send_line(data)
+
+    def keyframe(self) -> bytes:
+        """Returns the encoded keyframe of the current state, encoding it at most once per change."""
+        if self._keyframe is None:
+            self._keyframe = ' '.join(['KEYFRAME', str(self.seq),
+                                       *(f'{key}={value}' for key, value in self.fields.items())]).encode() + b'\n'
+        return self._keyframe
+
+
+class TableReplica:
+    """A subscriber's copy of a table's state, kept up to date from keyframes and deltas.
+
+    Attributes:
+        fields: The state of the table as of the last line applied
+        seq: The number of the last line applied, or None before the first keyframe
+    """
+
+    def __init__(self) -> None:
+        self.fields: dict[str, str] = {}
+        self.seq: int | None = None
+
+    def apply(self, line: str) -> bool:
+        """Applies a keyframe or delta line.
+
+        Returns:
+            True if the line was a keyframe or delta, and False for any other line
+
+        Raises:
+            ValueError: If a delta does not follow the last line applied, so the replica needs a new keyframe
+        """
+        command, *words = line.split() or ['']
+        if command == 'KEYFRAME':
+            self.fields = {}
+        elif command == 'DELTA':
+            if self.seq is None or int(words[0]) != self.seq + 1:
+                raise ValueError(f'Cannot apply delta {words[0]} after {self.seq}. A new keyframe is needed.')
+        else:
+            return False
+        for change in words[1:]:
+            key, is_set, value = change.partition('=')
+            if is_set:
+                self.fields[key] = value
+            else:
+                self.fields.pop(key, None)
+        self.seq = int(words[0])
+        return True
+
+    def send_line(self, data: bytes) -> None:
+        """Applies a line, so that a replica in the same process can subscribe to a broadcaster directly."""
+        self.apply(data.decode())
+
+    def players(self) -> list[tuple[str, int, int, str]]:
+        """Returns the name, chips, bet, and flags of each seat, in seat order."""
+        players = []
+        while f'name{len(players)}' in self.fields:
+            seat = len(players)
+            players.append((self.fields[f'name{seat}'], int(self.fields[f'chips{seat}']),
+                            int(self.fields[f'bet{seat}']), self.fields[f'flags{seat}']))
+        return players
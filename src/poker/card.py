@@ -1,6 +1,4 @@
-from blessed import Terminal
-
-term = Terminal()
+from __future__ import annotations
 
 
 class Card:
@@ -18,6 +16,7 @@ class Card:
     """
     RANK_LOWEST = 2
     RANK_HIGHEST = 14
+    SUITS = ('C', 'D', 'H', 'S')
 
     rank_symbol = {
         2: '2',
@@ -35,10 +34,10 @@ class Card:
         14: 'A'
     }
     suit_symbol = {
-        'C': term.green('♣'),
-        'D': term.cyan('♦'),
-        'H': term.red('♥'),
-        'S': term.yellow('♠')
+        'C': '♣',
+        'D': '♦',
+        'H': '♥',
+        'S': '♠'
     }
 
     def __init__(self, rank: int, suit: str) -> None:
@@ -56,6 +55,15 @@ class Card:
         """
         return f'[{self.rank_symbol:<2}{self.suit_symbol}]'
 
+    def to_int(self) -> int:
+        """Returns a number from 0 to 51 identifying the card, ordered by rank then suit."""
+        return (self.rank_value - Card.RANK_LOWEST) * 4 + Card.SUITS.index(self.suit_value)
+
+    @classmethod
+    def from_int(cls, n: int) -> Card:
+        """Returns the card identified by a number from Card.to_int()."""
+        return cls(n // 4 + Card.RANK_LOWEST, Card.SUITS[n % 4])
+
     def __eq__(self, other: object) -> bool:
         """Returns true if other card is equal to this one."""
         if not isinstance(other, Card):
@@ -1,28 +1,41 @@
+from __future__ import annotations
+
 import random
 
 from src.poker.card import Card
 
 
 class Deck:
-    """A standard deck of 52 playing cards.
+    """A standard deck of 52 playing cards, or a short deck without the lowest ranks.
+
+    Args:
+        rng: The random number generator used to shuffle, or None to use the random module
+        lowest_rank: The lowest rank in the deck, such as 6 for a 36 card short deck
 
     Attributes:
         cards: A list of playing cards remaining in the deck
+        rng: The random number generator used to shuffle, or None to use the random module
+        lowest_rank: The lowest rank in the deck
     """
 
-    def __init__(self) -> None:
+    def __init__(self, rng: random.Random | None = None, lowest_rank: int = Card.RANK_LOWEST) -> None:
         self.cards = []
+        self.rng = rng
+        self.lowest_rank = lowest_rank
         self.refill()
 
     def refill(self) -> None:
-        """Refills deck with 52 standard playing cards."""
+        """Refills deck with every playing card from the lowest rank up."""
         suits = ['C', 'D', 'H', 'S']
         self.cards = [Card(rank, suit) for suit in suits for rank in
-                      range(Card.RANK_LOWEST, Card.RANK_HIGHEST + 1)]
+                      range(self.lowest_rank, Card.RANK_HIGHEST + 1)]
 
     def shuffle(self) -> None:
         """Shuffles the deck."""
-        random.shuffle(self.cards)
+        if self.rng:
+            self.rng.shuffle(self.cards)
+        else:
+            random.shuffle(self.cards)
 
     def deal(self, n: int) -> list[Card]:
         """Deals the specified number of cards from the deck.
@@ -5,3 +5,12 @@ class ComputerPlayingStyle(Enum):
     SAFE = auto()
     RISKY = auto()
     RANDOM = auto()
+    CALCULATED = auto()
+    MCTS = auto()
+    SOLVED = auto()
+    ADAPTIVE = auto()
+
+
+# The playing styles that are picked from when none are chosen. MCTS takes about 20ms a move, against well under 1ms for
+# the others, so it slows down interactive games and large tournaments, and is only played when chosen.
+DEFAULT_PLAYING_STYLES = [style for style in ComputerPlayingStyle if style is not ComputerPlayingStyle.MCTS]
@@ -0,0 +1,7 @@
+from enum import Enum, auto
+
+
+class Variant(Enum):
+    HOLDEM = auto()
+    OMAHA = auto()
+    SHORT_DECK = auto()
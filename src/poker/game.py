@@ -1,73 +1,312 @@
 from __future__ import annotations
 
+import math
 import random
 
+from src.poker.blind_schedule import BlindSchedule
+from src.poker.card import Card
 from src.poker.deck import Deck
 from src.poker.enums.betting_move import BettingMove
-from src.poker.enums.computer_playing_style import ComputerPlayingStyle
+from src.poker.enums.computer_playing_style import DEFAULT_PLAYING_STYLES, ComputerPlayingStyle
 from src.poker.enums.phase import Phase
+from src.poker.enums.variant import Variant
+from src.poker.player_stats import StatsTracker
 from src.poker.players.computer import Computer
 from src.poker.players.human import Human
 from src.poker.players.player import Player
 from src.poker.prompts import text_prompt
+from src.poker.showdown_batch import ShowdownBatch
 from src.poker.table import Table
-from src.poker.utils import hand_ranking_utils
-from src.poker.utils import io_utils
+from src.poker.utils import hand_ranking_utils, omaha, short_deck
+from src.poker.utils.equity import all_in_equities, score_runouts
 
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from fractions import Fraction
 
-class Game:
-    """Control center of the game."""
+    from src.poker.utils.lookup_tables import LookupTables
+    from src.poker.utils.profiler import Profiler
+
+
+# The number of hole cards dealt to each player, the lowest rank in the deck, and the hand ranker of each variant
+NUM_HOLE_CARDS = {Variant.HOLDEM: 2, Variant.OMAHA: omaha.NUM_HOLE_CARDS, Variant.SHORT_DECK: 2}
+LOWEST_RANKS = {Variant.HOLDEM: Card.RANK_LOWEST, Variant.OMAHA: Card.RANK_LOWEST,
+                Variant.SHORT_DECK: short_deck.RANK_LOWEST}
+HAND_RANKERS = {Variant.HOLDEM: hand_ranking_utils, Variant.OMAHA: omaha, Variant.SHORT_DECK: short_deck}
+
+# Works out all-in equities in the background, while the table is shown. It is created the first time it is needed.
+_equity_worker = None
+
+COMPUTER_NAMES = ['Homer', 'Bart', 'Lisa', 'Marge', 'Milhouse', 'Moe', 'Maggie', 'Nelson', 'Ralph']
+
+
+def generate_computer_names(n: int, taken_name: str | None = None) -> list[str]:
+    """Returns n unique computer player names in random order.
+
+    Once the list of names runs out, names are reused with a number after them.
+
+    Args:
+        n: The number of names to return
+        taken_name: A name already in use, such as the human player's
+    """
+    names = [name for name in COMPUTER_NAMES if name != taken_name]
+    random.shuffle(names)
+    if n > len(names):
+        names += [f'{names[i % len(names)]} {i // len(names) + 2}' for i in range(n - len(names))]
+    return names[:n]
 
-    def __init__(self):
+
+class Game:
+    """Control center of the game.
+
+    A game given a list of players skips the setup prompts. Pair it with a
+    silent presenter to run the game without a display. Set stats to a StatsTracker
+    to keep running statistics of how each player plays. Set run_it_times above 1 to
+    deal the rest of the board that many times when players are all-in before the
+    river, and split each pot by the share of the boards each player wins. The text
+    presenter shows each player's chance of winning before every card that is dealt
+    to players who are all-in, unless live_equities is turned off.
+
+    Args:
+        blind_schedule: The blind and ante structure to play, if any
+        profiler: Times the engine phases when given
+        presenter: Displays the game and prompts the user
+        players: The players seated at the table, in seat order
+        big_blind: The starting big blind of a game given a list of players
+        variant: The poker variant to deal and rank hands by
+        playing_styles: The playing styles to pick from at random for the computer players
+            the setup prompts create. Defaults to every style but MCTS, which is slow.
+    """
+
+    def __init__(self, blind_schedule: BlindSchedule | None = None, profiler: Profiler | None = None,
+                 presenter=text_prompt, players: list[Player] | None = None, big_blind: int = 0,
+                 variant: Variant = Variant.HOLDEM, playing_styles: list[ComputerPlayingStyle] | None = None):
         self.phase = Phase.PREFLOP
-        self.deck = Deck()
+        self.deck = Deck(lowest_rank=LOWEST_RANKS[variant])
         self.players = []
         self.dealer = None
-        self.table = Table()
+        self.table = Table(blind_schedule)
+        self.presenter = presenter
+        self.variant = variant
+        self.num_hole_cards = NUM_HOLE_CARDS[variant]
+        self.hand_ranker = HAND_RANKERS[variant]
+        # The variant's own lookup tables, picked once here so that scoring a hand never checks the variant
+        self.lookup_tables: LookupTables | None = short_deck.get_tables() if variant is Variant.SHORT_DECK else None
+        self.showdown_batch: ShowdownBatch | None = None
+        self.stats: StatsTracker | None = None
+        self.run_it_times = 1
+        self.playing_styles = playing_styles or DEFAULT_PLAYING_STYLES
+        self.live_equities = presenter is text_prompt
+        self.pending_showdown_pots: list[tuple[int, list[Player]]] = []
+        self.profiler = profiler
+        self.betting_players: list[Player] = []
+        self.betting_index = 0
+        self.hand_history: list[tuple[Phase, Player, BettingMove]] = []
+        self.is_hand_over = True
         self.short_pause = 1.0
         self.pause = 2.0
         self.long_pause = 3.0
-        self.setup()
+        if profiler:
+            self.instrument(profiler)
+        if players is None:
+            self.setup()
+        else:
+            self.players = players
+            self.table.big_blind = big_blind
+            for player in players:
+                if isinstance(player, Computer):
+                    self.seat_computer(player)
 
     def play(self) -> None:
         """Runs the main loop of the game."""
         while True:
-            self.reset_for_next_round()
-            for phase in Phase:
-                self.phase = phase
-                self.deal_cards()
-                self.run_round_of_betting()
-                if self.check_hand_over():
-                    break
-            self.determine_winners()
-            self.table.hands_played += 1
+            self.play_hand()
             if self.check_game_over():
                 break
 
+    def play_hand(self) -> None:
+        """Plays a single hand, from shuffling the deck to paying out the pots."""
+        self.reset()
+        while not self.is_terminal():
+            player = self.current_player()
+            move = player.choose_next_move(self.table.raise_amount, self.table.num_times_raised, self.table.last_bet)
+            self.step(move)
+
+    def reset(self) -> None:
+        """Starts a new hand and plays it up to the first decision.
+
+        Together with current_player(), legal_actions(), step(), and is_terminal(), this
+        lets the hand be driven one action at a time from outside the game, for example:
+
+            game.reset()
+            while not game.is_terminal():
+                game.step(choose(game.current_player(), game.legal_actions()))
+        """
+        self.is_hand_over = False
+        self.hand_history = []
+        self.reset_for_next_round()
+        if self.stats is not None:
+            self.stats.hand_started(self.get_active_players())
+        self.start_phase(Phase.PREFLOP)
+
+    def is_terminal(self) -> bool:
+        """Returns True once the hand is over and its pots have been paid out."""
+        return self.is_hand_over
+
+    def current_player(self) -> Player | None:
+        """Returns the player whose turn it is to act, or None if the hand is over."""
+        if self.is_hand_over:
+            return None
+        return self.betting_players[self.betting_index % len(self.betting_players)]
+
+    def legal_actions(self) -> list[BettingMove]:
+        """Returns the moves the current player may make, or an empty list if the hand is over.
+
+        A player who cannot cover a full raise may only call, go all-in, or fold, and
+        no more bets or raises are allowed once the table has raised 4 times.
+        """
+        player = self.current_player()
+        if player is None:
+            return []
+        check_or_call = BettingMove.CHECKED if player.bet == self.table.last_bet else BettingMove.CALLED
+        if player.chips <= abs(player.bet - self.table.raise_amount):
+            if player.chips <= abs(player.bet - self.table.last_bet):
+                return [BettingMove.ALL_IN, BettingMove.FOLDED]
+            return [check_or_call, BettingMove.ALL_IN, BettingMove.FOLDED]
+        if self.table.num_times_raised < 4:
+            bet_or_raise = BettingMove.BET if player.bet == self.table.last_bet else BettingMove.RAISED
+            return [check_or_call, bet_or_raise, BettingMove.FOLDED]
+        return [check_or_call, BettingMove.FOLDED]
+
+    def step(self, move: BettingMove) -> None:
+        """Makes the current player's move, then plays on to the next decision or the end of the hand.
+
+        Raises:
+            ValueError: If the hand is over or the move is not one of the legal actions
+        """
+        player = self.current_player()
+        if player is None:
+            raise ValueError(f'Cannot make move {move.name} since the hand is over.')
+        if move not in self.legal_actions():
+            raise ValueError(f'Player {player.name} made an illegal move. '
+                             f'Cannot make move {move.name} when the legal moves are '
+                             f'{", ".join(legal_move.name for legal_move in self.legal_actions())}.')
+        last_bet = self.table.last_bet
+        bet = player.bet
+        self.table.take_bet(player, move)
+        self.hand_history.append((self.phase, player, move))
+        if self.stats is not None:
+            self.stats.record_move(self.phase, player, move, bet < last_bet, self.table.last_bet > last_bet)
+        self.presenter.show_player_move(player, move, self.pause, player.bet)
+        if move is BettingMove.RAISED or move is BettingMove.BET:
+            for active_player in self.betting_players:
+                if not active_player.is_folded:
+                    active_player.is_locked = False
+            for person in self.betting_players:
+                if person.is_all_in:
+                    person.is_locked = True
+        if move is BettingMove.FOLDED and isinstance(player, Human):
+            self.set_game_speed(is_fast=True)
+        player.is_locked = True
+        self.betting_index += 1
+        self.presenter.show_table(self.players, self.table)
+        self.advance()
+
+    def start_phase(self, phase: Phase) -> None:
+        """Deals the cards of a phase and starts its round of betting."""
+        self.phase = phase
+        self.deal_cards()
+        if phase is Phase.FLOP and self.stats is not None:
+            self.stats.flop_dealt(self.get_active_players())
+        self.start_round_of_betting()
+        self.advance()
+
+    def advance(self) -> None:
+        """Moves on to the next player who has to act.
+
+        Finishes the round of betting when no one else has to act, then deals the next
+        phase, or pays out the pots if the hand is over.
+        """
+        while True:
+            if self.is_round_of_betting_over():
+                self.finish_round_of_betting()
+                if self.check_hand_over() or self.phase is Phase.RIVER:
+                    self.finish_hand()
+                    return
+                phases = list(Phase)
+                self.start_phase(phases[phases.index(self.phase) + 1])
+                return
+            player = self.betting_players[self.betting_index % len(self.betting_players)]
+            if not player.is_folded and not player.is_all_in:
+                self.table.update_raise_amount(self.phase)
+                return
+            self.betting_index += 1
+
+    def finish_hand(self) -> None:
+        self.determine_winners()
+        self.table.hands_played += 1
+        self.is_hand_over = True
+        if self.profiler:
+            self.profiler.hand_finished()
+
+    def instrument(self, profiler: Profiler) -> None:
+        """Times the engine phases and every presenter and hand ranker call with the given profiler."""
+        profiler.instrument(self, ['reset_for_next_round', 'deal_cards', 'start_round_of_betting', 'step',
+                                   'finish_round_of_betting', 'determine_winners', 'showdown',
+                                   'run_it_multiple_times', 'show_all_in_equities'])
+        profiler.instrument(self.table, ['calculate_side_pots'], prefix='table.')
+        self.presenter = profiler.instrument_namespace(self.presenter, 'presenter')
+        self.hand_ranker = profiler.instrument_namespace(self.hand_ranker, 'hand_ranker')
+
     def setup(self) -> None:
         """Sets up the game before any rounds are run."""
-        player_name = text_prompt.prompt_for_name()
-        num_computer_players = text_prompt.prompt_for_number_computer_players()
-        starting_chips = text_prompt.prompt_for_starting_chips()
+        player_name = self.presenter.prompt_for_name()
+        num_computer_players = self.presenter.prompt_for_number_computer_players()
+        starting_chips = self.presenter.prompt_for_starting_chips()
         self.create_players(player_name, num_computer_players, starting_chips)
+        if self.table.blind_schedule:
+            return
 
         max_blind = int(starting_chips / 10)
         min_blind = int(starting_chips / 50)
-        self.table.big_blind = text_prompt.prompt_for_big_blind(min_blind, max_blind)
+        self.table.big_blind = self.presenter.prompt_for_big_blind(min_blind, max_blind)
 
     def create_players(self, player_name, num_computer, starting_chips) -> None:
         human = Human(player_name)
         self.players.append(human)
-        names = ['Homer', 'Bart', 'Lisa', 'Marge', 'Milhouse', 'Moe', 'Maggie', 'Nelson', 'Ralph']
-        computer_names = [n for n in names if n != human.name]
-        random.shuffle(computer_names)
-        for _ in range(num_computer):
-            playing_style = random.choice(list(ComputerPlayingStyle))
-            computer = Computer(computer_names.pop(), playing_style)
+        for name in generate_computer_names(num_computer, taken_name=human.name):
+            playing_style = random.choice(self.playing_styles)
+            computer = Computer(name, playing_style)
+            self.seat_computer(computer)
             self.players.append(computer)
         for player in self.players:
             player.chips = starting_chips
 
+    def add_player(self, player: Player) -> None:
+        """Seats a player at the table, to the right of the last seat."""
+        self.players.append(player)
+        if isinstance(player, Computer):
+            self.seat_computer(player)
+
+    def seat_computer(self, computer: Computer) -> None:
+        """Lets a computer player see the game, and estimate equities by the variant's rules."""
+        computer.game = self
+        if self.variant is Variant.SHORT_DECK:
+            computer.equity_calculator = short_deck.shared_calculator
+
+    def remove_player(self, player: Player) -> None:
+        """Removes a player from the table.
+
+        If the player held the dealer button, the button is passed back to the
+        previous seat so that it moves on to the next seat next hand.
+        """
+        seat = self.players.index(player)
+        del self.players[seat]
+        if isinstance(player, Computer):
+            player.game = None
+        if player is self.dealer:
+            self.dealer = self.players[(seat - 1) % len(self.players)] if self.players else None
+
     def reset_for_next_round(self) -> None:
         """Gets players, table, and deck ready to play another hand."""
         active_players = self.get_active_players()
@@ -87,17 +326,18 @@ class Game:
 
     def reset_table(self) -> None:
         active_players = self.get_active_players()
+        previous_blinds = (self.table.big_blind, self.table.ante)
         self.table.reset(active_players)
-        if self.table.check_increase_big_blind():
-            text_prompt.clear_screen()
-            text_prompt.show_table(self.players, self.table)
-            text_prompt.show_blind_increase(self.table.big_blind, self.long_pause)
+        if self.table.hands_played > 0 and (self.table.big_blind, self.table.ante) != previous_blinds:
+            self.presenter.clear_screen()
+            self.presenter.show_table(self.players, self.table)
+            self.presenter.show_blind_increase(self.table.big_blind, self.long_pause, self.table.ante)
 
     def reset_deck(self) -> None:
         self.deck.refill()
         self.deck.shuffle()
-        text_prompt.clear_screen()
-        text_prompt.show_shuffling(self.pause)
+        self.presenter.clear_screen()
+        self.presenter.show_shuffling(self.pause)
 
     def set_game_speed(self, is_fast: bool) -> None:
         pass
@@ -122,7 +362,7 @@ class Game:
         for player in self.get_active_players():
             player.is_SB = False
             player.is_BB = False
-        if self.table.hands_played == 0:
+        if self.dealer is None:
             self.determine_positions_randomly()
         else:
             self.shift_positions_left()
@@ -130,8 +370,22 @@ class Game:
     def determine_positions_randomly(self) -> None:
         active_players = self.get_active_players()
         dealer_index = random.randrange(0, len(active_players))
-        active_players[dealer_index].is_dealer = True
+        self.set_positions(active_players, dealer_index)
+
+    def shift_positions_left(self) -> None:
+        """Passes the dealer button to the next seat still in the game."""
+        seat = self.players.index(self.dealer)
+        while True:
+            seat = (seat + 1) % len(self.players)
+            if self.players[seat].is_in_game:
+                break
+        active_players = self.get_active_players()
+        self.set_positions(active_players, active_players.index(self.players[seat]))
+
+    def set_positions(self, active_players: list[Player], dealer_index: int) -> None:
+        """Gives the dealer button to a player and the blinds to the players on their left."""
         self.dealer = active_players[dealer_index]
+        self.dealer.is_dealer = True
         # In 2 player poker, the dealer is SB and acts first pre-flop
         if len(active_players) == 2:
             active_players[dealer_index].is_SB = True
@@ -140,50 +394,32 @@ class Game:
             active_players[(dealer_index + 2) % len(active_players)].is_BB = True
             active_players[(dealer_index + 1) % len(active_players)].is_SB = True
 
-    def shift_positions_left(self) -> None:
-        active_players = self.get_active_players()
-        old_dealer_index = [player is self.dealer for player in self.players].index(True)
-        while True:
-            old_dealer_index += 1
-            player_to_left = self.players[old_dealer_index % len(self.players)]
-            if player_to_left in active_players:
-                self.dealer = player_to_left
-                player_to_left.is_dealer = True
-                new_dealer_index = next(i for i, player in enumerate(active_players) if player.is_dealer)
-                # in 2 player poker, the dealer is SB and acts first pre-flop
-                if len(active_players) == 2:
-                    active_players[new_dealer_index].is_SB = True
-                    active_players[(new_dealer_index + 1) % len(active_players)].is_BB = True
-                else:
-                    active_players[(new_dealer_index + 2) % len(active_players)].is_BB = True
-                    active_players[(new_dealer_index + 1) % len(active_players)].is_SB = True
-                break
-
     def deal_cards(self) -> None:
         """Deals cards to the hold and the community."""
         if self.phase is Phase.PREFLOP:
-            text_prompt.show_table(self.players, self.table)
-            text_prompt.show_phase_change_alert(self.phase, self.dealer.name, self.long_pause)
+            self.presenter.show_table(self.players, self.table)
+            self.presenter.show_phase_change_alert(self.phase, self.dealer.name, self.long_pause)
             self.deal_hole()
         elif self.phase is Phase.FLOP:
-            text_prompt.show_phase_change_alert(self.phase, self.dealer.name, self.long_pause)
+            self.presenter.show_phase_change_alert(self.phase, self.dealer.name, self.long_pause)
             self.deal_community(3)
         else:
-            text_prompt.show_phase_change_alert(self.phase, self.dealer.name, self.long_pause)
+            self.presenter.show_phase_change_alert(self.phase, self.dealer.name, self.long_pause)
             self.deal_community(1)
-        text_prompt.show_table(self.players, self.table)
+        self.presenter.show_table(self.players, self.table)
 
     def deal_hole(self) -> None:
-        """Deals two cards to each player.
+        """Deals the variant's number of hole cards to each player.
 
         In poker, you deal one card to each player at a time.
         """
-        text_prompt.show_table(self.players, self.table, self.short_pause)
-        text_prompt.show_dealing_hole(self.dealer.name, self.pause)
-        for i in range(2):
+        self.presenter.show_table(self.players, self.table, self.short_pause)
+        self.presenter.show_dealing_hole(self.dealer.name, self.pause)
+        for i in range(self.num_hole_cards):
             for player in self.get_active_players():
                 card = self.deck.deal(1)
                 player.hand.extend(card)
+                player.hand_evaluator.add(card[0])
 
     def deal_community(self, n: int) -> None:
         """Deals cards to the community.
@@ -194,40 +430,66 @@ class Game:
             n: The number of cards to deal to the community
         """
         self.deck.burn()
-        cards = self.deck.deal(n)
+        self.add_to_community(self.deck.deal(n))
+
+    def add_to_community(self, cards: list[Card]) -> None:
+        """Adds cards to the community and to the hand evaluator of each player still in the hand."""
         self.table.community.extend(cards)
+        for player in self.get_active_players():
+            if not player.is_folded:
+                for card in cards:
+                    player.hand_evaluator.add(card)
 
-    def run_round_of_betting(self):
-        """Runs a round of betting."""
+    def start_round_of_betting(self) -> None:
+        """Starts a round of betting, taking the antes and blinds before the flop."""
         self.table.num_times_raised = 0
-        active_players = self.get_active_players()
+        self.betting_players = self.get_active_players()
         if self.phase is Phase.PREFLOP:
+            if self.table.ante:
+                self.run_antes()
             self.run_small_blind_bet()
             self.run_big_blind_bet()
-        first_act = self.get_index_first_act()
-        # End round of betting when all but one player fold or when all unfolded players have locked in their bets
-        self.bet_util_all_locked_in(first_act, active_players)
-        for player in active_players:
+        self.betting_index = self.get_index_first_act()
+
+    def is_round_of_betting_over(self) -> bool:
+        """Checks if all unfolded players have locked in their bets, or all but one player folded."""
+        if all(player.is_locked or player.is_all_in for player in self.betting_players):
+            return True
+        return [player.is_folded for player in self.betting_players].count(False) == 1
+
+    def finish_round_of_betting(self) -> None:
+        """Unlocks the players still betting and moves the round's bets into the pots."""
+        for player in self.betting_players:
             if not player.is_folded and not player.is_all_in:
                 player.is_locked = False
-        self.table.calculate_side_pots(active_players)
-        text_prompt.show_table(self.players, self.table)
+        self.table.calculate_side_pots(self.betting_players)
+        self.presenter.show_table(self.players, self.table)
+
+    def run_antes(self) -> None:
+        self.presenter.show_bet_antes(self.table.ante, self.pause)
+        for player in self.table.take_antes(self.get_active_players()):
+            self.presenter.show_player_move(player, BettingMove.ALL_IN, self.pause)
+        self.presenter.show_table(self.players, self.table)
 
     def run_small_blind_bet(self) -> None:
         player = next(player for player in self.players if player.is_SB)
-        text_prompt.show_bet_blind(player.name, 'small', self.pause)
+        if player.is_all_in:
+            return
+        self.presenter.show_bet_blind(player.name, 'small', self.pause)
         wentAllIn = self.table.take_small_blind(player)
         if wentAllIn:
-            text_prompt.show_player_move(player, BettingMove.ALL_IN, self.pause)
-        text_prompt.show_table(self.players, self.table)
+            self.presenter.show_player_move(player, BettingMove.ALL_IN, self.pause)
+        self.presenter.show_table(self.players, self.table)
 
     def run_big_blind_bet(self) -> None:
         player = next(player for player in self.players if player.is_BB)
-        text_prompt.show_bet_blind(player.name, 'big', self.pause)
+        if player.is_all_in:
+            return
+        self.presenter.show_bet_blind(player.name, 'big', self.pause)
         wentAllIn = self.table.take_big_blind(player)
         if wentAllIn:
-            text_prompt.show_player_move(player, BettingMove.ALL_IN, self.pause)
-        text_prompt.show_table(self.players, self.table)
+            self.presenter.show_player_move(player, BettingMove.ALL_IN, self.pause)
+        self.presenter.show_table(self.players, self.table)
 
     def get_index_first_act(self) -> int:
         """Determines the index of the first act.
@@ -248,38 +510,6 @@ class Game:
             dealer_index = next(i for i, player in enumerate(active_players) if player.is_dealer)
             return (dealer_index + 1) % len(active_players)
 
-    def bet_util_all_locked_in(self, first_act: int, active_players: list[Player]) -> None:
-        betting_index = first_act
-        while True:
-            if all(player.is_locked or player.is_all_in for player in active_players):
-                break
-            if [player.is_folded for player in active_players].count(False) == 1:
-                break
-            betting_player = active_players[betting_index % len(active_players)]
-            if betting_player.is_folded or betting_player.is_all_in:
-                betting_index += 1
-                continue
-            self.table.update_raise_amount(self.phase)
-            move = betting_player.choose_next_move(self.table.raise_amount, self.table.num_times_raised,
-                                                   self.table.last_bet)
-            self.table.take_bet(betting_player, move)
-            text_prompt.show_player_move(betting_player, move, self.pause, betting_player.bet)
-            if move is BettingMove.RAISED or move is BettingMove.BET:
-                for active_player in active_players:
-                    if not active_player.is_folded:
-                        active_player.is_locked = False
-                for person in active_players:
-                    if person.is_all_in:
-                        person.is_locked = True
-            elif move is BettingMove.ALL_IN:
-                pass
-            # if move is BettingMove.FOLDED and betting_player.is_human:
-            if move is BettingMove.FOLDED and isinstance(betting_player, Human):
-                self.set_game_speed(is_fast=True)
-            betting_player.is_locked = True
-            betting_index += 1
-            text_prompt.show_table(self.players, self.table)
-
     def check_hand_over(self) -> bool:
         """Checks if the current hand is over.
 
@@ -303,8 +533,8 @@ class Game:
                 winnings += pot[0]
             winner = unfolded_players[0]
             winner.chips += winnings
-            text_prompt.show_table(self.players, self.table)
-            text_prompt.show_default_winner_fold(winner.name)
+            self.presenter.show_table(self.players, self.table)
+            self.presenter.show_default_winner_fold(winner.name)
         else:
             # If only 1 player is eligible for last side pot (i.e. other players folded/all-in), award player that pot
             players_eligible_last_pot = []
@@ -313,31 +543,162 @@ class Game:
                     players_eligible_last_pot.append(player)
             if len(players_eligible_last_pot) == 1:
                 hand_winner = players_eligible_last_pot[0]
-                text_prompt.show_table(self.players, self.table)
-                text_prompt.show_default_winner_eligibility(hand_winner.name, len(self.table.pots) - 1)
+                self.presenter.show_table(self.players, self.table)
+                self.presenter.show_default_winner_eligibility(hand_winner.name, len(self.table.pots) - 1)
                 hand_winner.chips += self.table.pots[-1][0]
                 self.table.pots = self.table.pots[:-1]
+            if self.run_it_times > 1 and len(self.table.community) < 5:
+                if self.live_equities:
+                    self.show_all_in_equities()
+                self.run_it_multiple_times()
+                return
             while len(self.table.community) < 5:
-                self.table.community.extend(self.deck.deal(1))
+                if self.live_equities:
+                    self.show_all_in_equities()
+                self.add_to_community(self.deck.deal(1))
             self.showdown()
 
+    def show_all_in_equities(self) -> None:
+        """Shows the table, then each player's chance of winning and of tying before the next card is dealt.
+
+        The chances are worked out by a background worker while the table is shown for the
+        short pause, over the cards no player can see, so folded hands count as unseen.
+        """
+        contenders = [player for player in self.get_active_players() if not player.is_folded]
+        holes = [[card.to_int() for card in player.hand] for player in contenders]
+        community = [card.to_int() for card in self.table.community]
+        seen = {card for hole in holes for card in hole}.union(community)
+        lowest_card = Card(self.deck.lowest_rank, Card.SUITS[0]).to_int()
+        unseen = [card for card in range(lowest_card, 52) if card not in seen]
+        global _equity_worker
+        if _equity_worker is None:
+            # Imported here so that importing the engine does not pay for it
+            from concurrent.futures import ThreadPoolExecutor
+
+            _equity_worker = ThreadPoolExecutor(max_workers=1)
+        equities = _equity_worker.submit(all_in_equities, holes, community, unseen, self.lookup_tables)
+        self.presenter.show_table(self.players, self.table, self.short_pause)
+        self.presenter.show_all_in_equities(contenders, equities.result(), self.short_pause)
+
+    def run_it_multiple_times(self) -> None:
+        """Deals the rest of the board run_it_times times, and splits each pot by the boards each player wins.
+
+        The first board is dealt to the table and shown at the showdown. Every board is
+        completed from the cards left in the deck, independently of the others, and all
+        of them are scored in one batch, with the community dealt so far broken down once.
+        """
+        num_to_come = 5 - len(self.table.community)
+        community = [card.to_int() for card in self.table.community]
+        remaining = [card.to_int() for card in self.deck.cards]
+        while len(self.table.community) < 5:
+            self.add_to_community(self.deck.deal(1))
+        runouts = [[card.to_int() for card in self.table.community[len(community):]]]
+        rand = (self.deck.rng or random).random
+        num_remaining = len(remaining)
+        for _ in range(self.run_it_times - 1):
+            # Shuffles only the first cards of the remaining deck, which is all a runout is dealt from
+            for i in range(num_to_come):
+                j = i + int(rand() * (num_remaining - i))
+                remaining[i], remaining[j] = remaining[j], remaining[i]
+            runouts.append(remaining[:num_to_come])
+        unfolded_players = [player for player in self.get_active_players() if not player.is_folded]
+        # Imported here so that importing the engine does not pay for it
+        from fractions import Fraction
+
+        strengths = score_runouts([[card.to_int() for card in player.hand] for player in unfolded_players], community,
+                                  runouts, self.lookup_tables)
+
+        self.presenter.show_table(self.players, self.table)
+        for pot_num, showdown_players in self.get_showdown_pots():
+            seats = [unfolded_players.index(player) for player in showdown_players]
+            # Shares of the pot are counted in units that every split of every board divides into evenly
+            units_per_board = math.lcm(*range(1, len(seats) + 1))
+            shares = [0] * len(seats)
+            for board_strengths in strengths:
+                pot_strengths = [board_strengths[seat] for seat in seats]
+                best = max(pot_strengths)
+                num_winners = pot_strengths.count(best)
+                if num_winners == 1:
+                    shares[pot_strengths.index(best)] += units_per_board
+                else:
+                    for i, strength in enumerate(pot_strengths):
+                        if strength == best:
+                            shares[i] += units_per_board // num_winners
+            # Fills in each player's best hand on the table's board, for the display
+            self.hand_ranker.determine_showdown_winner(showdown_players, self.table.community)
+            units = units_per_board * len(runouts)
+            hand_winners = [player for player, share in zip(showdown_players, shares) if share]
+            self.award_pot(pot_num, showdown_players, hand_winners,
+                           {player: Fraction(share, units) for player, share in zip(showdown_players, shares) if share})
+
     def showdown(self):
         """Runs the showdown phase."""
-        text_prompt.show_table(self.players, self.table)
+        self.presenter.show_table(self.players, self.table)
 
         # Need to fix this
         # text_prompt.show_phase_change_alert('Showdown', self.dealer, self.pause)
 
+        showdown_pots = self.get_showdown_pots()
+        if self.showdown_batch is not None:
+            self.showdown_batch.submit(self, [showdown_players for _, showdown_players in showdown_pots],
+                                       self.table.community, self.variant)
+            self.pending_showdown_pots = showdown_pots
+            return
         # Divvy chips to the winner(s) of each pot/side pot
+        for pot_num, showdown_players in showdown_pots:
+            hand_winners = self.hand_ranker.determine_showdown_winner(showdown_players, self.table.community)
+            self.award_pot(pot_num, showdown_players, hand_winners)
+
+    def get_showdown_pots(self) -> list[tuple[int, list[Player]]]:
+        """Returns the number of each pot to be won at the showdown and the unfolded players eligible for it.
+
+        Pots are returned from the last side pot to the main pot.
+        """
+        showdown_pots = []
         for i in reversed(range(len(self.table.pots))):
             showdown_players = []
             for player in self.table.pots[i][1]:
                 if not player.is_folded:
                     showdown_players.append(player)
-            hand_winners = hand_ranking_utils.determine_showdown_winner(showdown_players, self.table.community)
+            # Everyone eligible for this side pot folded, so it goes to the players of the pot before it
+            if not showdown_players and i > 0:
+                self.table.pots[i - 1][0] += self.table.pots[i][0]
+                continue
+            showdown_pots.append((i, showdown_players))
+        return showdown_pots
+
+    def award_pot(self, pot_num: int, showdown_players: list[Player], hand_winners: list[Player],
+                  shares: dict[Player, Fraction] | None = None) -> None:
+        """Pays a pot out to its winners, evenly unless each winner's share of it is given.
+
+        Given shares, which add up to 1, pay out the whole pot: each share is rounded down,
+        and the chips left over go one each to the winners whose shares lost the most.
+        """
+        if self.stats is not None:
+            self.stats.record_showdown(showdown_players, hand_winners)
+        pot = self.table.pots[pot_num][0]
+        if shares is None:
             for winner in hand_winners:
-                winner.chips += int(self.table.pots[i][0] / len(hand_winners))
-            text_prompt.show_showdown_results(self.players, self.table, hand_winners, showdown_players, pot_num=i)
+                winner.chips += int(pot / len(hand_winners))
+        else:
+            payouts = {winner: math.floor(pot * shares[winner]) for winner in hand_winners}
+            num_left_over = pot - sum(payouts.values())
+            remainders = sorted(hand_winners, key=lambda winner: pot * shares[winner] - payouts[winner], reverse=True)
+            for winner in remainders[:num_left_over]:
+                payouts[winner] += 1
+            for winner, payout in payouts.items():
+                winner.chips += payout
+        self.presenter.show_showdown_results(self.players, self.table, hand_winners, showdown_players, pot_num=pot_num)
+
+    def finish_batched_showdown(self, pot_winners: list[list[Player]]) -> None:
+        """Awards the pots of a showdown that was scored by the showdown batch.
+
+        Args:
+            pot_winners: The winners of each pot, in the order the pots were submitted
+        """
+        for (pot_num, showdown_players), hand_winners in zip(self.pending_showdown_pots, pot_winners):
+            self.award_pot(pot_num, showdown_players, hand_winners)
+        self.pending_showdown_pots = []
 
     def check_game_over(self):
         """Checks if the game is over.
@@ -353,21 +714,16 @@ class Game:
                 player.is_in_game = False
         active_players = self.get_active_players()
         if len(active_players) == 1:
-            text_prompt.show_table(self.players, self.table)
-            text_prompt.show_game_winners(self.players, [active_players[0].name])
+            self.presenter.show_table(self.players, self.table)
+            self.presenter.show_game_winners(self.players, [active_players[0].name])
             return True
-        else:
-            while True:
-                text_prompt.clear_screen()
-                user_choice = io_utils.input_no_return(
-                    "Continue on to next hand? Press (enter) to continue or (n) to stop.   ")
-                if 'n' in user_choice.lower():
-                    max_chips = max(self.get_active_players(), key=lambda player: player.chips).chips
-                    winners_names = [player.name for player in self.get_active_players() if player.chips == max_chips]
-                    text_prompt.show_table(self.players, self.table)
-                    text_prompt.show_game_winners(self.players, winners_names)
-                    return True
-                return False
+        elif not self.presenter.prompt_continue_game():
+            max_chips = max(self.get_active_players(), key=lambda player: player.chips).chips
+            winners_names = [player.name for player in self.get_active_players() if player.chips == max_chips]
+            self.presenter.show_table(self.players, self.table)
+            self.presenter.show_game_winners(self.players, winners_names)
+            return True
+        return False
 
     def get_active_players(self) -> list[Player]:
         return [player for player in self.players if player.is_in_game]
@@ -0,0 +1,288 @@
+"""
+#######################################################################################################################
+A compact hand in progress, for searching through the betting. It follows the same rules as Game and Table, but holds
+only numbers: chips and bets in flat lists indexed by seat, folded, all-in, and locked players in bitmasks, and cards
+as numbers from Card.to_int(). The pots of earlier rounds and the deck are tuples that are shared, never changed, by
+every copy, so copying a state only copies two short lists.
+
+A search copies the state before trying a move, and restores it by going back to the copy:
+
+    child = state.copy()
+    child.apply(move)
+#######################################################################################################################
+"""
+
+from __future__ import annotations
+
+import random
+
+from src.poker.card import Card
+from src.poker.enums.betting_move import BettingMove
+from src.poker.enums.phase import Phase
+from src.poker.utils import omaha
+from src.poker.utils.lookup_tables import get_tables
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from src.poker.game import Game
+    from src.poker.players.player import Player
+
+PHASES = list(Phase)
+
+
+class HandState:
+    """A hand of fixed-limit hold'em in progress, from the current decision to the end of the hand.
+
+    Seats are numbered in the order of the players still in the game.
+
+    Attributes:
+        chips: The chips each seat has left
+        bets: The chips each seat has bet in the current round of betting
+        pots: The (chips, bitmask of eligible seats) of each pot from earlier rounds of betting
+        hole: The hole cards of each seat
+        board: The community cards dealt so far
+        current: The seat whose turn it is to act
+        is_terminal: True once the hand is over and the pots are paid out
+        lookup_tables: The lookup tables of the game's variant, if it has its own hand rankings
+        lowest_card: The card number of the lowest card in the game's deck
+    """
+
+    __slots__ = ('num_seats', 'big_blind', 'phase', 'dealer', 'current', 'chips', 'bets', 'folded', 'all_in',
+                 'locked', 'last_bet', 'num_times_raised', 'all_in_bets', 'pots', 'hole', 'board', 'deck',
+                 'deck_index', 'is_terminal', 'lookup_tables', 'lowest_card')
+
+    @classmethod
+    def from_game(cls, game: Game, player: Player | None = None, rng: random.Random | None = None) -> HandState:
+        """Takes a snapshot of the decision a game is waiting on.
+
+        Args:
+            game: A game part way through a hand, between steps
+            player: If given, the cards this player cannot see, the other players' hole
+                cards and the cards still to come, are dealt again at random
+            rng: Deals the cards the player cannot see
+
+        Raises:
+            ValueError: If the game's hand is over
+        """
+        if game.is_terminal():
+            raise ValueError('Cannot take a snapshot of a hand that is over.')
+        players = game.betting_players
+        state = cls.__new__(cls)
+        state.num_seats = len(players)
+        state.big_blind = game.table.big_blind
+        state.phase = PHASES.index(game.phase)
+        state.dealer = next(seat for seat, other in enumerate(players) if other.is_dealer)
+        state.current = game.betting_index % len(players)
+        state.chips = [other.chips for other in players]
+        state.bets = [other.bet for other in players]
+        state.folded = _mask(other.is_folded for other in players)
+        state.all_in = _mask(other.is_all_in for other in players)
+        state.locked = _mask(other.is_locked for other in players)
+        state.last_bet = game.table.last_bet
+        state.num_times_raised = game.table.num_times_raised
+        state.all_in_bets = tuple(game.table.pot_transfers)
+        state.pots = tuple((amount, _mask(other in eligible for other in players))
+                           for amount, eligible in game.table.pots)
+        state.hole = tuple(tuple(card.to_int() for card in other.hand) for other in players)
+        state.board = tuple(card.to_int() for card in game.table.community)
+        # Cards are dealt from the end of the deck
+        state.deck = tuple(card.to_int() for card in reversed(game.deck.cards))
+        state.deck_index = 0
+        state.is_terminal = False
+        state.lookup_tables = game.lookup_tables
+        state.lowest_card = Card(game.deck.lowest_rank, Card.SUITS[0]).to_int()
+        if player is not None:
+            state.redeal_unseen(players.index(player), rng or random.Random())
+        return state
+
+    def redeal_unseen(self, seat: int, rng: random.Random) -> None:
+        """Deals the other seats' hole cards and the cards still to come again, from the cards a seat cannot see."""
+        seen = set(self.hole[seat]) | set(self.board)
+        unseen = [card for card in range(self.lowest_card, 52) if card not in seen]
+        rng.shuffle(unseen)
+        hole = []
+        for other, cards in enumerate(self.hole):
+            if other == seat:
+                hole.append(cards)
+            else:
+                hole.append(tuple(unseen[:len(cards)]))
+                del unseen[:len(cards)]
+        self.hole = tuple(hole)
+        self.deck = tuple(unseen)
+        self.deck_index = 0
+
+    def copy(self) -> HandState:
+        state = HandState.__new__(HandState)
+        for name in HandState.__slots__:
+            setattr(state, name, getattr(self, name))
+        state.chips = self.chips.copy()
+        state.bets = self.bets.copy()
+        return state
+
+    @property
+    def raise_amount(self) -> int:
+        """The bet to match after betting or raising, as in Table.update_raise_amount."""
+        if self.phase <= PHASES.index(Phase.FLOP):
+            return self.last_bet + self.big_blind
+        return self.last_bet + self.big_blind * 2
+
+    def legal_actions(self) -> list[BettingMove]:
+        """Returns the moves the current seat may make, as in Game.legal_actions."""
+        if self.is_terminal:
+            return []
+        seat = self.current
+        chips, bet = self.chips[seat], self.bets[seat]
+        check_or_call = BettingMove.CHECKED if bet == self.last_bet else BettingMove.CALLED
+        if chips <= abs(bet - self.raise_amount):
+            if chips <= abs(bet - self.last_bet):
+                return [BettingMove.ALL_IN, BettingMove.FOLDED]
+            return [check_or_call, BettingMove.ALL_IN, BettingMove.FOLDED]
+        if self.num_times_raised < 4:
+            bet_or_raise = BettingMove.BET if bet == self.last_bet else BettingMove.RAISED
+            return [check_or_call, bet_or_raise, BettingMove.FOLDED]
+        return [check_or_call, BettingMove.FOLDED]
+
+    def apply(self, move: BettingMove) -> None:
+        """Makes the current seat's move, then plays on to the next decision or the end of the hand.
+
+        The move must be one of the legal actions.
+        """
+        seat = self.current
+        bit = 1 << seat
+        if move is BettingMove.CHECKED or move is BettingMove.CALLED:
+            self._match(seat, self.last_bet)
+        elif move is BettingMove.RAISED or move is BettingMove.BET:
+            self.num_times_raised += 1
+            self.last_bet = self.raise_amount
+            self._match(seat, self.last_bet)
+            # Everyone still in the hand has to act again, except players who are all-in
+            self.locked = self.locked & self.folded | self.all_in
+        elif move is BettingMove.ALL_IN:
+            self.bets[seat] += self.chips[seat]
+            self.chips[seat] = 0
+            self.all_in |= bit
+            self.all_in_bets = tuple(sorted(set(self.all_in_bets) | {self.bets[seat]}))
+            self.last_bet = max(self.last_bet, self.bets[seat])
+        else:
+            self.folded |= bit
+        self.locked |= bit
+        self.current = (seat + 1) % self.num_seats
+        self._advance()
+
+    def payouts(self) -> list[int]:
+        """Returns the chips each seat wins from the pots. Only meaningful once the hand is over."""
+        payouts = [0] * self.num_seats
+        if not self.is_terminal:
+            return payouts
+        unfolded = [seat for seat in range(self.num_seats) if not self.folded >> seat & 1]
+        pots = [[amount, eligible] for amount, eligible in self.pots]
+        if pots and pots[-1][0] == 0:
+            pots.pop()
+        if len(unfolded) == 1:
+            payouts[unfolded[0]] = sum(amount for amount, _ in pots)
+            return payouts
+        # A last pot that only one unfolded player is eligible for goes to that player
+        eligible = [seat for seat in unfolded if pots[-1][1] >> seat & 1]
+        if len(eligible) == 1:
+            payouts[eligible[0]] += pots.pop()[0]
+        if len(self.hole[unfolded[0]]) == omaha.NUM_HOLE_CARDS:
+            board = omaha.OmahaBoard(list(self.board))
+            strengths = [board.score(list(self.hole[seat])) if seat in unfolded else 0
+                         for seat in range(self.num_seats)]
+        else:
+            tables = self.lookup_tables or get_tables()
+            strengths = [tables.hand_strength(list(self.hole[seat] + self.board)) if seat in unfolded else 0
+                         for seat in range(self.num_seats)]
+        for i in reversed(range(len(pots))):
+            eligible = [seat for seat in unfolded if pots[i][1] >> seat & 1]
+            # Everyone eligible for this side pot folded, so it goes to the players of the pot before it
+            if not eligible and i > 0:
+                pots[i - 1][0] += pots[i][0]
+                continue
+            best = max(strengths[seat] for seat in eligible)
+            winners = [seat for seat in eligible if strengths[seat] == best]
+            for seat in winners:
+                payouts[seat] += int(pots[i][0] / len(winners))
+        return payouts
+
+    def _match(self, seat: int, amount: int) -> None:
+        self.chips[seat] -= amount - self.bets[seat]
+        self.bets[seat] = amount
+
+    def _advance(self) -> None:
+        """Moves on to the next seat that has to act, as in Game.advance."""
+        while True:
+            if self._is_round_of_betting_over():
+                self._finish_round_of_betting()
+                able_to_bet = ~(self.folded | self.all_in) & ((1 << self.num_seats) - 1)
+                if bin(able_to_bet).count('1') < 2 or self.phase == len(PHASES) - 1:
+                    self._finish_hand()
+                    return
+                self._start_phase(self.phase + 1)
+                continue
+            if not (self.folded | self.all_in) >> self.current & 1:
+                return
+            self.current = (self.current + 1) % self.num_seats
+
+    def _is_round_of_betting_over(self) -> bool:
+        everyone = (1 << self.num_seats) - 1
+        if self.locked | self.all_in == everyone:
+            return True
+        return bin(~self.folded & everyone).count('1') == 1
+
+    def _finish_round_of_betting(self) -> None:
+        """Unlocks the seats still betting and moves the round's bets into the pots, as in Table.calculate_side_pots."""
+        self.locked &= self.folded | self.all_in
+        bets = self.bets
+        pots = [list(pot) for pot in self.pots]
+        if self.all_in_bets:
+            transfers = sorted(self.all_in_bets)
+            net_transfers = [transfers[0]] + [transfers[i + 1] - transfers[i] for i in range(len(transfers) - 1)]
+            for i, net_transfer in enumerate(net_transfers):
+                for seat in range(self.num_seats):
+                    if bets[seat] == 0:
+                        continue
+                    if bets[seat] < net_transfer:
+                        pots[-1][0] += bets[seat]
+                        bets[seat] = 0
+                    else:
+                        bets[seat] -= net_transfer
+                        pots[-1][0] += net_transfer
+                if i == len(net_transfers) - 1:
+                    eligible = ~(self.folded | self.all_in) & ((1 << self.num_seats) - 1)
+                else:
+                    eligible = _mask(bet > 0 for bet in bets)
+                pots.append([0, eligible])
+        for seat in range(self.num_seats):
+            if bets[seat]:
+                pots[-1][0] += bets[seat]
+                bets[seat] = 0
+        self.pots = tuple((amount, eligible) for amount, eligible in pots)
+        self.all_in_bets = ()
+
+    def _start_phase(self, phase: int) -> None:
+        """Deals the community cards of a phase and starts its round of betting."""
+        self.phase = phase
+        # A card is burned before dealing to the community
+        num_cards = 3 if PHASES[phase] is Phase.FLOP else 1
+        self.board += self.deck[self.deck_index + 1:self.deck_index + 1 + num_cards]
+        self.deck_index += 1 + num_cards
+        self.num_times_raised = 0
+        # The first to act after the flop is left of the dealer, or the dealer when heads-up
+        self.current = self.dealer if self.num_seats == 2 else (self.dealer + 1) % self.num_seats
+
+    def _finish_hand(self) -> None:
+        # Cards still to come are dealt without burning any
+        missing = 5 - len(self.board)
+        self.board += self.deck[self.deck_index:self.deck_index + missing]
+        self.deck_index += missing
+        self.is_terminal = True
+
+
+def _mask(flags) -> int:
+    """Returns a bitmask with bit n set if the nth flag is true."""
+    mask = 0
+    for seat, flag in enumerate(flags):
+        if flag:
+            mask |= 1 << seat
+    return mask
@@ -0,0 +1,197 @@
+"""
+#######################################################################################################################
+Load generator for the poker server. It opens many connections from one event loop: players that join tables and
+answer every TURN with a random legal move, rejoining when their table is over, watchers that keep a replica of a
+random table's state and move on to another table when it is over, and idle connections that never send anything. It
+reports how many lines the players and watchers received and how many moves the players made per second.
+
+    python -m src.poker.load_generator --port 7777 --players 600 --watchers 5000 --idle 5000 --seconds 30
+
+Add --serve to start a server on the same event loop first, so that everything runs on localhost in one command.
+#######################################################################################################################
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+
+from src.poker.broadcast import TableReplica
+from src.poker.server import PokerServer
+
+
+class LoadStats:
+    """Counts of what the load generator's connections did.
+
+    Attributes:
+        connected: The connections opened
+        failed: The connections that could not be opened
+        lines: The lines received by the players
+        moves: The moves made by the players
+        tables: The tables the players were seated at
+        watched: The lines received by the watchers
+        errors: The ERROR lines received by the players, and the deltas the watchers could not apply
+        elapsed: The seconds the load ran for
+    """
+
+    def __init__(self) -> None:
+        self.connected = 0
+        self.failed = 0
+        self.lines = 0
+        self.moves = 0
+        self.tables = 0
+        self.watched = 0
+        self.errors = 0
+        self.elapsed = 0.0
+
+    def __str__(self) -> str:
+        elapsed = self.elapsed or 1.0
+        return (f'{self.connected:,} connections open, {self.failed:,} failed, {self.tables:,} seats taken, '
+                f'{self.lines / elapsed:,.0f} lines and {self.moves / elapsed:,.0f} moves per second, '
+                f'{self.watched / elapsed:,.0f} lines watched per second, '
+                f'{self.errors:,} errors')
+
+
+async def play(host: str, port: int, name: str, stats: LoadStats, rng: random.Random) -> None:
+    """Connects a player that joins a table, makes random moves, and rejoins when it is out or its table is over."""
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        stats.failed += 1
+        return
+    stats.connected += 1
+    try:
+        writer.write(f'JOIN {name}\n'.encode())
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            stats.lines += 1
+            words = line.decode().split()
+            if words[0] == 'TURN':
+                # Check or call most of the time, so that hands reach the showdown
+                move = words[1] if rng.random() < 0.7 else rng.choice(words[1:])
+                writer.write(f'MOVE {move}\n'.encode())
+                stats.moves += 1
+            elif words[0] == 'SEATED':
+                stats.tables += 1
+            elif words[0] in ('OUT', 'GAMEOVER'):
+                writer.write(f'JOIN {name}\n'.encode())
+            elif words[0] == 'ERROR':
+                stats.errors += 1
+    finally:
+        writer.close()
+
+
+async def watch(host: str, port: int, stats: LoadStats, rng: random.Random) -> None:
+    """Connects a watcher that keeps a replica of a random table, and watches another when its table is over."""
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        stats.failed += 1
+        return
+    stats.connected += 1
+    replica = TableReplica()
+    try:
+        writer.write(b'TABLES\n')
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            stats.watched += 1
+            words = line.decode().split()
+            if words[0] == 'TABLES':
+                if len(words) == 1:
+                    await asyncio.sleep(0.01)
+                    writer.write(b'TABLES\n')
+                else:
+                    writer.write(f'WATCH {rng.choice(words[1:])}\n'.encode())
+            elif words[0] in ('GAMEOVER', 'ERROR'):
+                # The table is over, or was over before the watcher got to it
+                writer.write(b'TABLES\n')
+            else:
+                try:
+                    replica.apply(line.decode())
+                except ValueError:
+                    stats.errors += 1
+    finally:
+        writer.close()
+
+
+async def idle(host: str, port: int, stats: LoadStats) -> None:
+    """Opens a connection that sends nothing and reads whatever it is sent."""
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        stats.failed += 1
+        return
+    stats.connected += 1
+    try:
+        while await reader.read(1 << 12):
+            pass
+    finally:
+        writer.close()
+
+
+async def run_load(host: str, port: int, num_players: int, num_idle: int, seconds: float,
+                   seed: int | None = None, num_watchers: int = 0) -> LoadStats:
+    """Runs players, watchers, and idle connections against a server for a number of seconds.
+
+    Args:
+        host: The server's address
+        port: The server's port
+        num_players: The number of connections that play
+        num_idle: The number of connections that stay idle
+        seconds: How long to run for
+        seed: Seeds the players' moves and the watchers' tables, so that a run can be repeated
+        num_watchers: The number of connections that watch tables
+
+    Returns:
+        What the connections did
+    """
+    stats = LoadStats()
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    tasks = [asyncio.ensure_future(idle(host, port, stats)) for _ in range(num_idle)]
+    tasks += [asyncio.ensure_future(play(host, port, f'Bot{i}', stats, rng)) for i in range(num_players)]
+    tasks += [asyncio.ensure_future(watch(host, port, stats, rng)) for _ in range(num_watchers)]
+    await asyncio.sleep(seconds)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Put load on a poker server from many connections.')
+    parser.add_argument('--host', default='127.0.0.1', help='address of the server')
+    parser.add_argument('--port', type=int, default=7777, help='port of the server')
+    parser.add_argument('--players', type=int, default=600, help='connections that play')
+    parser.add_argument('--watchers', type=int, default=0, help='connections that watch tables')
+    parser.add_argument('--idle', type=int, default=1000, help='connections that stay idle')
+    parser.add_argument('--seconds', type=float, default=10.0, help='how long to run for')
+    parser.add_argument('--seed', type=int, help='seed for the moves of the players')
+    parser.add_argument('--serve', action='store_true', help='start a server on the same event loop first')
+    parser.add_argument('--remote-seats', type=int, default=6, help='remote players per table of the server')
+    args = parser.parse_args()
+
+    async def run():
+        port = args.port
+        server = None
+        if args.serve:
+            server = PokerServer(args.remote_seats, seats=max(6, args.remote_seats))
+            port = await server.start(args.host, args.port)
+        stats = await run_load(args.host, port, args.players, args.idle, args.seconds, args.seed,
+                               args.watchers)
+        if server is not None:
+            await server.close()
+        print(stats)
+
+    asyncio.run(run())
+
+
+if __name__ == '__main__':
+    main()
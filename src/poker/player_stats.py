@@ -0,0 +1,266 @@
+"""
+#######################################################################################################################
+Running statistics of how each player plays, kept up to date from the game's betting moves as they are made:
+
+    VPIP    Voluntarily put chips in the pot: the share of hands a player called, bet, or raised before the flop
+    PFR     Preflop raise: the share of hands a player bet or raised before the flop
+    AF      Aggression factor: bets and raises for each call after the flop
+    WTSD    Went to showdown: the share of hands a player saw the flop in that they took to the showdown
+    W$SD    Won at showdown: the share of showdowns a player won at least a pot in
+
+along with how often a player folds to a bet and how often they bet or raise in each phase. Each player's statistics
+are a fixed number of counters, so they take the same memory after a million hands as after one, and reading them
+mid-game costs nothing beyond a division.
+
+Older hands can be made to count for less. With a decay below 1, each hand counts for decay times as much as the hand
+after it, so the statistics follow a player who changes how they play. Rather than shrinking every counter each hand,
+newer hands are added with a weight that grows by 1 / decay per hand. Every statistic is a ratio of two counters, so
+this gives the same statistics, and recording a move stays a few additions.
+#######################################################################################################################
+"""
+
+from __future__ import annotations
+
+from src.poker.enums.betting_move import BettingMove
+from src.poker.enums.phase import Phase
+from src.poker.players.player import Player
+
+# Weights are rescaled back to 1 once they grow past this, long before floats run out of range
+MAX_WEIGHT = 1e100
+
+
+class PlayerStats:
+    """The counters behind one player's statistics. Each counter is a weighted count of hands or moves.
+
+    Attributes:
+        hands: Hands dealt
+        voluntary_hands: Hands the player called, bet, or raised in before the flop
+        raised_hands: Hands the player bet or raised in before the flop
+        postflop_aggressions: Bets and raises after the flop
+        postflop_calls: Calls after the flop
+        saw_flop: Hands the player had not folded in by the time the flop was dealt
+        went_to_showdown: Hands the player took to the showdown
+        won_at_showdown: Showdowns the player won at least a pot in
+        moves: Moves made, by phase
+        aggressions: Bets and raises, by phase
+        faced_bets: Moves made facing a bet, by phase
+        folds_to_bet: Folds facing a bet, by phase
+        flags: Which of the once-a-hand counters the player's current hand has been counted in
+    """
+
+    __slots__ = ('hands', 'voluntary_hands', 'raised_hands', 'postflop_aggressions', 'postflop_calls', 'saw_flop',
+                 'went_to_showdown', 'won_at_showdown', 'moves', 'aggressions', 'faced_bets', 'folds_to_bet',
+                 'flags')
+
+    def __init__(self) -> None:
+        self.hands = 0.0
+        self.voluntary_hands = 0.0
+        self.raised_hands = 0.0
+        self.postflop_aggressions = 0.0
+        self.postflop_calls = 0.0
+        self.saw_flop = 0.0
+        self.went_to_showdown = 0.0
+        self.won_at_showdown = 0.0
+        self.moves = [0.0] * len(Phase)
+        self.aggressions = [0.0] * len(Phase)
+        self.faced_bets = [0.0] * len(Phase)
+        self.folds_to_bet = [0.0] * len(Phase)
+        self.flags = 0
+
+    @property
+    def vpip(self) -> float:
+        return self.voluntary_hands / self.hands if self.hands else 0.0
+
+    @property
+    def pfr(self) -> float:
+        return self.raised_hands / self.hands if self.hands else 0.0
+
+    @property
+    def aggression_factor(self) -> float:
+        """Returns the bets and raises for each call after the flop, which is infinite for a player who never calls."""
+        if self.postflop_calls:
+            return self.postflop_aggressions / self.postflop_calls
+        return float('inf') if self.postflop_aggressions else 0.0
+
+    @property
+    def wtsd(self) -> float:
+        return self.went_to_showdown / self.saw_flop if self.saw_flop else 0.0
+
+    @property
+    def wsd(self) -> float:
+        return self.won_at_showdown / self.went_to_showdown if self.went_to_showdown else 0.0
+
+    def fold_to_bet(self, phase: Phase) -> float:
+        """Returns the share of the player's moves facing a bet in a phase that were folds."""
+        faced = self.faced_bets[phase.value - 1]
+        return self.folds_to_bet[phase.value - 1] / faced if faced else 0.0
+
+    def raise_frequency(self, phase: Phase) -> float:
+        """Returns the share of the player's moves in a phase that were bets or raises."""
+        moves = self.moves[phase.value - 1]
+        return self.aggressions[phase.value - 1] / moves if moves else 0.0
+
+    def scale(self, factor: float) -> None:
+        """Multiplies every counter by a factor, which leaves every statistic the same."""
+        for name in _COUNTERS:
+            setattr(self, name, getattr(self, name) * factor)
+        for counts in (self.moves, self.aggressions, self.faced_bets, self.folds_to_bet):
+            counts[:] = [count * factor for count in counts]
+
+
+_COUNTERS = ('hands', 'voluntary_hands', 'raised_hands', 'postflop_aggressions', 'postflop_calls', 'saw_flop',
+             'went_to_showdown', 'won_at_showdown')
+
+# Once-a-hand counters a player's hand has been counted in, once it has been counted as dealt
+_DEALT = 1
+_VOLUNTARY = 2
+_RAISED = 4
+_SAW_FLOP = 8
+_SHOWDOWN = 16
+_WON = 32
+
+_PREFLOP = Phase.PREFLOP.value - 1
+
+
+class StatsTracker:
+    """Keeps the statistics of every player a game deals in, by name.
+
+    Give it to a game as game.stats, and the game records every hand and move in it
+    as they happen. One tracker can be shared by many games, so that statistics build
+    up across tables, as long as players at tables playing at the same time have
+    different names. Decay then counts hands dealt at any of the tables.
+
+    Args:
+        decay: How much a hand counts for compared to the hand after it. 1 counts every
+            hand the same, and 0.99 makes a hand 100 hands old count for about a third.
+
+    Attributes:
+        players: The statistics of each player, by name
+        hands: The number of hands dealt
+    """
+
+    def __init__(self, decay: float = 1.0):
+        if not 0 < decay <= 1:
+            raise ValueError(f'Cannot decay statistics by {decay}. The decay must be above 0 and at most 1.')
+        self.decay = decay
+        self.players: dict[str, PlayerStats] = {}
+        self.hands = 0
+        self._weight = 1.0
+
+    def __getitem__(self, name: str) -> PlayerStats:
+        """Returns a player's statistics, which are all 0 for a player not seen yet."""
+        stats = self.players.get(name)
+        if stats is None:
+            stats = self.players[name] = PlayerStats()
+        return stats
+
+    def fold_to_bet(self, name: str, phase: Phase, prior: float, prior_moves: float) -> float:
+        """Returns the share of a player's moves facing a bet in a phase that were folds, pulled towards a prior.
+
+        Args:
+            name: The player's name
+            phase: The phase of the moves
+            prior: The share to expect of a player seen facing few bets
+            prior_moves: How many moves the prior counts for against the player's own
+        """
+        stats = self[name]
+        index = phase.value - 1
+        return self._smooth(stats.folds_to_bet[index], stats.faced_bets[index], prior, prior_moves)
+
+    def raise_frequency(self, name: str, phase: Phase, prior: float, prior_moves: float) -> float:
+        """Returns the share of a player's moves in a phase that were bets or raises, pulled towards a prior.
+
+        Args:
+            name: The player's name
+            phase: The phase of the moves
+            prior: The share to expect of a player seen making few moves
+            prior_moves: How many moves the prior counts for against the player's own
+        """
+        stats = self[name]
+        index = phase.value - 1
+        return self._smooth(stats.aggressions[index], stats.moves[index], prior, prior_moves)
+
+    def _smooth(self, count: float, total: float, prior: float, prior_moves: float) -> float:
+        # Counters are in units of the current weight, so the prior is too
+        weight = prior_moves * self._weight
+        return (count + prior * weight) / (total + weight) if total + weight else prior
+
+    def hand_started(self, players: list[Player]) -> None:
+        """Counts a hand dealt to the players."""
+        self.hands += 1
+        if self.decay < 1:
+            self._weight /= self.decay
+            if self._weight > MAX_WEIGHT:
+                for stats in self.players.values():
+                    stats.scale(1 / self._weight)
+                self._weight = 1.0
+        for player in players:
+            stats = self[player.name]
+            stats.hands += self._weight
+            stats.flags = _DEALT
+
+    def record_move(self, phase: Phase, player: Player, move: BettingMove, facing_bet: bool, raised: bool) -> None:
+        """Counts a player's move.
+
+        Args:
+            phase: The phase the move was made in
+            player: The player who moved
+            move: The move
+            facing_bet: True if the player had less in than the table's bet before moving
+            raised: True if the move raised the table's bet, which tells an all-in raise from an all-in call
+        """
+        stats = self[player.name]
+        weight = self._weight
+        index = phase.value - 1
+        aggressive = raised or move is BettingMove.BET or move is BettingMove.RAISED
+        stats.moves[index] += weight
+        if aggressive:
+            stats.aggressions[index] += weight
+        if facing_bet:
+            stats.faced_bets[index] += weight
+            if move is BettingMove.FOLDED:
+                stats.folds_to_bet[index] += weight
+        if not stats.flags & _DEALT:
+            return
+        if index == _PREFLOP:
+            flags = stats.flags
+            if move is not BettingMove.FOLDED and move is not BettingMove.CHECKED and not flags & _VOLUNTARY:
+                stats.voluntary_hands += weight
+                flags |= _VOLUNTARY
+            if aggressive and not flags & _RAISED:
+                stats.raised_hands += weight
+                flags |= _RAISED
+            stats.flags = flags
+            return
+        if aggressive:
+            stats.postflop_aggressions += weight
+        elif move is not BettingMove.FOLDED and move is not BettingMove.CHECKED:
+            stats.postflop_calls += weight
+
+    def flop_dealt(self, players: list[Player]) -> None:
+        """Counts the flop as seen by the players who have not folded, whether or not they move after it."""
+        weight = self._weight
+        for player in players:
+            stats = self[player.name]
+            if not player.is_folded and stats.flags & _DEALT and not stats.flags & _SAW_FLOP:
+                stats.saw_flop += weight
+                stats.flags |= _SAW_FLOP
+
+    def record_showdown(self, showdown_players: list[Player], winners: list[Player]) -> None:
+        """Counts a pot decided at the showdown, in the hand the players were last dealt."""
+        if len(showdown_players) < 2:
+            return
+        weight = self._weight
+        for player in showdown_players:
+            stats = self[player.name]
+            if not stats.flags & _DEALT:
+                continue
+            if not stats.flags & _SAW_FLOP:
+                # A hand that is all-in before the flop has its board dealt at the showdown, without a flop dealt
+                stats.saw_flop += weight
+            if not stats.flags & _SHOWDOWN:
+                stats.went_to_showdown += weight
+            if player in winners and not stats.flags & _WON:
+                stats.won_at_showdown += weight
+                stats.flags |= _WON
+            stats.flags |= _SAW_FLOP | _SHOWDOWN
@@ -1,8 +1,26 @@
+from __future__ import annotations
+
 import random
 
 from src.poker.enums.betting_move import BettingMove
 from src.poker.enums.computer_playing_style import ComputerPlayingStyle
+from src.poker.enums.phase import Phase
+from src.poker.player_stats import StatsTracker
 from src.poker.players.player import Player
+from src.poker.utils.equity import EquityCalculator, shared_calculator
+from src.poker.utils.tree_search import TreeSearch
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from src.poker.game import Game
+    from src.poker.utils.cfr import StrategyTable
+
+# What the ADAPTIVE playing style expects of opponents it has seen little of, and how many moves that counts for
+PRIOR_FOLD_TO_BET = 0.3
+PRIOR_RAISE_FREQUENCY = 0.2
+PRIOR_MOVES = 10
+# How much a hand counts for compared to the hand after it, in the statistics the ADAPTIVE playing style keeps
+OPPONENT_DECAY = 0.99
 
 
 class Computer(Player):
@@ -11,11 +29,22 @@ class Computer(Player):
     Args:
         name: The name of the player
         playing_style: An enum which determines how computer will make its next move
+
+    Attributes:
+        game: The game the computer is seated at, set by the game
+        equity_calculator: Looks up the chance of winning for the CALCULATED playing style
+        tree_search: Searches the betting of the hand for the MCTS playing style, and sets its budget
+        strategy_tables: The solved subgames the SOLVED playing style looks up its moves in,
+            or None for the tables shared by every computer player
     """
 
     def __init__(self, name: str, playing_style: ComputerPlayingStyle):
         super().__init__(name)
         self.playing_style = playing_style
+        self.game: Game | None = None
+        self.equity_calculator: EquityCalculator = shared_calculator
+        self.tree_search = TreeSearch()
+        self.strategy_tables: list[StrategyTable] | None = None
 
     def choose_next_move(self, table_raise_amount: int, times_table_raised: int, last_table_bet: int) -> BettingMove:
         """Allows human player to choose their next move (call, raise, fold, etc.).
@@ -27,6 +56,14 @@ class Computer(Player):
             return self.safe_play(table_raise_amount, times_table_raised, last_table_bet)
         elif self.playing_style is ComputerPlayingStyle.RISKY:
             return self.risky_play(table_raise_amount, times_table_raised, last_table_bet)
+        elif self.playing_style is ComputerPlayingStyle.CALCULATED:
+            return self.calculated_play(table_raise_amount, times_table_raised, last_table_bet)
+        elif self.playing_style is ComputerPlayingStyle.MCTS:
+            return self.mcts_play(table_raise_amount, times_table_raised, last_table_bet)
+        elif self.playing_style is ComputerPlayingStyle.SOLVED:
+            return self.solved_play(table_raise_amount, times_table_raised, last_table_bet)
+        elif self.playing_style is ComputerPlayingStyle.ADAPTIVE:
+            return self.adaptive_play(table_raise_amount, times_table_raised, last_table_bet)
         else:
             return self.random_play(table_raise_amount, times_table_raised, last_table_bet)
 
@@ -158,3 +195,157 @@ class Computer(Player):
                 return BettingMove.CALLED
             else:
                 return BettingMove.FOLDED
+
+    def calculated_play(self, table_raise_amount: int, num_times_table_raised: int,
+                        table_last_bet: int) -> BettingMove:
+        """Computer choice to check, call, raise, bet, fold, or go all-in based on its equity.
+
+        The computer calls when its equity against the players still in the hand is
+        worth the price of calling, and bets or raises when its equity is well above
+        an even share of the pot.
+        """
+        community = self.hand_evaluator.cards[len(self.hand):]
+        num_opponents = max(self.count_opponents(), 1)
+        equity = self.equity_calculator.equity(self.hand, community, num_opponents)
+        even_share = 1 / (num_opponents + 1)
+        is_strong = equity >= even_share + (1 - even_share) / 4
+        to_call = table_last_bet - self.bet
+        is_worth_calling = equity * (self.get_pot_size() + to_call) >= to_call
+        # If player doesn't have enough chips to raise or just enough chips to raise
+        if self.chips <= abs(self.bet - table_raise_amount):
+            # If not enough chips to call
+            if self.chips <= to_call:
+                return BettingMove.ALL_IN if is_worth_calling else BettingMove.FOLDED
+            if is_strong:
+                return BettingMove.ALL_IN
+        elif num_times_table_raised < 4 and is_strong:
+            return BettingMove.BET if self.bet == table_last_bet else BettingMove.RAISED
+        if self.bet == table_last_bet:
+            return BettingMove.CHECKED
+        return BettingMove.CALLED if is_worth_calling else BettingMove.FOLDED
+
+    def mcts_play(self, table_raise_amount: int, num_times_table_raised: int, table_last_bet: int) -> BettingMove:
+        """Computer choice to check, call, raise, bet, fold, or go all-in by searching the betting of the hand.
+
+        Without a game to search, the computer plays the CALCULATED playing style.
+        """
+        if self.game is None:
+            return self.calculated_play(table_raise_amount, num_times_table_raised, table_last_bet)
+        return self.tree_search.choose_move(self.game, self)
+
+    def solved_play(self, table_raise_amount: int, num_times_table_raised: int, table_last_bet: int) -> BettingMove:
+        """Computer choice to check, call, raise, bet, fold, or go all-in from a strategy solved ahead of time.
+
+        The strategies are of heads-up subgames, solved with counterfactual regret
+        minimization. Where none of them fits the hand, the computer plays the CALCULATED
+        playing style.
+        """
+        probabilities = self.get_solved_strategy()
+        if probabilities is None:
+            return self.calculated_play(table_raise_amount, num_times_table_raised, table_last_bet)
+        x = random.random()
+        for move, probability in probabilities.items():
+            x -= probability
+            if x < 0:
+                return move
+        return move
+
+    def get_solved_strategy(self) -> dict[BettingMove, float] | None:
+        """Returns the chance of each move in the first strategy table that fits the hand, or None if none fits.
+
+        A table fits once the hand is heads-up from the start of the street it was
+        solved from, and the moves made since are in its betting tree. The pot is not
+        matched, so a table solved for one pot stands in for the others.
+        """
+        # Imported here so that importing the engine does not pay for it
+        from src.poker.utils import cfr
+
+        if self.game is None or len(self.hand) != 2:
+            return None
+        players = [player for player in self.game.betting_players if not player.is_folded]
+        if len(players) != 2:
+            return None
+        community = [card.to_int() for card in self.game.table.community]
+        hole = [card.to_int() for card in self.hand]
+        phases = list(Phase)
+        for table in cfr.shared_tables if self.strategy_tables is None else self.strategy_tables:
+            first_phase = Phase.TURN if table.board_size == 4 else Phase.RIVER
+            if phases.index(self.game.phase) < phases.index(first_phase):
+                continue
+            history = [(player, move) for phase, player, move in self.game.hand_history
+                       if phases.index(phase) >= phases.index(first_phase)]
+            if any(player not in players for player, _ in history):
+                continue
+            probabilities = table.move_probabilities(community, hole, [move for _, move in history])
+            if probabilities is not None and list(probabilities) == self.game.legal_actions():
+                return probabilities
+        return None
+
+    def adaptive_play(self, table_raise_amount: int, num_times_table_raised: int,
+                      table_last_bet: int) -> BettingMove:
+        """Computer choice to check, call, raise, bet, fold, or go all-in based on its equity and its opponents.
+
+        The computer plays like the CALCULATED playing style, adjusted to how often the
+        opponents still in the hand have folded to bets and have bet or raised in this
+        phase. It bets and raises without a strong hand when the opponents are likely
+        enough to fold for the pot to pay for it, and calls with less equity against
+        opponents who bet and raise more than most, since they do so with weaker hands.
+
+        The opponents are read from the game's statistics, which the computer starts
+        keeping if the game has none. Without a game, the computer plays the CALCULATED
+        playing style.
+        """
+        if self.game is None:
+            return self.calculated_play(table_raise_amount, num_times_table_raised, table_last_bet)
+        if self.game.stats is None:
+            self.game.stats = StatsTracker(OPPONENT_DECAY)
+        stats = self.game.stats
+        phase = self.game.phase
+        opponents = [player for player in self.game.players
+                     if player is not self and player.is_in_game and not player.is_folded and player.hand]
+        community = self.hand_evaluator.cards[len(self.hand):]
+        equity = self.equity_calculator.equity(self.hand, community, max(len(opponents), 1))
+        even_share = 1 / (max(len(opponents), 1) + 1)
+        is_strong = equity >= even_share + (1 - even_share) / 4
+        # Players who are all-in cannot fold
+        fold_chance = 1.0
+        aggression = PRIOR_RAISE_FREQUENCY
+        for opponent in opponents:
+            if opponent.is_all_in:
+                fold_chance = 0.0
+            else:
+                fold_chance *= stats.fold_to_bet(opponent.name, phase, PRIOR_FOLD_TO_BET, PRIOR_MOVES)
+                aggression = max(aggression, stats.raise_frequency(opponent.name, phase, PRIOR_RAISE_FREQUENCY,
+                                                                   PRIOR_MOVES))
+        pot = self.get_pot_size()
+        to_call = table_last_bet - self.bet
+        is_bluff = fold_chance * pot > (1 - fold_chance) * (table_raise_amount - self.bet)
+        # Equity counts for up to half as much again against the most aggressive opponent, who bets weaker hands
+        adjusted_equity = equity * min(aggression / PRIOR_RAISE_FREQUENCY, 1.5)
+        is_worth_calling = adjusted_equity * (pot + to_call) >= to_call
+        # If player doesn't have enough chips to raise or just enough chips to raise
+        if self.chips <= abs(self.bet - table_raise_amount):
+            # If not enough chips to call
+            if self.chips <= to_call:
+                return BettingMove.ALL_IN if is_worth_calling else BettingMove.FOLDED
+            if is_strong:
+                return BettingMove.ALL_IN
+        elif num_times_table_raised < 4 and (is_strong or is_bluff):
+            return BettingMove.BET if self.bet == table_last_bet else BettingMove.RAISED
+        if self.bet == table_last_bet:
+            return BettingMove.CHECKED
+        return BettingMove.CALLED if is_worth_calling else BettingMove.FOLDED
+
+    def count_opponents(self) -> int:
+        """Returns the number of other players still in the hand."""
+        if self.game is None:
+            return 1
+        return sum(1 for player in self.game.players
+                   if player is not self and player.is_in_game and not player.is_folded and player.hand)
+
+    def get_pot_size(self) -> int:
+        """Returns the chips in the pots plus the bets of the current round of betting."""
+        if self.game is None:
+            return 0
+        return (sum(pot[0] for pot in self.game.table.pots) +
+                sum(player.bet for player in self.game.players if player.is_in_game))
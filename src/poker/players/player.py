@@ -4,6 +4,7 @@ from abc import ABC, abstractmethod
 
 from src.poker.card import Card
 from src.poker.enums.betting_move import BettingMove
+from src.poker.utils.hand_evaluator import HandEvaluator
 
 
 class Player(ABC):
@@ -30,6 +31,7 @@ class Player(ABC):
         self.best_hand_rank = ''
         self.rank_subtype = ''
         self.kicker_card: Card | None = None
+        self.hand_evaluator = HandEvaluator()
 
     def reset(self):
         """Reset player's state in between hands."""
@@ -46,6 +48,7 @@ class Player(ABC):
         self.best_hand_rank = ''
         self.rank_subtype = ''
         self.kicker_card = None
+        self.hand_evaluator = HandEvaluator()
 
     def match_bet(self, amount: int) -> int:
         if amount < self.bet:
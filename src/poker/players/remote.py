@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from src.poker.enums.betting_move import BettingMove
+from src.poker.players.player import Player
+
+if TYPE_CHECKING:
+    from src.poker.server import Connection
+
+
+class RemotePlayer(Player):
+    """A human player playing from another machine through the server.
+
+    The server asks the player for moves over the connection. choose_next_move is only
+    used when the player cannot answer, because they ran out of time or disconnected.
+
+    Args:
+        name: The name of the player
+        connection: The connection to the player
+
+    Attributes:
+        connection: The connection to the player, or None once it has closed
+    """
+
+    def __init__(self, name: str, connection: Connection | None = None):
+        super().__init__(name)
+        self.connection = connection
+
+    def choose_next_move(self, table_raise_amount: int, times_table_raised: int, last_table_bet: int) -> BettingMove:
+        """Checks if the player can do so for free, and folds otherwise."""
+        if self.bet == last_table_bet:
+            return BettingMove.CHECKED
+        return BettingMove.FOLDED
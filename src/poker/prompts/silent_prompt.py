@@ -0,0 +1,18 @@
+class SilentPresenter:
+    """Stands in for text_prompt when a game is run without a display.
+
+    Every show_* call and clear_screen does nothing and never pauses, and the
+    game always continues on to the next hand.
+    """
+
+    def prompt_continue_game(self) -> bool:
+        return True
+
+    def __getattr__(self, name: str):
+        if name.startswith('show_') or name == 'clear_screen':
+            return _show_nothing
+        raise AttributeError(f'A silent presenter cannot {name}, since no user is watching the game.')
+
+
+def _show_nothing(*args, **kwargs) -> None:
+    pass
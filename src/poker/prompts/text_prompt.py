@@ -1,12 +1,13 @@
 from time import sleep
 
+from src.poker.card import Card
 from src.poker.enums.betting_move import BettingMove
 from src.poker.enums.phase import Phase
 from src.poker.players.human import Human
 from src.poker.players.player import Player
 from src.poker.prompts import big_text
 from src.poker.table import Table
-from src.poker.utils.io_utils import clear_screen
+from src.poker.utils.io_utils import clear_screen, get_terminal, input_no_return
 
 
 def prompt_for_name() -> str:
@@ -72,6 +73,26 @@ def prompt_for_big_blind(min_blind: int, max_blind: int) -> int:
     return big_blind
 
 
+def prompt_continue_game() -> bool:
+    """Asks the user whether to play another hand."""
+    clear_screen()
+    user_choice = input_no_return("Continue on to next hand? Press (enter) to continue or (n) to stop.   ")
+    return 'n' not in user_choice.lower()
+
+
+SUIT_COLORS = {'C': 'green', 'D': 'cyan', 'H': 'red', 'S': 'yellow'}
+
+
+def format_card(card: Card) -> str:
+    """Returns a card for display, with its suit in color when the terminal supports it.
+
+    Example:
+        [A ♦]
+    """
+    suit = getattr(get_terminal(), SUIT_COLORS[card.suit_value])(card.suit_symbol)
+    return f'[{card.rank_symbol:<2}{suit}]'
+
+
 def show_player_stats(initial_players, isShowDown=False):
     """Format each player's stats as a single line.
 
@@ -84,22 +105,24 @@ def show_player_stats(initial_players, isShowDown=False):
     """
     # Sort players such that those who are out of game display last
     players = sorted(initial_players, key=lambda player: player.is_in_game, reverse=True)
+    # Blank out as many cards as the players were dealt, which depends on the variant
+    num_hole_cards = max((len(player.hand) for player in players), default=0) or 2
     # Display each player's stat line
     for i in range(len(players)):
         this_player = players[i]
         if this_player.is_in_game:
             hand_str = []
             if this_player.is_folded or this_player.hand == []:
-                for j in range(2):
+                for j in range(num_hole_cards):
                     hand_str.append('     ')
             # elif this_player.is_human:
             elif isinstance(this_player, Human):
                 for card in this_player.hand:
-                    hand_str.append(str(card))
+                    hand_str.append(format_card(card))
             # elif not this_player.is_human and isShowDown:
             elif isShowDown and not isinstance(this_player, Human):
                 for card in this_player.hand:
-                    hand_str.append(str(card))
+                    hand_str.append(format_card(card))
             # elif not this_player.is_human and not isShowDown:
             elif not isShowDown and not isinstance(this_player, Human):
                 for j in range(len(this_player.hand)):
@@ -138,7 +161,7 @@ def show_community(community):
     """
     community_str = []
     for card in community:
-        community_str.append(str(card))
+        community_str.append(format_card(card))
     community_str = '  '.join(community_str)
     padding = ' '
     print(f'{padding:>9}COMMUNITY:  {community_str}')
@@ -151,8 +174,10 @@ def show_blinds(table):
         table (__main__.Table): the poker table
     """
     padding = ' '
-    print(f'{padding:>7}Small Blind:{int(table.big_blind / 2):>6}')
+    print(f'{padding:>7}Small Blind:{table.small_blind:>6}')
     print(f'{padding:>9}Big Blind:{table.big_blind:>6}')
+    if table.ante:
+        print(f'{padding:>13}Ante:{table.ante:>6}')
 
 
 def show_pots(pots):
@@ -198,18 +223,18 @@ def show_pot_winners(hand_winners, showdown_players, pot_num):
         print(f"           Players eligible for SIDE POT #{pot_num}:      {players_str}")
         print('\n')
     if len(hand_winners) == 1:
-        hand_str = [str(c) for c in hand_winners[0].best_hand_cards]
+        hand_str = [format_card(c) for c in hand_winners[0].best_hand_cards]
         hand_str = '  '.join(hand_str)
         print(
             f"           {hand_str}      {hand_winners[0].name} won {pot_type} with a {hand_winners[0].best_hand_rank}{hand_winners[0].rank_subtype}!")
         if hand_winners[0].kicker_card:
-            kicker_str = f'Kicker card was the {hand_winners[0].kicker_card}'
+            kicker_str = f'Kicker card was the {format_card(hand_winners[0].kicker_card)}'
             print(f"{kicker_str:>75}")
         else:
             print()
     else:
         for i in range(len(hand_winners)):
-            hand_str = [str(c) for c in hand_winners[i].best_hand_cards]
+            hand_str = [format_card(c) for c in hand_winners[i].best_hand_cards]
             hand_str = '  '.join(hand_str)
             print(f'           {hand_str}      {hand_winners[i].name}')
             if i == len(hand_winners) - 1:
@@ -303,8 +328,10 @@ def show_dealing_hole(dealer_name, time):
     sleep(time)
 
 
-def show_blind_increase(blind_amount, time):
+def show_blind_increase(blind_amount, time, ante=0):
     print(f' >>> The big blind has increased to {blind_amount}!')
+    if ante:
+        print(f' >>> Every player now antes {ante}.')
     sleep(time)
 
 
@@ -350,11 +377,31 @@ def show_bet_blind(player_name, blind_size, time):
     sleep(time)
 
 
+def show_bet_antes(ante, time):
+    print(f' >>> Every player antes {ante}')
+    sleep(time)
+
+
 def show_all_in(player_name, time):
     print(f' >>> {player_name} went all in!')
     sleep(time)
 
 
+def show_all_in_equities(players: list[Player], equities: list[tuple[float, float]], time: float):
+    """Shows each player's chance of winning and of tying before the next card is dealt.
+
+    Parameters:
+        players (list): players still in the hand
+        equities (list): each player's chance of winning and of tying, from 0 to 1
+        time (float): amount of time to pause the game
+    """
+    width = max(len(player.name) for player in players)
+    for player, (win, tie) in zip(players, equities):
+        tie_str = f', {tie:.1%} to tie' if tie else ''
+        print(f' >>> {player.name:<{width}}  {win:>6.1%} to win{tie_str}')
+    sleep(time)
+
+
 def show_default_winner_fold(player_name):
     print(' >>> All other players folded...')
     print(f' >>> {player_name} won the pot!')
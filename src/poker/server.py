@@ -0,0 +1,522 @@
+"""
+#######################################################################################################################
+Plays poker over TCP, seating remote players at tables next to computer players:
+
+    python -m src.poker.server --port 7777 --remote-seats 2 --seats 6
+
+Clients and the server send lines of UTF-8 text, one message per line, with words separated by spaces. Cards are
+written like 10H or AS, and moves by their BettingMove names. A client sends:
+
+    JOIN <name>                 Take a seat at the next table to start
+    MOVE <move>                 Make a move when asked, e.g. MOVE CALLED
+    TABLES                      List the tables in play
+    WATCH <table>               Watch a table, without playing at it
+    UNWATCH                     Stop watching
+    QUIT                        Leave the server
+
+and the server sends:
+
+    WAITING <count>             Seated, waiting for count more players before the table starts
+    SEATED <table> <name>...    The table started, with its players in seat order
+    HOLE <card> <card>          Your hole cards
+    KEYFRAME <seq> <field>...   The state of the table, when you are seated or start watching
+    DELTA <seq> <field>...      The fields of the state that changed. Fields are key=value, or a bare key for a field
+                                that was removed. The board and the chips in each pot are joined by commas, or - if
+                                there are none, and each seat has name, chips, bet, and flags fields, e.g. chips3,
+                                with D for the dealer, F for folded, A for all-in, and O for out of the game.
+    PHASE <phase> <dealer>      A new phase of the hand started
+    BLIND <name> <SMALL|BIG>    A player bet a blind
+    ANTE <chips>                Every player bet the ante
+    BLINDS <big blind> <ante>   The blinds went up
+    ACTION <name> <move> <bet>  A player made a move
+    TURN <move>...              Your turn, with the moves you may make
+    SHOW <name> <card> <card> <hand>
+                                A player's hand at the showdown
+    WIN <pot> <name>...         The winners of a pot
+    OUT                         You are out of chips and left the table. Send JOIN to play again.
+    GAMEOVER <name>...          The table is over, with its winners. Send JOIN to play again.
+    TABLES <table>...           The tables in play
+    ERROR <message>             The last line could not be carried out
+
+A player who does not move in time, or who disconnects, checks when they can and folds otherwise. Watchers are sent
+every line a table's players are, apart from HOLE and TURN.
+
+Each connection is served by one coroutine, so one process holds thousands of idle connections. Lines sent to a client
+are buffered and written together once per turn of the event loop, and a client that falls too far behind reading them
+is disconnected rather than holding up its table. A table encodes each line once and hands the same bytes to every
+player and watcher, and sends only the fields of its state that changed, so many watchers cost little more than one.
+#######################################################################################################################
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+
+from src.poker.broadcast import TableBroadcaster, card_code, table_fields
+from src.poker.card import Card
+from src.poker.enums.betting_move import BettingMove
+from src.poker.enums.computer_playing_style import DEFAULT_PLAYING_STYLES, ComputerPlayingStyle
+from src.poker.enums.phase import Phase
+from src.poker.game import Game, generate_computer_names
+from src.poker.players.computer import Computer
+from src.poker.players.player import Player
+from src.poker.players.remote import RemotePlayer
+from src.poker.prompts.silent_prompt import SilentPresenter
+from src.poker.table import Table
+
+MAX_NAME_LENGTH = 12
+
+
+class Connection:
+    """A client's connection to the server.
+
+    Lines sent to the client are buffered and written together once per turn of the
+    event loop, so a table sending a burst of lines costs one write per client. A
+    client whose unsent data grows past max_buffer bytes is disconnected.
+
+    Args:
+        reader: The stream the client's lines are read from
+        writer: The stream lines are sent to the client on
+        max_buffer: The most bytes waiting to be sent before the client is disconnected
+
+    Attributes:
+        player: The client's player, once the client has joined
+        table: The table the client's player is seated at, once it has started
+        watching: The table the client is watching, if any
+        is_closed: True once the connection has been closed
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, max_buffer: int = 1 << 16):
+        self.reader = reader
+        self.writer = writer
+        self.max_buffer = max_buffer
+        self.player: RemotePlayer | None = None
+        self.table: ServerTable | None = None
+        self.watching: ServerTable | None = None
+        self.is_closed = False
+        self._pending: list[bytes] = []
+
+    def send(self, *words: object) -> None:
+        """Sends a line of words to the client, as soon as the event loop gets to it."""
+        self.send_line((' '.join(str(word) for word in words) + '\n').encode())
+
+    def send_line(self, data: bytes) -> None:
+        """Sends an encoded line to the client, as soon as the event loop gets to it."""
+        if self.is_closed:
+            return
+        if not self._pending:
+            asyncio.get_running_loop().call_soon(self._flush)
+        self._pending.append(data)
+
+    def _flush(self) -> None:
+        if self.is_closed:
+            return
+        self.writer.write(b''.join(self._pending))
+        self._pending.clear()
+        if self.writer.transport.get_write_buffer_size() > self.max_buffer:
+            self.close()
+
+    async def read_line(self) -> str | None:
+        """Returns the client's next line, or None once the client has disconnected or sent a line that is too long."""
+        try:
+            line = await self.reader.readline()
+        except (ConnectionError, ValueError):
+            return None
+        if not line.endswith(b'\n'):
+            return None
+        return line.decode(errors='replace').strip()
+
+    def close(self) -> None:
+        if not self.is_closed:
+            self.is_closed = True
+            self._pending.clear()
+            self.writer.close()
+
+
+class TablePresenter(SilentPresenter):
+    """Shows a table's game to its remote players and watchers as protocol lines, in place of text_prompt.
+
+    It never pauses, since every table shares one event loop, and only sends the fields
+    of the table's state that have changed.
+
+    Args:
+        table: The table being shown
+    """
+
+    def __init__(self, table: ServerTable):
+        self.table = table
+        self._holes: dict[Player, list[Card]] = {}
+        self._shown: set[Player] = set()
+
+    def show_table(self, initial_players: list[Player], table: Table, time: float = 0) -> None:
+        for player in self.table.remote_players:
+            if len(player.hand) == self.table.game.num_hole_cards and self._holes.get(player) != player.hand:
+                self._holes[player] = list(player.hand)
+                if player.connection is not None:
+                    player.connection.send('HOLE', *(card_code(card) for card in player.hand))
+        self.table.broadcaster.update(table_fields(initial_players, table))
+
+    def show_phase_change_alert(self, phase: Phase, dealer: str, pause_time: float) -> None:
+        if phase is Phase.PREFLOP:
+            self._holes.clear()
+            self._shown.clear()
+        self.table.broadcast('PHASE', phase.name, dealer)
+
+    def show_bet_blind(self, player_name: str, blind_size: str, time: float) -> None:
+        self.table.broadcast('BLIND', player_name, blind_size.upper())
+
+    def show_bet_antes(self, ante: int, time: float) -> None:
+        self.table.broadcast('ANTE', ante)
+
+    def show_blind_increase(self, blind_amount: int, time: float, ante: int = 0) -> None:
+        self.table.broadcast('BLINDS', blind_amount, ante)
+
+    def show_player_move(self, player: Player, move: BettingMove, pause: float, bet: int | None = None) -> None:
+        self.table.broadcast('ACTION', player.name, move.name, player.bet)
+
+    def show_showdown_results(self, initial_players: list[Player], table: Table, hand_winners: list[Player],
+                              showdown_players: list[Player], pot_num: int) -> None:
+        for player in showdown_players:
+            if player not in self._shown:
+                self._shown.add(player)
+                self.table.broadcast('SHOW', player.name, *(card_code(card) for card in player.hand),
+                                     player.best_hand_rank)
+        self.table.broadcast('WIN', pot_num, *(winner.name for winner in hand_winners))
+
+    def show_default_winner_fold(self, player_name: str) -> None:
+        self.table.broadcast('WIN', 0, player_name)
+
+    def show_default_winner_eligibility(self, player_name: str, side_pot_num: int) -> None:
+        self.table.broadcast('WIN', side_pot_num, player_name)
+
+    def show_game_winners(self, initial_players: list[Player], winners_names: list[str]) -> None:
+        self.table.broadcast('GAMEOVER', *winners_names)
+
+
+class ServerTable:
+    """A table of remote and computer players, played hand after hand until one player
+    has all the chips or every remote player has left.
+
+    Args:
+        number: The table number
+        players: The players, in seat order
+        big_blind: The starting big blind
+        move_timeout: The seconds a remote player has to move
+        move_delay: The seconds to wait after each move, so that players can follow the game
+
+    Attributes:
+        game: The game played at the table
+        broadcaster: Sends the table's lines to its connected remote players and its watchers
+    """
+
+    def __init__(self, number: int, players: list[Player], big_blind: int, move_timeout: float = 30.0,
+                 move_delay: float = 0.0):
+        self.number = number
+        self.move_timeout = move_timeout
+        self.move_delay = move_delay
+        self.game = Game(presenter=TablePresenter(self), players=players, big_blind=big_blind)
+        self.broadcaster = TableBroadcaster()
+        self.broadcaster.update(table_fields(players, self.game.table))
+        for player in self.remote_players:
+            if player.connection is not None:
+                self.broadcaster.subscribe(player.connection)
+        self._mover: RemotePlayer | None = None
+        self._move: asyncio.Future[BettingMove | None] | None = None
+
+    @property
+    def remote_players(self) -> list[RemotePlayer]:
+        return [player for player in self.game.players if isinstance(player, RemotePlayer)]
+
+    def broadcast(self, *words: object) -> None:
+        """Sends a line to every remote player still connected and every watcher, encoding it once."""
+        self.broadcaster.send_line((' '.join(str(word) for word in words) + '\n').encode())
+
+    async def play(self) -> None:
+        """Plays hands until the game is over or no remote players are left in it."""
+        self.broadcast('SEATED', self.number, *(player.name for player in self.game.players))
+        while True:
+            self.game.reset()
+            while not self.game.is_terminal():
+                self.game.step(await self.choose_move(self.game.current_player()))
+                await asyncio.sleep(self.move_delay)
+            for player in self.remote_players:
+                if player.connection is None:
+                    self.game.remove_player(player)
+                elif not player.is_in_game and player.connection.table is self:
+                    self.player_out(player)
+            if self.game.check_game_over():
+                return
+            if not any(player.is_in_game for player in self.remote_players):
+                most_chips = max(player.chips for player in self.game.players)
+                self.broadcast('GAMEOVER', *(player.name for player in self.game.players if player.chips == most_chips))
+                return
+
+    async def choose_move(self, player: Player) -> BettingMove:
+        """Returns the move of the player to act, asking remote players over their connection."""
+        table = self.game.table
+        if isinstance(player, RemotePlayer) and player.connection is not None:
+            self._mover = player
+            self._move = asyncio.get_running_loop().create_future()
+            player.connection.send('TURN', *(move.name for move in self.game.legal_actions()))
+            try:
+                move = await asyncio.wait_for(self._move, self.move_timeout)
+                if move is not None:
+                    return move
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                self._mover = None
+                self._move = None
+        return player.choose_next_move(table.raise_amount, table.num_times_raised, table.last_bet)
+
+    def receive_move(self, player: RemotePlayer, name: str) -> str | None:
+        """Makes a remote player's move, or returns why it cannot be made."""
+        if player is not self._mover or self._move.done():
+            return 'It is not your turn.'
+        move = BettingMove.__members__.get(name.upper())
+        if move not in self.game.legal_actions():
+            return (f'Cannot make move {name} when the legal moves are '
+                    f'{", ".join(legal_move.name for legal_move in self.game.legal_actions())}.')
+        self._move.set_result(move)
+        return None
+
+    def player_out(self, player: RemotePlayer) -> None:
+        """Frees the connection of a remote player who is out of chips to join another table."""
+        connection = player.connection
+        connection.send('OUT')
+        self.broadcaster.unsubscribe(connection)
+        connection.player = None
+        connection.table = None
+
+    def player_left(self, player: RemotePlayer) -> None:
+        """Plays on without a remote player who disconnected, checking or folding for them."""
+        self.broadcaster.unsubscribe(player.connection)
+        player.connection = None
+        if player is self._mover and not self._move.done():
+            self._move.set_result(None)
+
+
+class PokerServer:
+    """Seats remote players at tables next to computer players, and plays every table on one event loop.
+
+    Args:
+        remote_seats: The number of remote players a table waits for before it starts
+        seats: The number of seats at a table, filled with computer players beyond the remote ones
+        starting_chips: The chips each player starts with
+        big_blind: The starting big blind
+        playing_styles: The playing styles to pick from at random for each computer player
+        move_timeout: The seconds a remote player has to move
+        move_delay: The seconds to wait after each move, so that players can follow the game
+        max_buffer: The most bytes waiting to be sent to a client before it is disconnected
+        max_line: The longest line in bytes a client may send
+
+    Attributes:
+        connections: The open connections
+        waiting: The remote players waiting for a table to start
+        tables: The tables in play, by table number
+    """
+
+    def __init__(self, remote_seats: int = 1, seats: int = 6, starting_chips: int = 1000, big_blind: int = 20,
+                 playing_styles: list[ComputerPlayingStyle] | None = None, move_timeout: float = 30.0,
+                 move_delay: float = 0.0, max_buffer: int = 1 << 16, max_line: int = 256):
+        if not 1 <= remote_seats <= seats:
+            raise ValueError(f'A table of {seats} seats cannot seat {remote_seats} remote players.')
+        if seats < 2:
+            raise ValueError(f'A table needs at least 2 seats, not {seats}.')
+        self.remote_seats = remote_seats
+        self.seats = seats
+        self.starting_chips = starting_chips
+        self.big_blind = big_blind
+        self.playing_styles = playing_styles or DEFAULT_PLAYING_STYLES
+        self.move_timeout = move_timeout
+        self.move_delay = move_delay
+        self.max_buffer = max_buffer
+        self.max_line = max_line
+        self.connections: set[Connection] = set()
+        self.waiting: list[RemotePlayer] = []
+        self.tables: dict[int, ServerTable] = {}
+        self._num_tables = 0
+        self._tasks: set[asyncio.Task] = set()
+        self._serving: set[asyncio.Task] = set()
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0, backlog: int = 1024) -> int:
+        """Starts accepting connections, and returns the port, which is chosen by the system if port is 0.
+
+        Args:
+            host: The address to listen on
+            port: The port to listen on
+            backlog: The most connections waiting to be accepted, so that a burst of clients is not turned away
+        """
+        self._server = await asyncio.start_server(self.serve, host, port, limit=self.max_line, backlog=backlog)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        """Stops accepting connections, and closes every connection and table."""
+        self._server.close()
+        for connection in list(self.connections):
+            connection.close()
+        for task in list(self._tasks):
+            task.cancel()
+        # Closed connections read to the end of their stream, so the tasks serving them finish on their own
+        await asyncio.gather(*self._tasks, *self._serving, return_exceptions=True)
+        await self._server.wait_closed()
+
+    async def serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serves one client until it quits or disconnects."""
+        connection = Connection(reader, writer, self.max_buffer)
+        self.connections.add(connection)
+        task = asyncio.current_task()
+        self._serving.add(task)
+        try:
+            while True:
+                line = await connection.read_line()
+                if line is None or not self.handle(connection, line):
+                    break
+        finally:
+            self._serving.discard(task)
+            self.connections.discard(connection)
+            self.leave(connection)
+            connection.close()
+
+    def handle(self, connection: Connection, line: str) -> bool:
+        """Carries out a line from a client. Returns False if the client quit."""
+        command, _, argument = line.partition(' ')
+        command = command.upper()
+        if command == 'JOIN':
+            self.join(connection, argument.strip())
+        elif command == 'MOVE':
+            if connection.table is None:
+                connection.send('ERROR', 'You are not seated at a table.')
+            else:
+                error = connection.table.receive_move(connection.player, argument.strip())
+                if error:
+                    connection.send('ERROR', error)
+        elif command == 'TABLES':
+            connection.send('TABLES', *self.tables)
+        elif command == 'WATCH':
+            self.watch(connection, argument.strip())
+        elif command == 'UNWATCH':
+            if connection.watching is None:
+                connection.send('ERROR', 'You are not watching a table.')
+            self.unwatch(connection)
+        elif command == 'QUIT':
+            return False
+        elif command:
+            connection.send('ERROR', f'There is no command {command}.')
+        return True
+
+    def join(self, connection: Connection, name: str) -> None:
+        """Seats a client's player, and starts a table once enough remote players are waiting."""
+        if connection.player is not None:
+            connection.send('ERROR', 'You have already joined.')
+        elif not 0 < len(name) <= MAX_NAME_LENGTH or ' ' in name or ':' in name:
+            connection.send('ERROR', f'Names have 1 to {MAX_NAME_LENGTH} characters, without spaces or colons.')
+        elif any(player.name == name for player in self.waiting):
+            connection.send('ERROR', f'The name {name} is taken.')
+        else:
+            player = RemotePlayer(name, connection)
+            player.chips = self.starting_chips
+            connection.player = player
+            self.waiting.append(player)
+            if len(self.waiting) < self.remote_seats:
+                connection.send('WAITING', self.remote_seats - len(self.waiting))
+            else:
+                self.start_table()
+
+    def start_table(self) -> None:
+        """Starts a table with the waiting remote players and as many computer players as there are seats left."""
+        players: list[Player] = self.waiting[:self.remote_seats]
+        del self.waiting[:self.remote_seats]
+        # Computer names past the first few have a number after a space, which the protocol cannot hold
+        names = [name.replace(' ', '') for name in generate_computer_names(self.seats)]
+        names = [name for name in names if name not in [player.name for player in players]]
+        for name in names[:self.seats - len(players)]:
+            computer = Computer(name, random.choice(self.playing_styles))
+            computer.chips = self.starting_chips
+            players.append(computer)
+        random.shuffle(players)
+        self._num_tables += 1
+        table = ServerTable(self._num_tables, players, self.big_blind, self.move_timeout, self.move_delay)
+        self.tables[table.number] = table
+        for player in table.remote_players:
+            player.connection.table = table
+        task = asyncio.get_running_loop().create_task(self.play_table(table))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def play_table(self, table: ServerTable) -> None:
+        try:
+            await table.play()
+        finally:
+            del self.tables[table.number]
+            for player in table.remote_players:
+                # A player out of chips may have joined another table since
+                if player.connection is not None and player.connection.player is player:
+                    player.connection.player = None
+                    player.connection.table = None
+            for subscriber in list(table.broadcaster.subscribers):
+                self.unwatch(subscriber)
+
+    def watch(self, connection: Connection, number: str) -> None:
+        """Sends a client the state of a table, and then every line its players are sent apart from their own."""
+        table = self.tables.get(int(number)) if number.isdigit() else None
+        if table is None:
+            connection.send('ERROR', f'There is no table {number}.')
+        elif connection.table is table:
+            connection.send('ERROR', 'You are seated at that table.')
+        else:
+            self.unwatch(connection)
+            connection.watching = table
+            table.broadcaster.subscribe(connection)
+
+    def unwatch(self, connection: Connection) -> None:
+        """Stops sending a client the lines of the table it is watching."""
+        if connection.watching is not None:
+            connection.watching.broadcaster.unsubscribe(connection)
+            connection.watching = None
+
+    def leave(self, connection: Connection) -> None:
+        """Takes a disconnected client's player out of the waiting list, or out of play at its table."""
+        if connection.player in self.waiting:
+            self.waiting.remove(connection.player)
+        elif connection.table is not None:
+            connection.table.player_left(connection.player)
+        connection.player = None
+        connection.table = None
+        self.unwatch(connection)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Play poker over TCP with remote and computer players.')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on')
+    parser.add_argument('--port', type=int, default=7777, help='port to listen on')
+    parser.add_argument('--remote-seats', type=int, default=1, help='remote players a table waits for')
+    parser.add_argument('--seats', type=int, default=6, help='seats at a table, filled with computer players')
+    parser.add_argument('--chips', type=int, default=1000, help='starting chips of each player')
+    parser.add_argument('--big-blind', type=int, default=20, help='starting big blind')
+    parser.add_argument('--styles', nargs='+', choices=[style.name for style in ComputerPlayingStyle],
+                        help='computer playing styles to pick from, defaults to every style but MCTS')
+    parser.add_argument('--move-timeout', type=float, default=30.0, help='seconds a remote player has to move')
+    parser.add_argument('--move-delay', type=float, default=1.0, help='seconds to wait after each move')
+    args = parser.parse_args()
+
+    server = PokerServer(args.remote_seats, args.seats, args.chips, args.big_blind,
+                         [ComputerPlayingStyle[style] for style in args.styles] if args.styles else None,
+                         args.move_timeout, args.move_delay)
+
+    async def serve():
+        port = await server.start(args.host, args.port)
+        print(f'Serving poker on {args.host}:{port}.')
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from src.poker.card import Card
+from src.poker.enums.variant import Variant
+from src.poker.players.player import Player
+from src.poker.utils import lookup_tables, short_deck
+from src.poker.utils.hand_evaluator import get_category
+from src.poker.utils.hand_ranking_utils import handrank_int_str_dict
+from src.poker.utils.lookup_tables import CARD_RANK_BITS, CARD_RANK_KEYS, LookupTables
+from src.poker.utils.omaha import OmahaBoard
+
+# The lookup tables that score the 7 card hands of each variant that has them, and the name of each rank category of
+# each variant
+VARIANT_TABLES = {Variant.HOLDEM: lookup_tables.get_tables, Variant.SHORT_DECK: short_deck.get_tables}
+HAND_RANKS = {Variant.HOLDEM: handrank_int_str_dict, Variant.OMAHA: handrank_int_str_dict,
+              Variant.SHORT_DECK: short_deck.HANDRANKS}
+
+
+class ShowdownBatch:
+    """Collects pending showdowns from many tables and scores them all at once.
+
+    Every hold'em hand in the batch, from every table, is scored in one NumPy gather
+    into the lookup tables, and so is every short deck hand, instead of each table
+    scoring its own players. Omaha hands are scored against their table's community,
+    broken down once. Only the score and rank of each player's best hand are filled
+    in, not the best hand cards or kicker used to display the showdown.
+
+    Attributes:
+        pending: The submitted showdowns, as (table, pots, community, variant) tuples
+    """
+
+    def __init__(self) -> None:
+        self.pending: list[tuple[object, list[list[Player]], list[Card], Variant]] = []
+
+    def submit(self, table: object, pots: list[list[Player]], community: list[Card],
+               variant: Variant = Variant.HOLDEM) -> None:
+        """Adds a table's showdown to the batch.
+
+        Args:
+            table: Identifies the table the showdown belongs to
+            pots: The unfolded players eligible for each pot
+            community: The community cards
+            variant: The poker variant the table plays, which decides how its hands are scored
+        """
+        self.pending.append((table, pots, list(community), variant))
+
+    def resolve(self) -> dict[object, list[list[Player]]]:
+        """Scores every pending showdown and empties the batch.
+
+        Returns:
+            The winners of each pot, by table, in the order the pots were submitted
+        """
+        players: dict[Variant, list[Player]] = {variant: [] for variant in VARIANT_TABLES}
+        hands: dict[Variant, list[list[int]]] = {variant: [] for variant in VARIANT_TABLES}
+        for _, pots, community, variant in self.pending:
+            table_players = dict.fromkeys(player for pot in pots for player in pot)
+            board = [card.to_int() for card in community]
+            if variant is Variant.OMAHA:
+                omaha_board = OmahaBoard(board)
+                for player in table_players:
+                    self._set_score(player, omaha_board.score([card.to_int() for card in player.hand]), variant)
+                continue
+            for player in table_players:
+                players[variant].append(player)
+                hands[variant].append([card.to_int() for card in player.hand] + board)
+        for variant, variant_hands in hands.items():
+            if variant_hands:
+                scores = score_hands(VARIANT_TABLES[variant](), variant_hands)
+                for player, score in zip(players[variant], scores):
+                    self._set_score(player, score, variant)
+
+        winners = {}
+        for table, pots, _, _ in self.pending:
+            pot_winners = []
+            for pot in pots:
+                best_score = max(player.best_hand_score for player in pot)
+                pot_winners.append([player for player in pot if player.best_hand_score == best_score])
+            winners[table] = pot_winners
+        self.pending = []
+        return winners
+
+    @staticmethod
+    def _set_score(player: Player, score: int, variant: Variant) -> None:
+        player.best_hand_score = score
+        player.best_hand_rank = HAND_RANKS[variant][get_category(score)]
+
+
+def score_hands(tables: LookupTables, hands: list[list[int]]) -> list[int]:
+    """Scores many 7 card hands, as card numbers from Card.to_int(), with one NumPy gather into the lookup tables.
+
+    These are the same table reads as LookupTables.hand_strength, for every hand at once.
+    """
+    # Imported here so that importing the engine does not pay for it
+    import numpy as np
+
+    cards = np.array(hands)
+    strengths = np.frombuffer(tables.rank_table, dtype=np.uint16)[np.array(CARD_RANK_KEYS)[cards].sum(axis=1)]
+    flush_table = np.frombuffer(tables.flush_table, dtype=np.uint16)
+    rank_bits = np.array(CARD_RANK_BITS)[cards]
+    # With 7 cards, a flush rules out a full house or four of a kind, so it is the best hand whenever there is one
+    for suit in range(4):
+        strengths = np.maximum(strengths, flush_table[(rank_bits * (cards & 3 == suit)).sum(axis=1)])
+    return np.frombuffer(tables.scores, dtype=np.int64)[strengths].tolist()
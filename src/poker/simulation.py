@@ -0,0 +1,168 @@
+"""
+#######################################################################################################################
+Simulations for comparing computer playing styles without a display.
+
+Duplicate mode deals each seeded deck once for every rotation of the players around the table, so every playing style
+is dealt every seat's cards. Luck of the deal cancels out of each deck's results, and far fewer hands are needed
+before the difference between playing styles shows through the noise. Runs can also stop on their own, as soon as a
+sequential test has ranked the playing styles, and all-in hands can be run out many times, which takes most of the luck
+of the board out of their results too.
+#######################################################################################################################
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+from typing import Iterator
+
+from src.poker.enums.computer_playing_style import DEFAULT_PLAYING_STYLES, ComputerPlayingStyle
+from src.poker.game import Game
+from src.poker.players.computer import Computer
+from src.poker.prompts.silent_prompt import SilentPresenter
+from src.poker.utils import cfr, equity
+from src.poker.utils.sequential_testing import SequentialComparison
+
+silent_presenter = SilentPresenter()
+
+
+def play_duplicate_deck(lineup: list[ComputerPlayingStyle], deck_seed: int, starting_chips: int,
+                        big_blind: int, run_it_times: int = 1) -> dict[ComputerPlayingStyle, int]:
+    """Plays one hand from the same deck once for each rotation of the players around the table.
+
+    The dealer button stays on the first seat, so in every rotation the same seats
+    get the same cards and the same positions, and only the playing styles move.
+
+    Args:
+        lineup: The playing style in each seat for the first rotation
+        deck_seed: Seeds the shuffle, so every rotation is dealt the same cards
+        starting_chips: The chips each player starts each rotation with
+        big_blind: The big blind bet
+        run_it_times: How many times to deal the rest of the board when players are all-in
+
+    Returns:
+        The chips won, or lost if negative, by each playing style over all rotations
+    """
+    results = dict.fromkeys(lineup, 0)
+    for rotation in range(len(lineup)):
+        styles = lineup[rotation:] + lineup[:rotation]
+        players = [Computer(f'Seat {seat + 1}', style) for seat, style in enumerate(styles)]
+        for player in players:
+            player.chips = starting_chips
+        game = Game(presenter=silent_presenter, players=players, big_blind=big_blind)
+        game.deck.rng = random.Random(deck_seed)
+        game.run_it_times = run_it_times
+        # The button moves one seat to the left before the hand, which puts it on the first seat
+        game.dealer = players[-1]
+        game.play_hand()
+        for player in players:
+            results[player.playing_style] += player.chips - starting_chips
+    return results
+
+
+def iter_duplicate_decks(lineup: list[ComputerPlayingStyle], seed: int | None = None, starting_chips: int = 2000,
+                         big_blind: int = 20, run_it_times: int = 1) -> Iterator[dict[ComputerPlayingStyle, int]]:
+    """Yields the results of one duplicate deck after another, forever.
+
+    Args:
+        lineup: The playing style in each seat for the first rotation
+        seed: Seeds the sequence of decks, so that a run can be repeated
+        starting_chips: The chips each player starts each rotation with
+        big_blind: The big blind bet
+        run_it_times: How many times to deal the rest of the board when players are all-in
+    """
+    rng = random.Random(seed)
+    while True:
+        yield play_duplicate_deck(lineup, rng.getrandbits(64), starting_chips, big_blind, run_it_times)
+
+
+def run_duplicate(lineup: list[ComputerPlayingStyle], num_decks: int, seed: int | None = None,
+                  starting_chips: int = 2000, big_blind: int = 20,
+                  run_it_times: int = 1) -> list[dict[ComputerPlayingStyle, int]]:
+    """Plays a number of duplicate decks.
+
+    Returns:
+        The chips won by each playing style, for each deck
+    """
+    decks = iter_duplicate_decks(lineup, seed, starting_chips, big_blind, run_it_times)
+    return [next(decks) for _ in range(num_decks)]
+
+
+def run_until_decided(lineup: list[ComputerPlayingStyle], max_decks: int, alpha: float = 0.05,
+                      margin: float | None = None, seed: int | None = None, starting_chips: int = 2000,
+                      big_blind: int = 20, run_it_times: int = 1) -> SequentialComparison:
+    """Plays duplicate decks until the ranking of the playing styles is decided, or max_decks are played.
+
+    Args:
+        lineup: The playing style in each seat for the first rotation
+        max_decks: The most decks to play
+        alpha: The chance of getting any part of the ranking wrong
+        margin: Playing styles whose chips won per deck differ by less than this are
+            too close to call. Defaults to the big blind.
+        seed: Seeds the sequence of decks, so that a run can be repeated
+
+    Returns:
+        The comparison of the playing styles. Its num_samples is the number of decks played.
+    """
+    styles = list(dict.fromkeys(lineup))
+    comparison = SequentialComparison(styles, alpha, big_blind if margin is None else margin)
+    decks = iter_duplicate_decks(lineup, seed, starting_chips, big_blind, run_it_times)
+    while comparison.num_samples < max_decks and not comparison.is_decided():
+        comparison.add(next(decks))
+    return comparison
+
+
+def make_lineup(styles: list[ComputerPlayingStyle], num_seats: int) -> list[ComputerPlayingStyle]:
+    """Fills the seats of a table by repeating the playing styles in order."""
+    return [styles[seat % len(styles)] for seat in range(num_seats)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare computer playing styles with duplicate deals.')
+    parser.add_argument('--styles', nargs='+', default=[style.name for style in DEFAULT_PLAYING_STYLES],
+                        choices=[style.name for style in ComputerPlayingStyle],
+                        help='playing styles to compare, defaults to every style but MCTS')
+    parser.add_argument('--seats', type=int, help='players per table, defaults to one per playing style')
+    parser.add_argument('--decks', type=int, default=1000,
+                        help='number of duplicate decks to play, or the most to play with --until-decided')
+    parser.add_argument('--until-decided', action='store_true',
+                        help='stop as soon as the ranking of the playing styles is statistically decided')
+    parser.add_argument('--alpha', type=float, default=0.05, help='chance of getting the ranking wrong')
+    parser.add_argument('--margin', type=float,
+                        help='chips per deck within which styles are too close to call, defaults to the big blind')
+    parser.add_argument('--seed', type=int, help='seed for the sequence of decks')
+    parser.add_argument('--chips', type=int, default=2000, help='chips each player starts each hand with')
+    parser.add_argument('--big-blind', type=int, default=20, help='big blind bet')
+    parser.add_argument('--run-it', type=int, default=1, metavar='TIMES',
+                        help='times to deal the rest of the board when players are all-in')
+    parser.add_argument('--equity-cache', metavar='FILE', help='hand equity cache for computer players')
+    parser.add_argument('--strategies', nargs='+', metavar='FILE', default=[],
+                        help='solved subgame strategies for computer players, from python -m src.poker.utils.cfr')
+    args = parser.parse_args()
+    if args.equity_cache:
+        equity.shared_calculator.cache = equity.EquityCache(args.equity_cache, read_only=True)
+    cfr.shared_tables.extend(cfr.StrategyTable(path, read_only=True) for path in args.strategies)
+
+    styles = [ComputerPlayingStyle[name] for name in args.styles]
+    lineup = make_lineup(styles, args.seats or len(styles))
+    if args.until_decided:
+        comparison = run_until_decided(lineup, args.decks, args.alpha, args.margin, args.seed, args.chips,
+                                       args.big_blind, args.run_it)
+        num_decks = comparison.num_samples
+        chips_per_deck = {style: comparison.results[style].mean for style in styles}
+    else:
+        results = run_duplicate(lineup, args.decks, args.seed, args.chips, args.big_blind, args.run_it)
+        num_decks = len(results)
+        chips_per_deck = {style: sum(deck[style] for deck in results) / num_decks for style in styles}
+    print(f'Played {num_decks} decks, {num_decks * len(lineup)} hands.')
+    for style in sorted(styles, key=chips_per_deck.get, reverse=True):
+        print(f'{style.name:>8}: {chips_per_deck[style]:>+10.1f} chips per deck')
+    if args.until_decided:
+        print()
+        for a, b in comparison.differences:
+            verdict = comparison.decide(a, b) or 'undecided'
+            print(f'{a.name:>8} vs {b.name:<8} {verdict}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from src.poker.blind_schedule import BlindSchedule
 from src.poker.enums.betting_move import BettingMove
 from src.poker.enums.phase import Phase
 from src.poker.players.player import Player
@@ -8,15 +9,18 @@ from src.poker.players.player import Player
 class Table:
     increase_blind_hand_increments = 5
 
-    def __init__(self):
+    def __init__(self, blind_schedule: BlindSchedule | None = None):
         self.hands_played = 0
         self.community = []
         self.pots = []
         self.pot_transfers: list[int] = []
         self.last_bet = 0
         self.big_blind = 0
+        self.small_blind = 0
+        self.ante = 0
         self.raise_amount = 0
         self.num_times_raised = 0
+        self.blind_schedule = blind_schedule
 
     def reset(self, active_players: list[Player]) -> None:
         """Resets the table for the next hand to be played."""
@@ -25,16 +29,26 @@ class Table:
         self.pot_transfers = []
         self.last_bet = 0
         self.num_times_raised = 0
-        if self.check_increase_big_blind():
-            self.big_blind *= 2
+        if self.blind_schedule:
+            level = self.blind_schedule.advance(self.hands_played)
+            self.small_blind = level.small_blind
+            self.big_blind = level.big_blind
+            self.ante = level.ante
+        else:
+            if self.check_increase_big_blind():
+                self.big_blind *= 2
+            self.small_blind = int(self.big_blind / 2)
         self.raise_amount = self.big_blind
 
     def check_increase_big_blind(self) -> bool:
         """Checks if the big blind should be increased.
 
         Some versions of Texas Hold'Em periodically increase the
-        big blind to speed up the game.
+        big blind to speed up the game. Tables following a blind schedule
+        take their blinds from the schedule instead.
         """
+        if self.blind_schedule:
+            return False
         return (self.hands_played > 0 and
                 self.hands_played % Table.increase_blind_hand_increments == 0)
 
@@ -47,9 +61,8 @@ class Table:
         Returns:
             True if player was forced to go all-in, else False
         """
-        small_blind = int(self.big_blind / 2)
-        if player.chips > small_blind:
-            self.last_bet = player.match_bet(small_blind)
+        if player.chips > self.small_blind:
+            self.last_bet = player.match_bet(self.small_blind)
             return False
         else:
             player.go_all_in()
@@ -60,6 +73,38 @@ class Table:
                 self.last_bet = player.bet
             return True
 
+    def take_antes(self, players: list[Player]) -> list[Player]:
+        """Takes the ante from each player and adds it to the main pot.
+
+        Antes are dead money, so they do not count towards a player's bet.
+        A player who cannot cover the ante antes their remaining chips and
+        is all-in for the main pot, which only takes that much from each
+        player. The rest of the antes, and every bet after them, go to side
+        pots the player is not eligible for.
+
+        Args:
+            players: The players to collect the ante from
+
+        Returns:
+            The players who were forced to go all-in
+        """
+        all_in_players = []
+        antes = {}
+        for player in players:
+            antes[player] = min(self.ante, player.chips)
+            player.chips -= antes[player]
+            if player.chips == 0:
+                player.is_all_in = True
+                all_in_players.append(player)
+        previous_level = 0
+        for level in sorted({antes[player] for player in all_in_players}):
+            self.pots[-1][0] += sum(min(ante, level) - previous_level for ante in antes.values()
+                                    if ante > previous_level)
+            self.pots.append([0, [player for player in players if antes[player] > level or not player.is_all_in]])
+            previous_level = level
+        self.pots[-1][0] += sum(ante - previous_level for ante in antes.values() if ante > previous_level)
+        return all_in_players
+
     def take_big_blind(self, player: Player) -> bool:
         """Takes the big blind bet from a player.
 
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import argparse
+import math
+import random
+
+from src.poker.blind_schedule import BlindSchedule
+from src.poker.enums.computer_playing_style import DEFAULT_PLAYING_STYLES, ComputerPlayingStyle
+from src.poker.game import Game, generate_computer_names
+from src.poker.players.computer import Computer
+from src.poker.players.player import Player
+from src.poker.prompts.silent_prompt import SilentPresenter
+from src.poker.showdown_batch import ShowdownBatch
+from src.poker.utils import cfr, equity
+from src.poker.utils.profiler import Profiler
+
+
+class Tournament:
+    """A multi-table tournament of computer players, played without a display.
+
+    Each round plays one hand at every table. Busted players are removed from
+    their table, and players are moved between tables to keep them balanced,
+    breaking tables as the field shrinks. Tables are tracked in buckets by how
+    many players they seat, so the work done each round only depends on the
+    number of hands played, not on the size of the field. Showdowns from every
+    table in a round are scored together in one batch.
+
+    Args:
+        num_entrants: The number of players entering the tournament
+        starting_chips: The chips each player starts with
+        blind_schedule: The blind and ante structure shared by every table
+        big_blind: The starting big blind if there is no blind schedule
+        seats_per_table: The most players seated at one table
+        playing_styles: The playing styles to pick from at random for each entrant.
+            Defaults to every style but MCTS, which is too slow for a large field.
+        profiler: Times the engine phases of every table when given
+        batch_showdowns: If True, score each round's showdowns together in one batch
+
+    Attributes:
+        tables: The tables still in play, by table number
+        eliminated: The players knocked out so far, in the order they busted
+        hands_played: The number of hands played across all tables
+    """
+
+    def __init__(self, num_entrants: int, starting_chips: int, blind_schedule: BlindSchedule | None = None,
+                 big_blind: int = 0, seats_per_table: int = 9,
+                 playing_styles: list[ComputerPlayingStyle] | None = None, profiler: Profiler | None = None,
+                 batch_showdowns: bool = True):
+        if num_entrants < 2:
+            raise ValueError(f'A tournament needs at least 2 entrants, not {num_entrants}.')
+        if seats_per_table < 2:
+            raise ValueError(f'A table needs at least 2 seats, not {seats_per_table}.')
+        self.seats_per_table = seats_per_table
+        self.tables: dict[int, Game] = {}
+        self.eliminated: list[Player] = []
+        self.hands_played = 0
+        self.num_remaining = num_entrants
+        self.showdown_batch = ShowdownBatch() if batch_showdowns else None
+        self._tables_by_size: list[set[int]] = [set() for _ in range(seats_per_table + 1)]
+
+        styles = playing_styles or DEFAULT_PLAYING_STYLES
+        players = [Computer(name, random.choice(styles)) for name in generate_computer_names(num_entrants)]
+        for player in players:
+            player.chips = starting_chips
+        num_tables = math.ceil(num_entrants / seats_per_table)
+        presenter = SilentPresenter()
+        for table_number in range(num_tables):
+            self.tables[table_number] = Game(blind_schedule, profiler, presenter=presenter,
+                                             players=players[table_number::num_tables], big_blind=big_blind)
+            self.tables[table_number].showdown_batch = self.showdown_batch
+            self._tables_by_size[len(self.tables[table_number].players)].add(table_number)
+
+    def play(self, max_hands: int | None = None) -> list[Player]:
+        """Plays until one player has all the chips or max_hands hands have been played.
+
+        Returns:
+            The players still in the tournament, sorted by chips
+        """
+        while self.num_remaining > 1 and (max_hands is None or self.hands_played < max_hands):
+            self.play_round()
+        return self.get_chip_leaders()
+
+    def play_round(self) -> None:
+        """Plays one hand at every table, then knocks out busted players and balances the tables."""
+        for game in self.tables.values():
+            game.play_hand()
+            self.hands_played += 1
+        if self.showdown_batch:
+            for game, pot_winners in self.showdown_batch.resolve().items():
+                game.finish_batched_showdown(pot_winners)
+        for table_number in self.tables:
+            self.eliminate_busted_players(table_number)
+        self.balance_tables()
+
+    def eliminate_busted_players(self, table_number: int) -> None:
+        game = self.tables[table_number]
+        busted_players = [player for player in game.players if player.chips == 0]
+        for player in busted_players:
+            player.is_in_game = False
+            self.remove_from_table(player, table_number)
+            self.eliminated.append(player)
+        self.num_remaining -= len(busted_players)
+
+    def balance_tables(self) -> None:
+        """Breaks tables the rest of the field has room for, then evens out table sizes."""
+        while len(self.tables) > 1 and self.num_remaining <= (len(self.tables) - 1) * self.seats_per_table:
+            self.break_table(self.get_smallest_table())
+        while len(self.tables) > 1:
+            smallest, largest = self.get_smallest_table(), self.get_largest_table()
+            if len(self.tables[largest].players) - len(self.tables[smallest].players) <= 1:
+                break
+            player = self.tables[largest].players[-1]
+            self.remove_from_table(player, largest)
+            self.seat_at_table(player, smallest)
+
+    def break_table(self, table_number: int) -> None:
+        """Closes a table and moves each of its players to the smallest remaining table."""
+        players = list(self.tables[table_number].players)
+        self._tables_by_size[len(players)].discard(table_number)
+        del self.tables[table_number]
+        for player in players:
+            self.seat_at_table(player, self.get_smallest_table())
+
+    def seat_at_table(self, player: Player, table_number: int) -> None:
+        game = self.tables[table_number]
+        self._tables_by_size[len(game.players)].discard(table_number)
+        game.add_player(player)
+        self._tables_by_size[len(game.players)].add(table_number)
+
+    def remove_from_table(self, player: Player, table_number: int) -> None:
+        game = self.tables[table_number]
+        self._tables_by_size[len(game.players)].discard(table_number)
+        game.remove_player(player)
+        self._tables_by_size[len(game.players)].add(table_number)
+
+    def get_smallest_table(self) -> int:
+        tables = next(tables for tables in self._tables_by_size if tables)
+        return next(iter(tables))
+
+    def get_largest_table(self) -> int:
+        tables = next(tables for tables in reversed(self._tables_by_size) if tables)
+        return next(iter(tables))
+
+    def get_chip_leaders(self) -> list[Player]:
+        players = [player for game in self.tables.values() for player in game.players]
+        return sorted(players, key=lambda player: player.chips, reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate a multi-table tournament of computer players.')
+    parser.add_argument('--entrants', type=int, default=1000, help='number of players entering the tournament')
+    parser.add_argument('--chips', type=int, default=1500, help='chips each player starts with')
+    parser.add_argument('--blinds', metavar='FILE', help='JSON file with the blind and ante structure to play')
+    parser.add_argument('--big-blind', type=int, default=20, help='starting big blind if no blind file is given')
+    parser.add_argument('--seats', type=int, default=9, help='most players seated at one table')
+    parser.add_argument('--max-hands', type=int, help='stop after this many hands across all tables')
+    parser.add_argument('--profile', metavar='TRACE_FILE', help='write a Chrome trace file of the engine phases')
+    parser.add_argument('--equity-cache', metavar='FILE', help='hand equity cache for computer players')
+    parser.add_argument('--strategies', nargs='+', metavar='FILE', default=[],
+                        help='solved subgame strategies for computer players, from python -m src.poker.utils.cfr')
+    parser.add_argument('--styles', nargs='+', default=[style.name for style in DEFAULT_PLAYING_STYLES],
+                        choices=[style.name for style in ComputerPlayingStyle],
+                        help='playing styles of the entrants, defaults to every style but MCTS')
+    args = parser.parse_args()
+    if args.equity_cache:
+        equity.shared_calculator.cache = equity.EquityCache(args.equity_cache, read_only=True)
+    cfr.shared_tables.extend(cfr.StrategyTable(path, read_only=True) for path in args.strategies)
+
+    blind_schedule = BlindSchedule.from_file(args.blinds) if args.blinds else None
+    profiler = Profiler(max_trace_events=1_000_000 if args.profile else 0)
+    tournament = Tournament(args.entrants, args.chips, blind_schedule, args.big_blind, args.seats,
+                            [ComputerPlayingStyle[name] for name in args.styles], profiler=profiler)
+    chip_leaders = tournament.play(args.max_hands)
+    print(profiler.summary())
+    print(f'\n{len(chip_leaders)} of {args.entrants} players remain after {tournament.hands_played} hands.')
+    for player in chip_leaders[:10]:
+        print(f'{player.name:>20}  {player.playing_style.name:<7}{player.chips:>12,}')
+    if args.profile:
+        profiler.export_chrome_trace(args.profile)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,422 @@
+"""
+#######################################################################################################################
+Card abstraction: hands grouped into buckets of hands that play alike, so that solvers and learned players can treat a
+bucket as one hand. Each street is bucketed on its own, for every canonical board of the street.
+
+On the river, a hand is described by its equity against a random hand. Before the river, it is described by a histogram
+of that river equity over every way the rest of the board can come, so that a draw and a weak made hand with the same
+average equity still land in different buckets. The descriptions are grouped with k-means, comparing histograms by
+their cumulative sums, so that histograms with their weight in nearby bins count as closer than ones far apart.
+
+The pipeline runs offline using every core, river first, since the other streets read the river equities back:
+
+    python -m src.poker.utils.buckets buckets --streets river turn flop preflop --buckets 50
+
+Features are saved to memory-mapped files as each batch of boards is finished, so a run that is stopped picks up where
+it left off. The buckets of a street are saved as a byte per hand on each canonical board, along with the canonical
+board and suit relabeling of every board, so looking up a hand's bucket is a few array reads.
+#######################################################################################################################
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from itertools import chain, combinations, islice
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from src.poker.utils.canonical import RELABELINGS
+from src.poker.utils.cfr import HAND_INDEX, HANDS, NUM_HANDS, river_equities, valid_hands
+from src.poker.utils.equity import STREETS
+from src.poker.utils.lookup_tables import worker_pool
+
+# The number of ways to choose k of n cards, indexed by [n, k], for numbering the boards of a size
+COMBINATIONS = np.array([[math.comb(n, k) for k in range(6)] for n in range(53)])
+
+# The index of each hand under each relabeling of the suits
+HAND_RELABELINGS = HAND_INDEX[np.array(RELABELINGS)[:, HANDS[:, 0]], np.array(RELABELINGS)[:, HANDS[:, 1]]]
+# The bitmask of the two cards of each hand
+HAND_MASKS = (1 << HANDS).sum(axis=1)
+
+
+def board_ranks(boards: np.ndarray) -> np.ndarray:
+    """Returns the number of each board among all boards of its size, from 0 up, from boards sorted in increasing order.
+
+    Args:
+        boards: One board of card numbers per row
+    """
+    return COMBINATIONS[boards, np.arange(1, boards.shape[1] + 1)].sum(axis=1)
+
+
+def board_rank(board: list[int]) -> int:
+    """Returns the number of one board among all boards of its size. See board_ranks()."""
+    return int(COMBINATIONS[sorted(board), np.arange(1, len(board) + 1)].sum())
+
+
+def index_boards(board_size: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns every canonical board of a size, and for each board, the canonical board and the relabeling of the suits
+    that turns it into the canonical board.
+
+    A canonical board is the suit relabeling of a board with the lowest board_rank().
+
+    Returns:
+        The canonical boards, one per row; the row of the canonical board of each board; and the index into
+        RELABELINGS of the relabeling of each board. The last two are indexed by board_rank().
+    """
+    num_boards = math.comb(52, board_size)
+    boards = np.fromiter(chain.from_iterable(combinations(range(52), board_size)), dtype=np.int64,
+                         count=num_boards * board_size).reshape(num_boards, board_size)
+    ranks = board_ranks(boards)
+    canonical_ranks = ranks.copy()
+    relabelings = np.zeros(num_boards, dtype=np.uint8)
+    for i, relabel in enumerate(np.array(RELABELINGS)):
+        relabeled_ranks = board_ranks(np.sort(relabel[boards], axis=1))
+        lower = relabeled_ranks < canonical_ranks
+        canonical_ranks[lower] = relabeled_ranks[lower]
+        relabelings[lower] = i
+    unique_ranks, rows = np.unique(canonical_ranks, return_inverse=True)
+    boards_by_rank = np.empty_like(boards)
+    boards_by_rank[ranks] = boards
+    rows_by_rank = np.empty(num_boards, dtype=np.int32)
+    rows_by_rank[ranks] = rows
+    relabelings_by_rank = np.empty(num_boards, dtype=np.uint8)
+    relabelings_by_rank[ranks] = relabelings
+    return boards_by_rank[unique_ranks].astype(np.uint8), rows_by_rank, relabelings_by_rank
+
+
+def equity_histograms(board: list[int], river_equity: Callable[[np.ndarray], np.ndarray], num_bins: int,
+                      batch_size: int = 4096) -> np.ndarray:
+    """Returns the histogram of every hand's river equity over every way the rest of a board can come.
+
+    Args:
+        board: The board, with fewer than 5 cards
+        river_equity: Returns the equity of every hand on each of an array of 5 card boards sorted in increasing
+            order, one board per row
+        num_bins: The number of equal bins the equities from 0 to 1 are split into
+        batch_size: The number of river boards looked up at once
+
+    Returns:
+        The share of the river boards in each bin, one row per hand. Hands that share a card with the board are 0.
+    """
+    valid = valid_hands(board)
+    counts = np.zeros(NUM_HANDS * num_bins, dtype=np.int64)
+    offsets = np.arange(NUM_HANDS) * num_bins
+    rest = [card for card in range(52) if card not in board]
+    num_cards = 5 - len(board)
+    deals = combinations(rest, num_cards)
+    while True:
+        dealt = np.fromiter(chain.from_iterable(islice(deals, batch_size)), dtype=np.int64).reshape(-1, num_cards)
+        if not len(dealt):
+            break
+        river_boards = np.sort(np.hstack([np.broadcast_to(board, (len(dealt), len(board))).astype(np.int64), dealt]),
+                               axis=1)
+        bins = np.minimum((river_equity(river_boards) * num_bins).astype(np.int64), num_bins - 1)
+        unblocked = valid & ((HAND_MASKS & (1 << dealt).sum(axis=1, keepdims=True)) == 0)
+        counts += np.bincount((offsets + bins)[unblocked], minlength=len(counts))
+    counts = counts.reshape(NUM_HANDS, num_bins)
+    totals = counts.sum(axis=1, keepdims=True)
+    return np.divide(counts, totals, out=np.zeros(counts.shape), where=totals > 0)
+
+
+def kmeans(points: np.ndarray, num_clusters: int, iterations: int = 100,
+           rng: np.random.Generator | None = None) -> np.ndarray:
+    """Groups points into clusters with k-means, starting from k-means++ centers.
+
+    Args:
+        points: One point per row
+        num_clusters: The number of clusters
+        iterations: The most rounds of moving the centers, stopping early once no point changes cluster
+        rng: The random number generator, or None for a fresh one
+
+    Returns:
+        The center of each cluster, one per row
+    """
+    rng = rng or np.random.default_rng()
+    points = np.asarray(points, dtype=float)
+    centers = np.empty((num_clusters, points.shape[1]))
+    centers[0] = points[rng.integers(len(points))]
+    distances = ((points - centers[0]) ** 2).sum(axis=1)
+    for i in range(1, num_clusters):
+        total = distances.sum()
+        centers[i] = points[rng.choice(len(points), p=distances / total) if total > 0 else rng.integers(len(points))]
+        distances = np.minimum(distances, ((points - centers[i]) ** 2).sum(axis=1))
+    clusters = None
+    for _ in range(iterations):
+        new_clusters = nearest(points, centers)
+        if clusters is not None and (new_clusters == clusters).all():
+            break
+        clusters = new_clusters
+        counts = np.bincount(clusters, minlength=num_clusters)
+        sums = np.stack([np.bincount(clusters, weights=column, minlength=num_clusters) for column in points.T], axis=1)
+        filled = counts > 0
+        centers[filled] = sums[filled] / counts[filled, None]
+    return centers
+
+
+def nearest(points: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    """Returns the index of the closest center to each point."""
+    return ((centers ** 2).sum(axis=1) - 2 * points @ centers.T).argmin(axis=1)
+
+
+def open_features(path: str | Path, street: str, num_bins: int) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the memory-mapped features of every hand on every canonical board of a street, and whether each board's
+    features are done, creating the files the first time.
+
+    The features are the river equity on the river, and the equity histogram on the other streets.
+
+    Raises:
+        ValueError: If the street's features were started with a different number of bins
+    """
+    path = Path(path)
+    boards = _index(path, street)[0]
+    num_features = 1 if street == 'river' else num_bins
+    features_path = path / f'{street}_features.npy'
+    done_path = path / f'{street}_done.npy'
+    if not done_path.exists():
+        np.lib.format.open_memmap(features_path, 'w+', np.float16, (len(boards), NUM_HANDS, num_features)).flush()
+        np.lib.format.open_memmap(done_path, 'w+', np.bool_, (len(boards),)).flush()
+    features = np.load(features_path, mmap_mode='r+')
+    if features.shape[2] != num_features:
+        raise ValueError(f'{features_path} holds {features.shape[2]} bins, not {num_features}.')
+    return features, np.load(done_path, mmap_mode='r+')
+
+
+def compute_features(path: str | Path, street: str, num_bins: int = 10, processes: int | None = None,
+                     batch_size: int = 64) -> int:
+    """Computes the features of every hand on every canonical board of a street that are not done yet.
+
+    The work is split by batches of boards across a pool of processes. Each batch is
+    marked done once its features are saved, so a run that is stopped can be run
+    again to pick up where it left off.
+
+    Args:
+        path: The directory of the bucket files, created if it does not exist
+        street: The street, from STREETS
+        num_bins: The number of bins of the equity histograms
+        processes: The number of worker processes, defaults to one per core
+        batch_size: The number of boards given to a worker at a time
+
+    Returns:
+        The number of boards computed
+
+    Raises:
+        ValueError: If the street comes before the river and the river's features are not done
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    river_done = path / 'river_done.npy'
+    if street != 'river' and not (river_done.exists() and np.load(river_done, mmap_mode='r').all()):
+        raise ValueError(f'The river features must be computed before the {street} features.')
+    features, done = open_features(path, street, num_bins)
+    tasks = [(str(path), street, start, min(start + batch_size, len(done)), num_bins)
+             for start in range(0, len(done), batch_size) if not done[start:start + batch_size].all()]
+    num_computed = 0
+    with worker_pool(processes) as pool:
+        for start, batch in pool.imap_unordered(_compute_batch, tasks):
+            features[start:start + len(batch)] = batch
+            features.flush()
+            done[start:start + len(batch)] = True
+            done.flush()
+            num_computed += len(batch)
+    return num_computed
+
+
+def _compute_batch(task: tuple[str, str, int, int, int]) -> tuple[int, np.ndarray]:
+    path, street, start, stop, num_bins = task
+    boards = _index(Path(path), street)[0][start:stop].tolist()
+    if street == 'river':
+        return start, river_equities(boards)[..., None].astype(np.float16)
+    _, rows, relabelings = _index(Path(path), 'river')
+    river = np.load(Path(path) / 'river_features.npy', mmap_mode='r')
+
+    def river_equity(river_boards: np.ndarray) -> np.ndarray:
+        ranks = board_ranks(river_boards)
+        return river[rows[ranks][:, None], HAND_RELABELINGS[relabelings[ranks]], 0]
+
+    return start, np.array([equity_histograms(board, river_equity, num_bins) for board in boards], dtype=np.float16)
+
+
+def cluster(path: str | Path, street: str, num_buckets: int = 50, max_points: int = 200_000, iterations: int = 100,
+            seed: int = 0, batch_size: int = 64) -> np.ndarray:
+    """Groups the hands on every canonical board of a street into buckets, and saves the bucket of each.
+
+    The centers are found with k-means on a sample of hands, chosen at random in proportion
+    to how often they are dealt, then every hand goes in the bucket of the closest center.
+    Buckets are numbered by their equity, the lowest in bucket 0.
+
+    Args:
+        path: The directory of the bucket files
+        street: The street, from STREETS
+        num_buckets: The number of buckets, at most 256
+        max_points: The number of hands k-means is run on
+        iterations: The most rounds of k-means
+        seed: Seeds the sample and k-means, so that a run can be repeated
+        batch_size: The number of boards assigned to buckets at a time
+
+    Returns:
+        The center of each bucket
+
+    Raises:
+        ValueError: If the street's features are not done
+    """
+    path = Path(path)
+    boards, rows, _ = _index(path, street)
+    features = np.load(path / f'{street}_features.npy', mmap_mode='r')
+    if not np.load(path / f'{street}_done.npy', mmap_mode='r').all():
+        raise ValueError(f'The {street} features must be computed before its buckets.')
+    rng = np.random.default_rng(seed)
+    # Every canonical board stands for all of its relabelings, and is dealt that much more often
+    sample = np.sort(rng.choice(len(boards), max_points, p=np.bincount(rows) / len(rows)))
+    board_masks = (1 << boards.astype(np.int64)).sum(axis=1)
+    hands = rng.integers(NUM_HANDS, size=max_points)
+    blocked = (HAND_MASKS[hands] & board_masks[sample]) != 0
+    while blocked.any():
+        hands[blocked] = rng.integers(NUM_HANDS, size=blocked.sum())
+        blocked = (HAND_MASKS[hands] & board_masks[sample]) != 0
+    centers = kmeans(_points(features[sample, hands]), num_buckets, iterations, rng)
+    centers = centers[np.argsort(centers[:, 0] if street == 'river' else -centers.sum(axis=1))]
+
+    buckets_path = path / f'{street}_buckets.npy'
+    temp_path = path / f'{street}_buckets.{os.getpid()}.tmp.npy'
+    buckets = np.lib.format.open_memmap(temp_path, 'w+', np.uint8, (len(boards), NUM_HANDS))
+    for start in range(0, len(boards), batch_size):
+        batch = features[start:start + batch_size]
+        batch_buckets = nearest(_points(batch.reshape(-1, batch.shape[2])), centers).reshape(len(batch), NUM_HANDS)
+        valid = (HAND_MASKS & board_masks[start:start + batch_size, None]) == 0
+        buckets[start:start + batch_size] = np.where(valid, batch_buckets, 0)
+    buckets.flush()
+    del buckets
+    np.save(path / f'{street}_centers.npy', centers)
+    os.replace(temp_path, buckets_path)
+    return centers
+
+
+def _points(features: np.ndarray) -> np.ndarray:
+    """Returns the points k-means compares: equities as they are, and histograms as their cumulative sums."""
+    features = features.astype(float)
+    return features if features.shape[1] == 1 else np.cumsum(features, axis=1)
+
+
+def build_buckets(path: str | Path, streets: list[str], num_buckets: int = 50, num_bins: int = 10,
+                  max_points: int = 200_000, processes: int | None = None, seed: int = 0) -> None:
+    """Computes the features of the streets and groups their hands into buckets, river first.
+
+    Streets already bucketed into the same number of buckets are skipped.
+
+    Args:
+        path: The directory of the bucket files, created if it does not exist
+        streets: The streets, from STREETS
+        num_buckets: The number of buckets of each street, at most 256
+        num_bins: The number of bins of the equity histograms
+        max_points: The number of hands k-means is run on for each street
+        processes: The number of worker processes, defaults to one per core
+        seed: Seeds the sample and k-means, so that a run can be repeated
+    """
+    path = Path(path)
+    for street in sorted(streets, key=STREETS.get, reverse=True):
+        centers_path = path / f'{street}_centers.npy'
+        if (path / f'{street}_buckets.npy').exists() and len(np.load(centers_path)) == num_buckets:
+            continue
+        compute_features(path, street, num_bins, processes)
+        cluster(path, street, num_buckets, max_points, seed=seed)
+
+
+def _index(path: Path, street: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns index_boards() for a street, computing and saving it the first time."""
+    names = [path / f'{street}_{name}.npy' for name in ('boards', 'rows', 'relabelings')]
+    if not all(name.exists() for name in names):
+        for name, array in zip(names, index_boards(STREETS[street])):
+            temp_path = name.with_name(f'{name.stem}.{os.getpid()}.tmp.npy')
+            np.save(temp_path, array)
+            os.replace(temp_path, name)
+    return tuple(np.load(name, mmap_mode='r') for name in names)
+
+
+class BucketTables:
+    """The buckets saved by build_buckets(), memory-mapped, for looking up the bucket of a hand.
+
+    Args:
+        path: The directory of the bucket files
+
+    Attributes:
+        num_buckets: The number of buckets of each street that has been bucketed
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._tables: dict[int, tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        self.num_buckets: dict[str, int] = {}
+        for street, board_size in STREETS.items():
+            buckets_path = self.path / f'{street}_buckets.npy'
+            if buckets_path.exists():
+                _, rows, relabelings = _index(self.path, street)
+                self._tables[board_size] = rows, relabelings, np.load(buckets_path, mmap_mode='r')
+                self.num_buckets[street] = len(np.load(self.path / f'{street}_centers.npy'))
+
+    def bucket(self, hole: list[int], board: list[int]) -> int:
+        """Returns the bucket of hole cards on a board, both as card numbers from Card.to_int()."""
+        rows, relabelings, buckets = self._street_tables(board)
+        rank = board_rank(board)
+        return int(buckets[rows[rank], HAND_RELABELINGS[relabelings[rank], HAND_INDEX[hole[0], hole[1]]]])
+
+    def bucket_hands(self, board: list[int], num_buckets: int) -> np.ndarray:
+        """Returns the bucket of every hand on a board, or 0 for hands that share a card with it.
+
+        Takes the same arguments as equity_buckets(), so that it can be given to SubgameSolver.
+
+        Raises:
+            ValueError: If the board's street was bucketed into a different number of buckets
+        """
+        rows, relabelings, buckets = self._street_tables(board)
+        street = next(street for street, board_size in STREETS.items() if board_size == len(board))
+        if self.num_buckets[street] != num_buckets:
+            raise ValueError(f'{self.path} holds {self.num_buckets[street]} {street} buckets, not {num_buckets}.')
+        rank = board_rank(board)
+        return np.where(valid_hands(board), buckets[rows[rank]][HAND_RELABELINGS[relabelings[rank]]], 0)
+
+    def subgame_num_buckets(self, board_size: int) -> int:
+        """Returns the number of buckets of every street a subgame starting on boards of board_size cards plays.
+
+        Raises:
+            ValueError: If one of the streets was not bucketed, or they were bucketed into different numbers
+        """
+        streets = [street for street, size in STREETS.items() if size >= board_size]
+        missing = [street for street in streets if street not in self.num_buckets]
+        if missing:
+            raise ValueError(f'{self.path} holds no {" or ".join(missing)} buckets.')
+        counts = {self.num_buckets[street] for street in streets}
+        if len(counts) > 1:
+            raise ValueError(f'{self.path} holds different numbers of {" and ".join(streets)} buckets.')
+        return counts.pop()
+
+    def _street_tables(self, board: list[int]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if len(board) not in self._tables:
+            raise ValueError(f'{self.path} holds no buckets for boards of {len(board)} cards.')
+        return self._tables[len(board)]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Group the hands of each street into buckets using every core.')
+    parser.add_argument('path', help='directory of the bucket files, created if it does not exist')
+    parser.add_argument('--streets', nargs='+', default=list(STREETS), choices=list(STREETS),
+                        help='streets to bucket')
+    parser.add_argument('--buckets', type=int, default=50, help='buckets per street, at most 256')
+    parser.add_argument('--bins', type=int, default=10, help='bins of the equity histograms')
+    parser.add_argument('--points', type=int, default=200_000, help='hands k-means is run on per street')
+    parser.add_argument('--processes', type=int, help='worker processes, defaults to one per core')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the sample and k-means')
+    args = parser.parse_args()
+
+    build_buckets(args.path, args.streets, args.buckets, args.bins, args.points, args.processes, args.seed)
+    tables = BucketTables(args.path)
+    for street, num_buckets in tables.num_buckets.items():
+        print(f'Bucketed the {street} into {num_buckets} buckets in {args.path}.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+#######################################################################################################################
+Suit isomorphism. Hands that only differ by a relabeling of the suits, like [A ♥][K ♥] and [A ♠][K ♠], have
+exactly the same value, so caches and lookup tables only need to store one of them. A hand is mapped to its canonical
+key by trying all 24 relabelings of the suits and keeping the smallest, which every hand in the same class agrees on.
+
+Keys hold cards as numbers from Card.to_int(), with the hole cards and the community each sorted, since neither
+depends on the order the cards were dealt in. There are 169 canonical preflop hands, and 1,755 canonical flops.
+#######################################################################################################################
+"""
+
+from __future__ import annotations
+
+from itertools import combinations, permutations
+from collections.abc import Iterator
+
+from src.poker.card import Card
+
+CanonicalKey = tuple[tuple[int, ...], tuple[int, ...]]
+
+# The card numbers under each relabeling of the suits, indexed by the original card number
+RELABELINGS = tuple(tuple(card - card % 4 + suits[card % 4] for card in range(52))
+                     for suits in permutations(range(4)))
+
+
+def canonical_key(hole: list[Card], community: list[Card] | None = None) -> CanonicalKey:
+    """Returns the key shared by every suit relabeling of the hole cards plus the community.
+
+    Example:
+        canonical_key([A ♥, K ♥]) == canonical_key([A ♠, K ♠])
+    """
+    return canonical_int_key([card.to_int() for card in hole], [card.to_int() for card in community or []])
+
+
+def canonical_int_key(hole: list[int], community: list[int]) -> CanonicalKey:
+    """Returns the canonical key of hole cards and a community given as card numbers."""
+    return min((tuple(sorted(relabel[card] for card in hole)), tuple(sorted(relabel[card] for card in community)))
+               for relabel in RELABELINGS)
+
+
+def canonical_relabeling(community: list[int]) -> tuple[int, ...]:
+    """Returns a relabeling of the suits that turns a community of card numbers into its canonical community.
+
+    The relabeling holds the new number of each card number. Hole cards relabeled with it
+    have the same value on the canonical community as the hole cards on the original one.
+    """
+    return min(RELABELINGS, key=lambda relabel: sorted(relabel[card] for card in community))
+
+
+def cards_from_key(key: CanonicalKey) -> tuple[list[Card], list[Card]]:
+    """Returns a hole and community that have the canonical key, e.g. to evaluate the whole class once."""
+    hole, community = key
+    return [Card.from_int(card) for card in hole], [Card.from_int(card) for card in community]
+
+
+def preflop_class(hole: list[Card]) -> str:
+    """Returns the usual name of a preflop hand's class.
+
+    Example:
+        AKs for [A ♥][K ♥], AKo for [A ♥][K ♠], and QQ for [Q ♥][Q ♠]
+    """
+    high, low = sorted(hole, key=lambda card: card.rank_value, reverse=True)
+    name = f'{_rank_letter(high)}{_rank_letter(low)}'
+    if high.rank_value == low.rank_value:
+        return name
+    return name + ('s' if high.suit_value == low.suit_value else 'o')
+
+
+def iter_canonical_keys(num_hole: int, num_community: int) -> Iterator[CanonicalKey]:
+    """Yields the canonical key of every class of hole cards plus community, once each.
+
+    Example:
+        iter_canonical_keys(2, 0) yields the 169 preflop classes,
+        and iter_canonical_keys(0, 3) yields the 1,755 flops
+    """
+    seen = set()
+    for hole in combinations(range(52), num_hole):
+        rest = [card for card in range(52) if card not in hole]
+        for community in combinations(rest, num_community):
+            key = canonical_int_key(list(hole), list(community))
+            if key not in seen:
+                seen.add(key)
+                yield key
+
+
+def _rank_letter(card: Card) -> str:
+    return 'T' if card.rank_value == 10 else card.rank_symbol
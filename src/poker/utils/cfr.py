@@ -0,0 +1,657 @@
+"""
+#######################################################################################################################
+Counterfactual regret minimization for heads-up fixed-limit subgames: the betting of the river, or of the turn and the
+river, on one board, between two players who could be holding any hands. The betting follows the same rules as the
+game, with bets of twice the big blind, at most 4 bets and raises a round, and the last bet carried into the next round.
+
+Hands are grouped into buckets, and a player chooses its moves by bucket, so an information set is a betting node and a
+bucket. Regrets and strategy sums are kept in flat arrays, with a block of rows for each betting node, one row per
+bucket, and a column per move. The solver runs CFR+ on every hand at once: reaches and values are arrays over all 1,326
+pairs of hole cards, and the river cards of a turn subgame are another dimension of those arrays.
+
+Solved boards are saved to an SQLite file, keyed by canonical board, using every core:
+
+    python -m src.poker.utils.cfr river.db --street river --boards 500
+
+and the SOLVED computer playing style looks up its moves from them.
+#######################################################################################################################
+"""
+
+from __future__ import annotations
+
+import random
+import sqlite3
+from itertools import combinations
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from src.poker.enums.betting_move import BettingMove
+from src.poker.utils.canonical import canonical_int_key, canonical_relabeling
+from src.poker.utils.lookup_tables import CARD_RANK_BITS, CARD_RANK_KEYS, get_tables, worker_pool
+
+# Every pair of hole cards, as card numbers from Card.to_int(), and the index of each pair
+HANDS = np.array(list(combinations(range(52), 2)))
+NUM_HANDS = len(HANDS)
+HAND_INDEX = np.full((52, 52), -1)
+HAND_INDEX[HANDS[:, 0], HANDS[:, 1]] = np.arange(NUM_HANDS)
+HAND_INDEX[HANDS[:, 1], HANDS[:, 0]] = np.arange(NUM_HANDS)
+# The indexes of the 51 pairs that hold each card
+CARD_HANDS = np.array([np.flatnonzero((HANDS == card).any(axis=1)) for card in range(52)])
+
+# The rank key and rank bit of each card number, as arrays
+RANK_KEYS_BY_CARD = np.array(CARD_RANK_KEYS)
+RANK_BITS_BY_CARD = np.array(CARD_RANK_BITS)
+
+STREET_BOARD_SIZES = {'turn': 4, 'river': 5}
+MAX_MOVES = 3
+DEFAULT_NUM_BUCKETS = 10
+
+# Kinds of nodes
+DECISION = 0
+FOLD = 1
+SHOWDOWN = 2
+CHANCE = 3
+
+
+class Node:
+    """A node of a subgame's betting tree.
+
+    Attributes:
+        kind: DECISION, FOLD, SHOWDOWN, or CHANCE, where the river is dealt
+        player: The player to act, or the player who folded
+        moves: The moves of the player to act
+        children: The node reached by each move, or the first node of the river
+        committed: The chips each player has put in the pot over the hand, in a fold or showdown
+        street: 0 for the subgame's first round of betting, 1 for the river of a turn subgame
+        offset: The first row of the node's information sets
+    """
+
+    __slots__ = ('kind', 'player', 'moves', 'children', 'committed', 'street', 'offset')
+
+    def __init__(self, kind: int, player: int = 0, committed: tuple[int, int] = (0, 0), street: int = 0):
+        self.kind = kind
+        self.player = player
+        self.moves: list[BettingMove] = []
+        self.children: list[int] = []
+        self.committed = committed
+        self.street = street
+        self.offset = 0
+
+
+class SubgameTree:
+    """The betting tree of a heads-up subgame, from the start of the turn or the river to the end of the hand.
+
+    Player 0 acts first in every round. Both players are assumed to have the chips to
+    cover every bet, so there are no all-in moves.
+
+    Args:
+        board_size: 4 for a turn subgame, 5 for a river subgame
+        pot: The chips in the pot at the start of the subgame, put in equally by both players
+        last_bet: The bet to match at the start of each round, carried over from the round before
+        big_blind: The big blind. Bets and raises on the turn and river are twice the big blind.
+        num_buckets: The number of buckets hands are grouped into in every round
+
+    Attributes:
+        nodes: Every node, the first node being the root
+        batch_sizes: The number of boards of each street, 1 for the first round and the
+            number of river cards for the river of a turn subgame
+        num_rows: The number of information sets
+    """
+
+    def __init__(self, board_size: int, pot: int, last_bet: int, big_blind: int, num_buckets: int):
+        if board_size not in STREET_BOARD_SIZES.values():
+            raise ValueError(f'Subgames start on the turn or the river, not with {board_size} board cards.')
+        self.board_size = board_size
+        self.pot = pot
+        self.last_bet = last_bet
+        self.big_blind = big_blind
+        self.num_buckets = num_buckets
+        self.batch_sizes = [1] if board_size == 5 else [1, 52 - board_size]
+        self.nodes: list[Node] = []
+        self.add_round(street=0, committed=(pot // 2, pot // 2))
+        self.num_rows = 0
+        for node in self.nodes:
+            if node.kind == DECISION:
+                node.offset = self.num_rows
+                self.num_rows += self.batch_sizes[node.street] * num_buckets
+
+    def add_round(self, street: int, committed: tuple[int, int]) -> int:
+        return self.add_decision(street, committed, bets=(0, 0), last_bet=self.last_bet, num_times_raised=0,
+                                 locked=(False, False), player=0)
+
+    def add_decision(self, street: int, committed: tuple[int, int], bets: tuple[int, int], last_bet: int,
+                     num_times_raised: int, locked: tuple[bool, bool], player: int) -> int:
+        """Adds the node of a player's decision and everything after it, mirroring Game.legal_actions and step."""
+        node_id = len(self.nodes)
+        node = Node(DECISION, player, street=street)
+        self.nodes.append(node)
+        raise_amount = last_bet + self.big_blind * 2
+        node.moves.append(BettingMove.CHECKED if bets[player] == last_bet else BettingMove.CALLED)
+        if num_times_raised < 4:
+            node.moves.append(BettingMove.BET if bets[player] == last_bet else BettingMove.RAISED)
+        node.moves.append(BettingMove.FOLDED)
+        other = 1 - player
+        for move in node.moves:
+            if move is BettingMove.FOLDED:
+                node.children.append(self.add_terminal(FOLD, player, committed, bets, street))
+                continue
+            new_bets = list(bets)
+            new_locked = list(locked)
+            new_last_bet = last_bet
+            new_num_times_raised = num_times_raised
+            if move is BettingMove.BET or move is BettingMove.RAISED:
+                new_last_bet = raise_amount
+                new_num_times_raised += 1
+                new_locked[other] = False
+            new_bets[player] = new_last_bet
+            new_locked[player] = True
+            if all(new_locked):
+                node.children.append(self.add_end_of_round(street, committed, new_bets))
+            else:
+                node.children.append(self.add_decision(street, committed, (new_bets[0], new_bets[1]), new_last_bet,
+                                                       new_num_times_raised, (new_locked[0], new_locked[1]), other))
+        return node_id
+
+    def add_end_of_round(self, street: int, committed: tuple[int, int], bets: list[int]) -> int:
+        committed = (committed[0] + bets[0], committed[1] + bets[1])
+        if len(self.batch_sizes) == street + 1:
+            return self.add_terminal(SHOWDOWN, 0, committed, [0, 0], street)
+        node_id = len(self.nodes)
+        node = Node(CHANCE, committed=committed, street=street)
+        self.nodes.append(node)
+        node.children.append(self.add_round(street + 1, committed))
+        return node_id
+
+    def add_terminal(self, kind: int, player: int, committed: tuple[int, int], bets: tuple[int, int] | list[int],
+                     street: int) -> int:
+        self.nodes.append(Node(kind, player, (committed[0] + bets[0], committed[1] + bets[1]), street))
+        return len(self.nodes) - 1
+
+    def find_node(self, moves: list[BettingMove]) -> int | None:
+        """Returns the node reached by a sequence of moves from the root, going on to the river at chance nodes."""
+        node_id = 0
+        for move in moves:
+            node = self.nodes[node_id]
+            if node.kind != DECISION or move not in node.moves:
+                return None
+            node_id = node.children[node.moves.index(move)]
+            if self.nodes[node_id].kind == CHANCE:
+                node_id = self.nodes[node_id].children[0]
+        return node_id
+
+
+class Showdown:
+    """Finds how many of the opponent's hands each hand beats and loses to, for a batch of 5 card boards.
+
+    Hands that share a card with a hand cannot be the opponent's, so the counts are found
+    with a running sum over the hands sorted by strength, less running sums over the
+    hands that hold each of the hand's two cards.
+
+    Args:
+        strengths: The strength of every hand on each board, one row per board
+    """
+
+    def __init__(self, strengths: np.ndarray):
+        num_boards = len(strengths)
+        boards = np.arange(num_boards)[:, None]
+        order = np.argsort(strengths, axis=1, kind='stable')
+        sorted_strengths = np.take_along_axis(strengths, order, axis=1)
+        weaker = np.array([np.searchsorted(sorted_strengths[b], strengths[b], 'left') for b in range(num_boards)])
+        not_stronger = np.array([np.searchsorted(sorted_strengths[b], strengths[b], 'right')
+                                 for b in range(num_boards)])
+        card_strengths = strengths[:, CARD_HANDS]
+        card_order = np.argsort(card_strengths, axis=2, kind='stable')
+        card_hands = CARD_HANDS[np.arange(52)[:, None], card_order]
+        sorted_card_strengths = np.take_along_axis(card_strengths, card_order, axis=2)
+        # Everything is looked up by flat index, into the reach and into the running sums below
+        self.order = (boards * NUM_HANDS + order).ravel()
+        self.card_hands = (boards[:, :, None] * NUM_HANDS + card_hands).ravel()
+        self.weaker = boards * (NUM_HANDS + 1) + weaker
+        self.not_stronger = boards * (NUM_HANDS + 1) + not_stronger
+        self.last = boards * (NUM_HANDS + 1) + NUM_HANDS
+        # For each hand and each of its cards, the hands holding that card that are weaker, and not stronger
+        self.card_weaker = []
+        self.card_not_stronger = []
+        self.card_last = []
+        for card in (HANDS[:, 0], HANDS[:, 1]):
+            card_sorted = sorted_card_strengths[:, card, :]
+            start = (boards * 52 + card) * 52
+            self.card_weaker.append(start + (card_sorted < strengths[:, :, None]).sum(axis=2))
+            self.card_not_stronger.append(start + (card_sorted <= strengths[:, :, None]).sum(axis=2))
+            self.card_last.append(start + 51)
+
+    def evaluate(self, reach: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the opponent's reach over the hands each hand beats, and over the hands it loses to."""
+        num_boards = len(reach)
+        sums = np.zeros((num_boards, NUM_HANDS + 1))
+        np.cumsum(reach.take(self.order).reshape(num_boards, NUM_HANDS), axis=1, out=sums[:, 1:])
+        card_sums = np.zeros((num_boards, 52, 52))
+        np.cumsum(reach.take(self.card_hands).reshape(num_boards, 52, 51), axis=2, out=card_sums[:, :, 1:])
+        beaten = sums.take(self.weaker)
+        beating = sums.take(self.last) - sums.take(self.not_stronger)
+        for i in range(2):
+            beaten -= card_sums.take(self.card_weaker[i])
+            beating -= card_sums.take(self.card_last[i]) - card_sums.take(self.card_not_stronger[i])
+        return beaten, beating
+
+
+def unblocked_reach(reach: np.ndarray) -> np.ndarray:
+    """Returns the opponent's reach over the hands that share no card with each hand."""
+    card_sums = reach[:, CARD_HANDS].sum(axis=2)
+    return reach.sum(axis=1, keepdims=True) - card_sums[:, HANDS[:, 0]] - card_sums[:, HANDS[:, 1]] + reach
+
+
+def valid_hands(board: list[int]) -> np.ndarray:
+    """Returns whether each hand shares no card with the board."""
+    return ~np.isin(HANDS, board).any(axis=1)
+
+
+def hand_strengths(board: list[int]) -> np.ndarray:
+    """Returns the strength of every hand on a 5 card board, or 0 for hands that share a card with it."""
+    tables = get_tables()
+    valid = valid_hands(board)
+    # The same table reads as LookupTables.hand_strength, for every hand at once
+    keys = sum(CARD_RANK_KEYS[card] for card in board) + RANK_KEYS_BY_CARD[HANDS].sum(axis=1)
+    strengths = np.frombuffer(tables.rank_table, dtype=np.uint16)[np.where(valid, keys, 0)].astype(np.int64)
+    flush_table = np.frombuffer(tables.flush_table, dtype=np.uint16)
+    for suit in range(4):
+        board_mask = sum(CARD_RANK_BITS[card] for card in board if card & 3 == suit)
+        masks = board_mask | (RANK_BITS_BY_CARD[HANDS] * (HANDS & 3 == suit)).sum(axis=1)
+        strengths = np.maximum(strengths, flush_table[masks])
+    return np.where(valid, strengths, 0)
+
+
+def river_equities(boards: list[list[int]]) -> np.ndarray:
+    """Returns each hand's share of the pot against a random hand on each 5 card board."""
+    valid = np.array([valid_hands(board) for board in boards], dtype=float)
+    beaten, beating = Showdown(np.array([hand_strengths(board) for board in boards])).evaluate(valid)
+    total = unblocked_reach(valid)
+    return np.divide(beaten + (total - beaten - beating) / 2, total, out=np.zeros_like(total), where=valid > 0)
+
+
+def river_cards(board: list[int]) -> list[int]:
+    """Returns the cards that can come on the river of a 4 card board, in the order of the river boards of a batch."""
+    return [card for card in range(52) if card not in board]
+
+
+def equity_buckets(board: list[int], num_buckets: int) -> np.ndarray:
+    """Groups the hands into buckets of equal size by their equity against a random hand, the lowest in bucket 0.
+
+    On the turn, the equity is averaged over the river cards.
+    """
+    if len(board) == 5:
+        equities = river_equities([board])[0]
+    else:
+        equities = river_equities([board + [card] for card in river_cards(board)]).sum(axis=0) / (52 - 6)
+    valid = valid_hands(board)
+    sorted_equities = np.sort(equities[valid])
+    buckets = np.searchsorted(sorted_equities, equities, 'left') * num_buckets // valid.sum()
+    return np.where(valid, buckets, 0)
+
+
+class SubgameSolver:
+    """Solves a heads-up subgame on one board with CFR+.
+
+    Args:
+        board: The board at the start of the subgame, as card numbers: 4 cards for a turn subgame, 5 for the river
+        pot: The chips in the pot at the start of the subgame
+        last_bet: The bet to match at the start of each round
+        big_blind: The big blind
+        num_buckets: The number of buckets hands are grouped into
+        bucket_hands: Groups the hands on a board into buckets, as a bucket per hand
+
+    Attributes:
+        tree: The betting tree
+        buckets: The bucket of every hand on each board of each street, one array per street
+        regrets: The regret of each move in each information set, floored at 0
+        strategy_sums: The strategies played in each information set, weighted by the
+            player's reach and the iteration
+        iterations: The number of iterations run so far
+    """
+
+    def __init__(self, board: list[int], pot: int, last_bet: int, big_blind: int,
+                 num_buckets: int = DEFAULT_NUM_BUCKETS,
+                 bucket_hands: Callable[[list[int], int], np.ndarray] = equity_buckets):
+        self.board = list(board)
+        self.tree = SubgameTree(len(board), pot, last_bet, big_blind, num_buckets)
+        boards = [[self.board]]
+        if len(board) == 4:
+            boards.append([self.board + [card] for card in river_cards(self.board)])
+        self.buckets = [np.array([bucket_hands(street_board, num_buckets) for street_board in street_boards])
+                        for street_boards in boards]
+        self.valid = [np.array([valid_hands(street_board) for street_board in street_boards], dtype=float)
+                      for street_boards in boards]
+        self.rows = [np.arange(len(buckets))[:, None] * num_buckets + buckets for buckets in self.buckets]
+        self.showdown = Showdown(np.array([hand_strengths(river_board) for river_board in boards[-1]]))
+        # Each deal of two hands leaves 44 cards that can come on the river
+        self.num_river_deals = 52 - len(board) - 4
+        self.regrets = np.zeros((self.tree.num_rows, MAX_MOVES))
+        self.strategy_sums = np.zeros((self.tree.num_rows, MAX_MOVES))
+        self.iterations = 0
+
+    def solve(self, iterations: int) -> None:
+        """Runs iterations of CFR+, updating each player in turn."""
+        for _ in range(iterations):
+            self.iterations += 1
+            for player in (0, 1):
+                self.update(0, player, self.valid[0], self.valid[0])
+
+    def update(self, node_id: int, player: int, reach: np.ndarray, opponent_reach: np.ndarray) -> np.ndarray:
+        """Updates the player's regrets and strategy sums below a node.
+
+        Returns:
+            The player's counterfactual value of each hand at the node
+        """
+        node = self.tree.nodes[node_id]
+        if node.kind == CHANCE:
+            valid = self.valid[1]
+            return self.deal_river(self.update(node.children[0], player, reach * valid, opponent_reach * valid))
+        if node.kind != DECISION:
+            return self.terminal_value(node, player, opponent_reach)
+        rows = self.rows[node.street]
+        # One array per move, of the chance each hand makes it
+        strategy = self.current_strategy(node).T[:, rows]
+        if node.player != player:
+            return sum(self.update(child, player, reach, opponent_reach * strategy[i])
+                       for i, child in enumerate(node.children))
+        values = [self.update(child, player, reach * strategy[i], opponent_reach)
+                  for i, child in enumerate(node.children)]
+        value = sum(strategy[i] * values[i] for i in range(len(values)))
+        block = self.block(node)
+        num_rows = block.stop - block.start
+        valid = self.valid[node.street]
+        for i in range(len(values)):
+            regrets = np.bincount(rows.ravel(), ((values[i] - value) * valid).ravel(), minlength=num_rows)
+            self.regrets[block, i] = np.maximum(self.regrets[block, i] + regrets, 0)
+            self.strategy_sums[block, i] += self.iterations * np.bincount(
+                rows.ravel(), (reach * strategy[i]).ravel(), minlength=num_rows)
+        return value
+
+    def deal_river(self, values: np.ndarray) -> np.ndarray:
+        """Returns the average of the values of each hand over the river cards it can see.
+
+        The river can't be one of the hand's own cards, so those boards are left out of the sum.
+        """
+        return (values * self.valid[1]).sum(axis=0, keepdims=True) / self.num_river_deals
+
+    def terminal_value(self, node: Node, player: int, opponent_reach: np.ndarray) -> np.ndarray:
+        """Returns the player's counterfactual value of each hand at a fold or a showdown."""
+        if node.kind == FOLD:
+            won = node.committed[node.player] * (-1 if node.player == player else 1)
+            return won * unblocked_reach(opponent_reach)
+        beaten, beating = self.showdown.evaluate(opponent_reach)
+        return node.committed[player] * (beaten - beating)
+
+    def block(self, node: Node) -> slice:
+        """Returns the rows of a decision node's information sets."""
+        return slice(node.offset, node.offset + self.tree.batch_sizes[node.street] * self.tree.num_buckets)
+
+    def current_strategy(self, node: Node) -> np.ndarray:
+        """Returns the strategy of each of a node's information sets, by regret matching."""
+        return _normalize(self.regrets[self.block(node), :len(node.moves)])
+
+    def average_strategy(self) -> np.ndarray:
+        """Returns the average strategy of every information set, which is what CFR+ converges to."""
+        strategy = np.zeros((self.tree.num_rows, MAX_MOVES))
+        for node in self.tree.nodes:
+            if node.kind == DECISION:
+                block = self.block(node)
+                strategy[block, :len(node.moves)] = _normalize(self.strategy_sums[block, :len(node.moves)])
+        return strategy
+
+    def exploitability(self) -> float:
+        """Returns the chips a deal that a best response to the average strategy wins, averaged over both seats.
+
+        The best response plays each hand as well as it can, rather than each bucket, so
+        this falls as the average strategy converges, down to what the buckets give away.
+        The value of the game for one seat is the loss of the other, so it is never below 0.
+        """
+        strategy = self.average_strategy()
+        valid = self.valid[0]
+        num_cards_left = 52 - len(self.board) - 2
+        num_deals = valid.sum() * num_cards_left * (num_cards_left - 1) / 2
+        values = sum(self.best_response(0, player, valid, strategy) for player in (0, 1))
+        return (values * valid).sum() / num_deals / 2
+
+    def best_response(self, node_id: int, player: int, opponent_reach: np.ndarray,
+                      strategy: np.ndarray) -> np.ndarray:
+        """Returns the player's counterfactual value of each hand when it plays each hand's best move against the
+        strategy."""
+        node = self.tree.nodes[node_id]
+        if node.kind == CHANCE:
+            return self.deal_river(self.best_response(node.children[0], player, opponent_reach * self.valid[1],
+                                                      strategy))
+        if node.kind != DECISION:
+            return self.terminal_value(node, player, opponent_reach)
+        if node.player != player:
+            node_strategy = strategy[node.offset:].T[:, self.rows[node.street]]
+            return sum(self.best_response(child, player, opponent_reach * node_strategy[i], strategy)
+                       for i, child in enumerate(node.children))
+        return np.maximum.reduce([self.best_response(child, player, opponent_reach, strategy)
+                                  for child in node.children])
+
+
+def _normalize(weights: np.ndarray) -> np.ndarray:
+    """Returns the rows of positive weights divided by their sums, or even weights for rows without any."""
+    positive = np.maximum(weights, 0)
+    totals = positive.sum(axis=1, keepdims=True)
+    return np.divide(positive, totals, out=np.full_like(positive, 1 / weights.shape[1]), where=totals > 0)
+
+
+class StrategyTable:
+    """Solved strategies of one kind of subgame, one per canonical board, in an SQLite file.
+
+    Each board holds the bucket of every hand and the average strategy of every
+    information set, so looking up a move is a handful of array reads once the
+    board has been loaded.
+
+    Args:
+        path: The file, created if it does not exist, unless read_only is set
+        read_only: If True, open the file read-only and memory-mapped, so that it can be
+            shared by many processes
+        mmap_size: The most bytes of the file to memory-map when read-only
+        max_boards: The most boards to keep loaded before starting over
+    """
+
+    SETTINGS = ('board_size', 'pot', 'last_bet', 'big_blind', 'num_buckets')
+
+    def __init__(self, path: str | Path, read_only: bool = False, mmap_size: int = 1 << 30, max_boards: int = 1000):
+        self.path = Path(path)
+        self.max_boards = max_boards
+        if read_only:
+            self.connection = sqlite3.connect(f'{self.path.resolve().as_uri()}?mode=ro', uri=True)
+            self.connection.execute(f'PRAGMA mmap_size = {int(mmap_size)}')
+        else:
+            self.connection = sqlite3.connect(self.path)
+            self.connection.execute('CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value INTEGER)')
+            self.connection.execute('CREATE TABLE IF NOT EXISTS strategies (board BLOB PRIMARY KEY, buckets BLOB, '
+                                    'strategy BLOB) WITHOUT ROWID')
+            self.connection.commit()
+        self.settings = dict(self.connection.execute('SELECT name, value FROM settings').fetchall())
+        self._tree: SubgameTree | None = None
+        self._boards: dict[bytes, tuple[np.ndarray, np.ndarray] | None] = {}
+
+    def set_settings(self, board_size: int, pot: int, last_bet: int, big_blind: int, num_buckets: int) -> None:
+        """Records the subgame every board is solved for.
+
+        Raises:
+            ValueError: If the file holds boards solved for a different subgame
+        """
+        settings = dict(zip(self.SETTINGS, (board_size, pot, last_bet, big_blind, num_buckets)))
+        if self.settings and self.settings != settings:
+            raise ValueError(f'{self.path} holds strategies solved for {self.settings}, not {settings}.')
+        self.connection.executemany('INSERT OR REPLACE INTO settings VALUES (?, ?)', settings.items())
+        self.connection.commit()
+        self.settings = settings
+
+    @property
+    def board_size(self) -> int:
+        return self.settings['board_size']
+
+    @property
+    def tree(self) -> SubgameTree:
+        if self._tree is None:
+            self._tree = SubgameTree(*(self.settings[name] for name in self.SETTINGS))
+        return self._tree
+
+    def put(self, board: tuple[int, ...], buckets: np.ndarray, strategy: np.ndarray) -> None:
+        """Saves the buckets and average strategy of a canonical board."""
+        self.connection.execute('INSERT OR REPLACE INTO strategies VALUES (?, ?, ?)',
+                                (bytes(board), buckets.astype(np.uint8).tobytes(),
+                                 strategy.astype(np.float16).tobytes()))
+        self.connection.commit()
+
+    def get(self, board: tuple[int, ...]) -> tuple[np.ndarray, np.ndarray] | None:
+        """Returns the buckets, one row per board of each street, and the average strategy of a canonical board, or
+        None if it has not been solved."""
+        key = bytes(board)
+        if key not in self._boards:
+            if len(self._boards) >= self.max_boards:
+                self._boards.clear()
+            row = self.connection.execute('SELECT buckets, strategy FROM strategies WHERE board = ?',
+                                          (key,)).fetchone()
+            self._boards[key] = row and (np.frombuffer(row[0], dtype=np.uint8).reshape(-1, NUM_HANDS),
+                                         np.frombuffer(row[1], dtype=np.float16).reshape(-1, MAX_MOVES))
+        return self._boards[key]
+
+    def solved_boards(self) -> set[tuple[int, ...]]:
+        return {tuple(board) for board, in self.connection.execute('SELECT board FROM strategies')}
+
+    def move_probabilities(self, board: list[int], hole: list[int],
+                           moves: list[BettingMove]) -> dict[BettingMove, float] | None:
+        """Returns the chance of each move in the solved strategy, or None if the board is not solved or the moves
+        leave the tree.
+
+        Args:
+            board: The community, as card numbers
+            hole: The hole cards of the player to act, as card numbers
+            moves: The moves made since the start of the subgame's first street
+        """
+        relabel = canonical_relabeling(board[:self.board_size])
+        first_board = sorted(relabel[card] for card in board[:self.board_size])
+        solved = self.get(tuple(first_board))
+        node_id = self.tree.find_node(moves)
+        if solved is None or node_id is None or self.tree.nodes[node_id].kind != DECISION:
+            return None
+        node = self.tree.nodes[node_id]
+        if len(board) != self.board_size + node.street:
+            return None
+        board_index = 0 if node.street == 0 else river_cards(first_board).index(relabel[board[-1]])
+        buckets, strategy = solved
+        bucket = buckets[node.street + board_index, HAND_INDEX[relabel[hole[0]], relabel[hole[1]]]]
+        probabilities = strategy[node.offset + board_index * self.tree.num_buckets + bucket]
+        return {move: float(probability) for move, probability in zip(node.moves, probabilities)}
+
+    def __len__(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM strategies').fetchone()[0]
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+# The strategy tables shared by computer players. Add a table with shared_tables.append(StrategyTable(...))
+shared_tables: list[StrategyTable] = []
+
+
+def solve_boards(path: str | Path, street: str, num_boards: int, iterations: int = 1000, pot: int = 80,
+                 last_bet: int = 20, big_blind: int = 20, num_buckets: int | None = None, processes: int | None = None,
+                 seed: int = 0, bucket_tables: str | Path | None = None) -> int:
+    """Solves the subgame of canonical boards chosen at random, and saves their strategies.
+
+    The work is split by board across a pool of processes. Boards that are already
+    saved are skipped, so a run that is stopped can be run again to pick up where it
+    left off.
+
+    Args:
+        path: The strategy table file
+        street: 'turn' or 'river'
+        num_boards: The number of different canonical boards to solve
+        iterations: The iterations of CFR+ per board
+        pot: The chips in the pot at the start of the subgame
+        last_bet: The bet to match at the start of each round
+        big_blind: The big blind
+        num_buckets: The number of buckets hands are grouped into. Defaults to the number
+            in bucket_tables, or to 10 without them.
+        processes: The number of worker processes, defaults to one per core
+        seed: Seeds the choice of boards, so that a run can be repeated
+        bucket_tables: The directory of buckets saved by buckets.build_buckets() to group hands
+            by, or None to group them by equity_buckets()
+
+    Returns:
+        The number of boards solved
+
+    Raises:
+        ValueError: If bucket_tables holds a different number of buckets than num_buckets
+    """
+    board_size = STREET_BOARD_SIZES[street]
+    if bucket_tables is not None:
+        # Imported here since the buckets module imports this one
+        from src.poker.utils.buckets import BucketTables
+
+        # Checked before the workers start, so that a mismatch is reported here instead of in every worker
+        table_buckets = BucketTables(bucket_tables).subgame_num_buckets(board_size)
+        if num_buckets is not None and num_buckets != table_buckets:
+            raise ValueError(f'{bucket_tables} holds {table_buckets} buckets per street, not {num_buckets}.')
+        num_buckets = table_buckets
+    elif num_buckets is None:
+        num_buckets = DEFAULT_NUM_BUCKETS
+    table = StrategyTable(path)
+    table.set_settings(board_size, pot, last_bet, big_blind, num_buckets)
+    rng = random.Random(seed)
+    boards: dict[tuple[int, ...], None] = {}
+    while len(boards) < num_boards:
+        boards[canonical_int_key([], rng.sample(range(52), board_size))[1]] = None
+    solved = table.solved_boards()
+    tasks = [(board, pot, last_bet, big_blind, num_buckets, iterations, bucket_tables)
+             for board in boards if board not in solved]
+    num_solved = 0
+    with worker_pool(processes) as pool:
+        for board, buckets, strategy in pool.imap_unordered(_solve_board, tasks):
+            table.put(board, buckets, strategy)
+            num_solved += 1
+    table.close()
+    return num_solved
+
+
+def _solve_board(task: tuple[tuple[int, ...], int, int, int, int, int, str | Path | None]
+                 ) -> tuple[tuple[int, ...], np.ndarray, np.ndarray]:
+    board, pot, last_bet, big_blind, num_buckets, iterations, bucket_tables = task
+    bucket_hands = equity_buckets
+    if bucket_tables is not None:
+        # Imported here since the buckets module imports this one
+        from src.poker.utils.buckets import BucketTables
+
+        bucket_hands = BucketTables(bucket_tables).bucket_hands
+    solver = SubgameSolver(list(board), pot, last_bet, big_blind, num_buckets, bucket_hands)
+    solver.solve(iterations)
+    return board, np.concatenate(solver.buckets), solver.average_strategy()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Solve heads-up subgames with CFR+ using every core.')
+    parser.add_argument('table', help='SQLite file to save the strategies to, created if it does not exist')
+    parser.add_argument('--street', default='river', choices=list(STREET_BOARD_SIZES), help='street to start on')
+    parser.add_argument('--boards', type=int, default=100, help='number of canonical boards to solve')
+    parser.add_argument('--iterations', type=int, default=1000, help='iterations of CFR+ per board')
+    parser.add_argument('--pot', type=int, default=80, help='chips in the pot at the start of the street')
+    parser.add_argument('--last-bet', type=int, default=20, help='bet to match at the start of each round')
+    parser.add_argument('--big-blind', type=int, default=20, help='big blind')
+    parser.add_argument('--buckets', type=int,
+                        help='number of buckets hands are grouped into, defaults to the number in --bucket-tables, '
+                             'or 10')
+    parser.add_argument('--processes', type=int, help='worker processes, defaults to one per core')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the choice of boards')
+    parser.add_argument('--bucket-tables', help='directory of buckets from src.poker.utils.buckets to group hands by')
+    args = parser.parse_args()
+
+    num_solved = solve_boards(args.table, args.street, args.boards, args.iterations, args.pot, args.last_bet,
+                              args.big_blind, args.buckets, args.processes, args.seed, args.bucket_tables)
+    print(f'Solved {num_solved:,} boards into {args.table}.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,376 @@
+"""
+#######################################################################################################################
+Hand equity: a hand's share of the pot, on average, against random hands of the opponents still in it, once the rest of
+the community is dealt. It is estimated by dealing out the rest of the hand many times, which is slow, but the equity of
+a hand never changes, so results are kept in a persistent cache.
+
+The cache is an SQLite file keyed by the canonical hole cards, canonical community, and number of opponents, so each
+result is shared by every suit relabeling of the hand. It is filled offline with all cores:
+
+    python -m src.poker.utils.equity equity.db --streets preflop flop --opponents 1 2 3
+
+and opened read-only by games and simulation workers. Read-only connections map the file into memory, so any number of
+worker processes share one copy of it in the page cache.
+#######################################################################################################################
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from collections.abc import Callable
+from itertools import combinations
+
+from src.poker.card import Card
+from src.poker.utils.canonical import CanonicalKey, canonical_key, cards_from_key, iter_canonical_keys
+from src.poker.utils.lookup_tables import CARD_RANK_BITS, CARD_RANK_KEYS, LookupTables, get_tables, worker_pool
+from src.poker.utils.omaha import OmahaBoard
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from pathlib import Path
+
+STREETS = {'preflop': 0, 'flop': 3, 'turn': 4, 'river': 5}
+
+# The most boards all_in_equities enumerates, enough for every runout of 3 cards or fewer. With more cards to come there
+# are far too many to score in a pause between cards, and it scores boards dealt at random instead, few enough that
+# Omaha hands are scored within the fast game's pause too.
+MAX_ENUMERATED_BOARDS = 16000
+NUM_SAMPLED_BOARDS = 8000
+
+
+def calculate_equity(hole: list[Card], community: list[Card], num_opponents: int, num_samples: int = 1000,
+                     rng: random.Random | None = None, tables: LookupTables | None = None,
+                     lowest_card: int = 0) -> float:
+    """Estimates a hand's equity by dealing out the rest of the community and the opponents' hole cards at random.
+
+    Opponents are dealt as many hole cards as the player, so 4 hole cards are played as Omaha.
+
+    Args:
+        hole: The player's hole cards
+        community: The community cards dealt so far
+        num_opponents: The number of opponents still in the hand
+        num_samples: The number of random deals to average over
+        rng: The random number generator to deal with
+        tables: The lookup tables to score hands with, if not the standard ones
+        lowest_card: The card number of the lowest card in the deck, above 0 for a short deck
+
+    Returns:
+        The player's average share of the pot, from 0 to 1. Split pots count as a share.
+    """
+    if num_opponents < 1:
+        raise ValueError(f'Equity is against at least 1 opponent, not {num_opponents}.')
+    rng = rng or random
+    known = {card.to_int() for card in hole + community}
+    unseen = [card for card in range(lowest_card, 52) if card not in known]
+    num_to_come = 5 - len(community)
+    num_to_deal = num_to_come + len(hole) * num_opponents
+    hole_cards = [card.to_int() for card in hole]
+    community_cards = [card.to_int() for card in community]
+    if len(hole) != 2:
+        return _calculate_omaha_equity(hole_cards, community_cards, unseen, num_to_come, num_to_deal, num_samples, rng)
+    tables = tables or get_tables()
+    share = 0.0
+    for _ in range(num_samples):
+        dealt = rng.sample(unseen, num_to_deal)
+        board_key, board_suit_masks, flush_suits = _break_down_board(community_cards + dealt[:num_to_come])
+        strengths = [_strength_with_board(tables, hole_cards, board_key, board_suit_masks, flush_suits)]
+        strengths += [_strength_with_board(tables, dealt[i:i + 2], board_key, board_suit_masks, flush_suits)
+                      for i in range(num_to_come, num_to_deal, 2)]
+        best = max(strengths)
+        if strengths[0] == best:
+            share += 1 / strengths.count(best)
+    return share / num_samples
+
+
+def _calculate_omaha_equity(hole: list[int], community: list[int], unseen: list[int], num_to_come: int,
+                            num_to_deal: int, num_samples: int, rng: random.Random) -> float:
+    """Estimates the equity of Omaha hole cards, breaking down each deal's board once for every player."""
+    num_hole = len(hole)
+    share = 0.0
+    for _ in range(num_samples):
+        dealt = rng.sample(unseen, num_to_deal)
+        board = OmahaBoard(community + dealt[:num_to_come])
+        strengths = [board.score(hole)]
+        strengths += [board.score(dealt[i:i + num_hole]) for i in range(num_to_come, num_to_deal, num_hole)]
+        best = max(strengths)
+        if strengths[0] == best:
+            share += 1 / strengths.count(best)
+    return share / num_samples
+
+
+def score_runouts(holes: list[list[int]], community: list[int], runouts: list[list[int]],
+                  tables: LookupTables | None = None) -> list[list[int]]:
+    """Scores every player's hand on each of many ways of dealing out the rest of the board.
+
+    The community dealt so far is broken down once, and each runout only adds its own
+    cards to it, once for all of the players.
+
+    Args:
+        holes: Each player's hole cards, as card numbers from Card.to_int(). 4 hole cards are played as Omaha.
+        community: The community cards dealt so far
+        runouts: The cards that complete the community, for each way of dealing it out
+        tables: The lookup tables to score hands with, if not the standard ones
+
+    Returns:
+        The strength of each player's hand, by runout. Strengths only compare within one call.
+    """
+    if holes and len(holes[0]) != 2:
+        return [[board.score(hole) for hole in holes]
+                for board in (OmahaBoard(community + runout) for runout in runouts)]
+    tables = tables or get_tables()
+    community_key, community_suit_masks, _ = _break_down_board(community)
+    strengths = []
+    for runout in runouts:
+        board_key = community_key
+        board_suit_masks = community_suit_masks.copy()
+        for card in runout:
+            board_key += CARD_RANK_KEYS[card]
+            board_suit_masks[card & 3] |= CARD_RANK_BITS[card]
+        flush_suits = [suit for suit in range(4) if bin(board_suit_masks[suit]).count('1') >= 3]
+        strengths.append([_strength_with_board(tables, hole, board_key, board_suit_masks, flush_suits)
+                          for hole in holes])
+    return strengths
+
+
+def all_in_equities(holes: list[list[int]], community: list[int], unseen: list[int],
+                    tables: LookupTables | None = None, rng: random.Random | None = None) -> list[tuple[float, float]]:
+    """Works out each player's chance of winning and of tying once the rest of the board is dealt.
+
+    Every way of completing the board from the unseen cards is scored with score_runouts, so the
+    chances are exact once 3 or fewer cards are to come. Before then, they are estimated from
+    NUM_SAMPLED_BOARDS boards dealt at random.
+
+    Args:
+        holes: Each player's hole cards, as card numbers from Card.to_int()
+        community: The community cards dealt so far
+        unseen: The cards the rest of the board can be dealt from
+        tables: The lookup tables to score hands with, if not the standard ones
+        rng: The random number generator to deal boards with, when there are too many to enumerate
+
+    Returns:
+        Each player's chance of winning the whole pot and of splitting it, from 0 to 1
+    """
+    num_to_come = 5 - len(community)
+    if math.comb(len(unseen), num_to_come) <= MAX_ENUMERATED_BOARDS:
+        runouts = [list(runout) for runout in combinations(unseen, num_to_come)]
+    else:
+        rng = rng or random
+        runouts = [rng.sample(unseen, num_to_come) for _ in range(NUM_SAMPLED_BOARDS)]
+    wins = [0] * len(holes)
+    ties = [0] * len(holes)
+    for strengths in score_runouts(holes, community, runouts, tables):
+        best = max(strengths)
+        if strengths.count(best) == 1:
+            wins[strengths.index(best)] += 1
+        else:
+            for i, strength in enumerate(strengths):
+                if strength == best:
+                    ties[i] += 1
+    return [(win / len(runouts), tie / len(runouts)) for win, tie in zip(wins, ties)]
+
+
+def _break_down_board(board: list[int]) -> tuple[int, list[int], list[int]]:
+    """Returns a board's rank key sum, the rank mask of each suit, and the suits that could make a flush with it."""
+    board_key = sum(CARD_RANK_KEYS[card] for card in board)
+    board_suit_masks = [0, 0, 0, 0]
+    for card in board:
+        board_suit_masks[card & 3] |= CARD_RANK_BITS[card]
+    # Only a suit with 3 or more cards on the board can make a flush
+    flush_suits = [suit for suit in range(4) if bin(board_suit_masks[suit]).count('1') >= 3]
+    return board_key, board_suit_masks, flush_suits
+
+
+def _strength_with_board(tables: LookupTables, hole: list[int], board_key: int, board_suit_masks: list[int],
+                         flush_suits: list[int]) -> int:
+    """Returns the strength of two hole cards plus a board that has already been broken down into its keys."""
+    for suit in flush_suits:
+        mask = board_suit_masks[suit]
+        for card in hole:
+            if card & 3 == suit:
+                mask |= CARD_RANK_BITS[card]
+        strength = tables.flush_table[mask]
+        if strength:
+            return strength
+    return tables.rank_table[board_key + CARD_RANK_KEYS[hole[0]] + CARD_RANK_KEYS[hole[1]]]
+
+
+class EquityCache:
+    """A persistent cache of hand equities in an SQLite file.
+
+    Args:
+        path: The cache file, created if it does not exist, unless read_only is set
+        read_only: If True, open the file read-only and memory-mapped, so that it can be
+            shared by many processes
+        mmap_size: The most bytes of the file to memory-map when read-only
+    """
+
+    def __init__(self, path: str | Path, read_only: bool = False, mmap_size: int = 1 << 30):
+        # Imported here so that importing the engine does not pay for it
+        import sqlite3
+        from pathlib import Path
+
+        self.path = Path(path)
+        self.read_only = read_only
+        if read_only:
+            self.connection = sqlite3.connect(f'{self.path.resolve().as_uri()}?mode=ro', uri=True)
+            self.connection.execute(f'PRAGMA mmap_size = {int(mmap_size)}')
+        else:
+            self.connection = sqlite3.connect(self.path)
+            self.connection.execute('CREATE TABLE IF NOT EXISTS equity (hole BLOB, community BLOB, '
+                                    'opponents INTEGER, equity REAL, samples INTEGER, '
+                                    'PRIMARY KEY (hole, community, opponents)) WITHOUT ROWID')
+            self.connection.execute('CREATE TABLE IF NOT EXISTS filled (hole BLOB, streets INTEGER, '
+                                    'opponents INTEGER, PRIMARY KEY (hole, streets, opponents)) WITHOUT ROWID')
+            self.connection.commit()
+
+    def get(self, key: CanonicalKey, num_opponents: int) -> float | None:
+        """Returns the cached equity of a canonical hand, or None if it is not cached."""
+        row = self.connection.execute('SELECT equity FROM equity WHERE hole = ? AND community = ? AND opponents = ?',
+                                      (bytes(key[0]), bytes(key[1]), num_opponents)).fetchone()
+        return row[0] if row else None
+
+    def put_many(self, rows: list[tuple[CanonicalKey, int, float, int]]) -> None:
+        """Adds (canonical key, number of opponents, equity, number of samples) rows to the cache."""
+        self.connection.executemany('INSERT OR REPLACE INTO equity VALUES (?, ?, ?, ?, ?)',
+                                    [(bytes(key[0]), bytes(key[1]), num_opponents, equity, num_samples)
+                                     for key, num_opponents, equity, num_samples in rows])
+        self.connection.commit()
+
+    def is_filled(self, hole: tuple[int, ...], num_community: int, num_opponents: int) -> bool:
+        """Returns True if every community of a street has been filled in for a canonical preflop hand."""
+        return self.connection.execute('SELECT 1 FROM filled WHERE hole = ? AND streets = ? AND opponents = ?',
+                                       (bytes(hole), num_community, num_opponents)).fetchone() is not None
+
+    def mark_filled(self, hole: tuple[int, ...], num_community: int, num_opponents: int) -> None:
+        self.connection.execute('INSERT OR IGNORE INTO filled VALUES (?, ?, ?)',
+                                (bytes(hole), num_community, num_opponents))
+        self.connection.commit()
+
+    def __len__(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM equity').fetchone()[0]
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class EquityCalculator:
+    """Looks up hand equities, calculating only the ones that are not cached.
+
+    Equities are looked up by canonical key, first in memory, then in the persistent
+    cache if there is one. Calculated equities are only kept in memory, so that the
+    persistent cache only holds results from the bulk fill.
+
+    Args:
+        cache: The persistent cache to consult, if any
+        num_samples: The number of random deals used when an equity has to be calculated
+        max_memo_size: The most equities to keep in memory before starting over
+        get_tables: Returns the lookup tables to score hands with, for variants with their own
+        lowest_card: The card number of the lowest card in the deck, above 0 for a short deck
+
+    Attributes:
+        hits: The number of lookups answered from memory or the persistent cache
+        misses: The number of lookups that had to be calculated
+    """
+
+    def __init__(self, cache: EquityCache | None = None, num_samples: int = 200, max_memo_size: int = 200_000,
+                 get_tables: Callable[[], LookupTables] = get_tables, lowest_card: int = 0):
+        self.cache = cache
+        self.num_samples = num_samples
+        self.max_memo_size = max_memo_size
+        self.get_tables = get_tables
+        self.lowest_card = lowest_card
+        self.rng = random.Random()
+        self.hits = 0
+        self.misses = 0
+        self._memo: dict[tuple[CanonicalKey, int], float] = {}
+
+    def equity(self, hole: list[Card], community: list[Card], num_opponents: int) -> float:
+        """Returns a hand's equity against a number of opponents. See calculate_equity()."""
+        key = canonical_key(hole, community)
+        equity = self._memo.get((key, num_opponents))
+        if equity is None and self.cache is not None:
+            equity = self.cache.get(key, num_opponents)
+        if equity is None:
+            self.misses += 1
+            equity = calculate_equity(hole, community, num_opponents, self.num_samples, self.rng, self.get_tables(),
+                                      self.lowest_card)
+        else:
+            self.hits += 1
+        if len(self._memo) >= self.max_memo_size:
+            self._memo.clear()
+        self._memo[(key, num_opponents)] = equity
+        return equity
+
+
+# The calculator shared by computer players. Attach a cache with shared_calculator.cache = EquityCache(...)
+shared_calculator = EquityCalculator()
+
+
+def fill_cache(path: str | Path, streets: list[str], opponents: list[int], num_samples: int = 10000,
+               processes: int | None = None, seed: int = 0) -> int:
+    """Fills an equity cache with every canonical hand of the given streets.
+
+    The work is split by canonical preflop hand across a pool of processes. Each
+    preflop hand is recorded once its communities are filled in, so a fill that is
+    stopped can be run again to pick up where it left off.
+
+    Args:
+        path: The cache file
+        streets: The streets to fill, from STREETS
+        opponents: The numbers of opponents to fill
+        num_samples: The number of random deals per equity
+        processes: The number of worker processes, defaults to one per core
+        seed: Seeds the random deals, so that a fill can be repeated
+
+    Returns:
+        The number of equities added
+    """
+    cache = EquityCache(path)
+    tasks = [(hole, STREETS[street], num_opponents, num_samples, seed)
+             for street in streets for num_opponents in opponents for hole, _ in iter_canonical_keys(2, 0)
+             if not cache.is_filled(hole, STREETS[street], num_opponents)]
+    num_added = 0
+    with worker_pool(processes) as pool:
+        for hole, num_community, num_opponents, rows in pool.imap_unordered(_fill_hand, tasks):
+            cache.put_many(rows)
+            cache.mark_filled(hole, num_community, num_opponents)
+            num_added += len(rows)
+    cache.close()
+    return num_added
+
+
+def _fill_hand(task: tuple[tuple[int, ...], int, int, int, int]
+               ) -> tuple[tuple[int, ...], int, int, list[tuple[CanonicalKey, int, float, int]]]:
+    """Calculates the equity of every canonical community of a street for one canonical preflop hand."""
+    hole, num_community, num_opponents, num_samples, seed = task
+    rng = random.Random(f'{seed} {hole} {num_community} {num_opponents}')
+    hole_cards = [Card.from_int(card) for card in hole]
+    keys = {canonical_key(hole_cards, [Card.from_int(card) for card in community])
+            for community in combinations([card for card in range(52) if card not in hole], num_community)}
+    rows = []
+    for key in sorted(keys):
+        equity = calculate_equity(*cards_from_key(key), num_opponents, num_samples, rng)
+        rows.append((key, num_opponents, equity, num_samples))
+    return hole, num_community, num_opponents, rows
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Fill a hand equity cache using every core.')
+    parser.add_argument('cache', help='SQLite file to fill, created if it does not exist')
+    parser.add_argument('--streets', nargs='+', default=['preflop'], choices=list(STREETS), help='streets to fill')
+    parser.add_argument('--opponents', nargs='+', type=int, default=list(range(1, 9)),
+                        help='numbers of opponents to fill')
+    parser.add_argument('--samples', type=int, default=10000, help='random deals per equity')
+    parser.add_argument('--processes', type=int, help='worker processes, defaults to one per core')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the random deals')
+    args = parser.parse_args()
+
+    num_added = fill_cache(args.cache, args.streets, args.opponents, args.samples, args.processes, args.seed)
+    print(f'Added {num_added:,} equities to {args.cache}.')
+
+
+if __name__ == '__main__':
+    main()
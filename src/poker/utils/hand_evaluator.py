@@ -0,0 +1,213 @@
+"""
+#######################################################################################################################
+An incremental hand evaluator. Instead of scoring every 5 card combination of a player's cards, it keeps running rank
+counts, suit counts, and rank bitmasks as cards are added, and reads the best hand straight off of them.
+
+Scores use the same digit layout as hand_ranking_utils.score_hand, so hands scored either way compare correctly.
+#######################################################################################################################
+"""
+
+from __future__ import annotations
+
+from src.poker.card import Card
+
+SUITS = ('C', 'D', 'H', 'S')
+
+# Bitmasks of the five ranks in each straight, from the highest straight down. Bit n is set for rank n.
+STRAIGHT_MASKS = tuple((high, 0b11111 << (high - 4)) for high in range(Card.RANK_HIGHEST, Card.RANK_LOWEST + 3, -1))
+
+HIGH_CARD = 1
+ONE_PAIR = 2
+TWO_PAIR = 3
+THREE_OF_A_KIND = 4
+STRAIGHT = 5
+FLUSH = 6
+FULL_HOUSE = 7
+FOUR_OF_A_KIND = 8
+STRAIGHT_FLUSH = 9
+ROYAL_FLUSH = 10
+
+
+def make_score(category: int, values: list[int]) -> int:
+    """Builds a hand score from its rank category and up to 5 tie-breaking card values.
+
+    Example:
+        make_score(ONE_PAIR, [9, 12, 7, 5]) returns 2 09 12 07 05 00
+    """
+    score = category
+    for i in range(5):
+        score = score * 100 + (values[i] if i < len(values) else 0)
+    return score
+
+
+def get_category(score: int) -> int:
+    """Returns the rank category of a hand score (e.g. FLUSH)."""
+    return score // 10000000000
+
+
+class HandEvaluator:
+    """Tracks the strength of a player's hole cards plus the community as cards are dealt.
+
+    Adding or removing a card takes constant time, and the best hand is found from the
+    running counts without looking at combinations of cards.
+
+    Attributes:
+        cards: The cards added so far
+        rank_counts: The number of cards of each rank, indexed by rank value
+        suit_counts: The number of cards of each suit
+        rank_mask: A bitmask with bit n set if a card of rank n has been added
+        suit_masks: A rank bitmask for each suit
+    """
+
+    def __init__(self, cards: list[Card] | None = None) -> None:
+        self.cards: list[Card] = []
+        self.rank_counts = [0] * (Card.RANK_HIGHEST + 1)
+        self.suit_counts = dict.fromkeys(SUITS, 0)
+        self.rank_mask = 0
+        self.suit_masks = dict.fromkeys(SUITS, 0)
+        self._score: int | None = None
+        for card in cards or []:
+            self.add(card)
+
+    def add(self, card: Card) -> None:
+        rank = card.rank_value
+        self.cards.append(card)
+        self.rank_counts[rank] += 1
+        self.suit_counts[card.suit_value] += 1
+        self.rank_mask |= 1 << rank
+        self.suit_masks[card.suit_value] |= 1 << rank
+        self._score = None
+
+    def remove(self, card: Card) -> None:
+        rank = card.rank_value
+        self.cards.remove(card)
+        self.rank_counts[rank] -= 1
+        self.suit_counts[card.suit_value] -= 1
+        if not self.rank_counts[rank]:
+            self.rank_mask &= ~(1 << rank)
+        self.suit_masks[card.suit_value] &= ~(1 << rank)
+        self._score = None
+
+    def copy(self) -> HandEvaluator:
+        evaluator = HandEvaluator.__new__(HandEvaluator)
+        evaluator.cards = self.cards.copy()
+        evaluator.rank_counts = self.rank_counts.copy()
+        evaluator.suit_counts = self.suit_counts.copy()
+        evaluator.rank_mask = self.rank_mask
+        evaluator.suit_masks = self.suit_masks.copy()
+        evaluator._score = self._score
+        return evaluator
+
+    def score(self) -> int:
+        """Returns the score of the best hand that can be made from the cards added so far."""
+        if self._score is None:
+            self._score = self._find_best_hand()[0]
+        return self._score
+
+    def category(self) -> int:
+        """Returns the rank category (e.g. FLUSH) of the best hand that can be made so far."""
+        return get_category(self.score())
+
+    def best_hand_cards(self) -> list[Card]:
+        """Returns the cards of the best hand, highest rank first."""
+        _, hand_ranks, flush_suit = self._find_best_hand()
+        hand = []
+        for rank in hand_ranks:
+            card = next(card for card in self.cards if card.rank_value == rank and card not in hand
+                        and (flush_suit is None or card.suit_value == flush_suit))
+            hand.append(card)
+        return sorted(hand, key=lambda card: card.rank_value, reverse=True)
+
+    def outs(self, unseen_cards: list[Card]) -> list[Card]:
+        """Returns the unseen cards that would improve the rank category of the best hand.
+
+        Args:
+            unseen_cards: The cards that could still be dealt
+        """
+        score = self.score()
+        category = get_category(score)
+        outs = []
+        for card in unseen_cards:
+            self.add(card)
+            if self.category() > category:
+                outs.append(card)
+            self.remove(card)
+        self._score = score
+        return outs
+
+    def _find_best_hand(self) -> tuple[int, list[int], str | None]:
+        """Returns the best hand's score, the ranks of its cards, and its suit if it is a flush."""
+        counts = self.rank_counts
+        flush_suit = next((suit for suit in SUITS if self.suit_counts[suit] >= 5), None)
+        if flush_suit:
+            high = _find_straight(self.suit_masks[flush_suit])
+            if high == Card.RANK_HIGHEST:
+                return make_score(ROYAL_FLUSH, []), list(range(high, high - 5, -1)), flush_suit
+            if high:
+                return make_score(STRAIGHT_FLUSH, [high]), list(range(high, high - 5, -1)), flush_suit
+
+        ranks_high_to_low = [rank for rank in range(Card.RANK_HIGHEST, Card.RANK_LOWEST - 1, -1) if counts[rank]]
+        quads = [rank for rank in ranks_high_to_low if counts[rank] == 4]
+        if quads:
+            kickers = [rank for rank in ranks_high_to_low if rank != quads[0]][:1]
+            return make_score(FOUR_OF_A_KIND, [quads[0]] + kickers), [quads[0]] * 4 + kickers, None
+        triples = [rank for rank in ranks_high_to_low if counts[rank] == 3]
+        pairs = [rank for rank in ranks_high_to_low if counts[rank] == 2]
+        if triples and (len(triples) > 1 or pairs):
+            pair = max(triples[1:] + pairs)
+            return make_score(FULL_HOUSE, [triples[0], pair]), [triples[0]] * 3 + [pair] * 2, None
+        if flush_suit:
+            flush_ranks = [rank for rank in ranks_high_to_low if self.suit_masks[flush_suit] >> rank & 1][:5]
+            return make_score(FLUSH, flush_ranks), flush_ranks, flush_suit
+        high = _find_straight(self.rank_mask)
+        if high:
+            return make_score(STRAIGHT, [high]), list(range(high, high - 5, -1)), None
+        if triples:
+            kickers = [rank for rank in ranks_high_to_low if rank != triples[0]][:2]
+            return make_score(THREE_OF_A_KIND, [triples[0]] + kickers), [triples[0]] * 3 + kickers, None
+        if len(pairs) > 1:
+            kickers = [rank for rank in ranks_high_to_low if rank not in pairs[:2]][:1]
+            return (make_score(TWO_PAIR, pairs[:2] + kickers),
+                    [pairs[0]] * 2 + [pairs[1]] * 2 + kickers, None)
+        if pairs:
+            kickers = [rank for rank in ranks_high_to_low if rank != pairs[0]][:3]
+            return make_score(ONE_PAIR, [pairs[0]] + kickers), [pairs[0]] * 2 + kickers, None
+        singles = ranks_high_to_low[:5]
+        return make_score(HIGH_CARD, singles), singles, None
+
+
+def _find_straight(rank_mask: int) -> int:
+    """Returns the high card of the highest straight in a rank bitmask, or 0 if there is none."""
+    for high, straight_mask in STRAIGHT_MASKS:
+        if rank_mask & straight_mask == straight_mask:
+            return high
+    return 0
+
+
+# Scores of hands already seen by score_ranks and score_flush. Without a flush, a hand's score only depends on its
+# ranks, and with a flush it only depends on the ranks of the flush suit, so both tables stay small no matter how many
+# hands are scored.
+_rank_scores: dict[tuple[int, ...], int] = {}
+_flush_scores: dict[int, int] = {}
+
+
+def score_ranks(ranks: tuple[int, ...]) -> int:
+    """Returns the score of a hand without a flush from its sorted ranks."""
+    score = _rank_scores.get(ranks)
+    if score is None:
+        # Spread the cards over the suits so that they never make a flush
+        score = _rank_scores[ranks] = HandEvaluator([Card(rank, SUITS[i % 4]) for i, rank in enumerate(ranks)]).score()
+    return score
+
+
+def score_flush(flush_mask: int) -> int:
+    """Returns the score of a hand with a flush from the rank bitmask of its flush suit.
+
+    With 7 cards or fewer, a flush leaves too few cards for four of a kind or a full
+    house, so the flush suit alone decides the score.
+    """
+    score = _flush_scores.get(flush_mask)
+    if score is None:
+        ranks = [rank for rank in range(Card.RANK_LOWEST, Card.RANK_HIGHEST + 1) if flush_mask >> rank & 1]
+        score = _flush_scores[flush_mask] = HandEvaluator([Card(rank, SUITS[0]) for rank in ranks]).score()
+    return score
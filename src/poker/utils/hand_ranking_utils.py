@@ -54,13 +54,12 @@ def determine_showdown_winner(showdown_players, community):
     # Create a list of the winners with the best scoring hand
     winners = []
     for player in showdown_players:
-        combos = combinations(player.hand + community, 5)
-        for combo in combos:
-            raw_score = score_hand(combo)
-            if raw_score > player.best_hand_score:
-                player.best_hand_score = raw_score
-                combo = sorted(combo, key=lambda x: x.rank_value, reverse=True)
-                player.best_hand_cards = combo
+        # Reuse the hand evaluator that followed the player's cards as they were dealt
+        if len(player.hand_evaluator.cards) == len(player.hand) + len(community):
+            player.best_hand_score = player.hand_evaluator.score()
+            player.best_hand_cards = player.hand_evaluator.best_hand_cards()
+        else:
+            score_best_hand(player, community)
         #  Assign the string version of the player's best hand
         player.best_hand_rank = handrank_int_str_dict[int(player.best_hand_score / 10000000000)]
         if winners == []:
@@ -74,6 +73,22 @@ def determine_showdown_winner(showdown_players, community):
     return winners
 
 
+def score_best_hand(player, community):
+    """Scores every 5 card combination of a player's hand and the community, keeping the best.
+
+    Args:
+        player (Player): the player whose hand to score
+        community (list): the cards of the community
+    """
+    combos = combinations(player.hand + community, 5)
+    for combo in combos:
+        raw_score = score_hand(combo)
+        if raw_score > player.best_hand_score:
+            player.best_hand_score = raw_score
+            combo = sorted(combo, key=lambda x: x.rank_value, reverse=True)
+            player.best_hand_cards = combo
+
+
 def score_hand(hand):
     """Scores a particular hand combination that a player could possibly make.
 
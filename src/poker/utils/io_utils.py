@@ -1,12 +1,24 @@
 import os
 
-from blessed import Terminal
+_terminal = None
+
+
+def get_terminal():
+    """Returns the blessed terminal, setting it up the first time it is needed.
+
+    The engine never touches the terminal, so importing it stays fast and works without a TTY.
+    """
+    global _terminal
+    if _terminal is None:
+        from blessed import Terminal
+        _terminal = Terminal()
+    return _terminal
 
 
 def input_no_return(prompt):
     flush_input()
     print(prompt)
-    term = Terminal()
+    term = get_terminal()
     with term.cbreak():
         key = term.inkey()
     flush_input()
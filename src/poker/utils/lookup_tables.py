@@ -0,0 +1,211 @@
+"""
+#######################################################################################################################
+Lookup tables that score a 7 card hand with one table read. They take a few seconds to build, so they are built once,
+saved to a file, and attached by memory-mapping the file. Every process that attaches the same file shares one copy of
+the tables in the page cache, and attaching takes milliseconds.
+
+Without a flush, a hand's score only depends on its ranks. Each rank has a key, chosen so that the sum of the keys of
+any 7 ranks, with no rank more than 4 times, is different for every combination of ranks. The sum indexes the rank
+table. With a flush, the score only depends on the ranks of the flush suit, and their 13 bit mask indexes the flush
+table. Both tables hold hand strengths: indexes into the sorted list of every distinct score, so comparing strengths
+compares hands, and the list turns a strength back into a score.
+#######################################################################################################################
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Callable
+from itertools import combinations_with_replacement
+
+from src.poker.card import Card
+from src.poker.utils import hand_evaluator
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from multiprocessing.pool import Pool
+
+# The key of each rank, from 2 up to Ace
+RANK_KEYS = (0, 1, 5, 22, 98, 453, 2031, 8698, 22854, 83661, 262349, 636345, 1479181)
+
+# The rank key and 13 bit rank bit of each card number from Card.to_int()
+CARD_RANK_KEYS = tuple(RANK_KEYS[card // 4] for card in range(52))
+CARD_RANK_BITS = tuple(1 << card // 4 for card in range(52))
+
+NUM_CARDS = 7
+RANK_TABLE_SIZE = RANK_KEYS[-1] * 4 + RANK_KEYS[-2] * 3 + 1
+FLUSH_TABLE_SIZE = 1 << len(RANK_KEYS)
+
+# Magic, byte order check, version, rank table size, flush table size, number of scores, rules, padded to 32 bytes
+_HEADER = struct.Struct('=4sHHIII8s4x')
+_MAGIC = b'PKLT'
+_BYTE_ORDER_CHECK = 0x0102
+_VERSION = 2
+
+# The rules of standard hold'em, which the tables of other rules are told apart from
+HOLDEM_RULES = 'holdem'
+
+# Each user's own cache directory, so that tables are never attached from a file someone else can write
+DEFAULT_PATH = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+                            'poker', f'lookup_tables_v{_VERSION}.bin')
+
+
+class LookupTables:
+    """Hand strength lookup tables for 7 card hands.
+
+    Args:
+        rank_table: The strength of each hand without a flush, indexed by the sum of its rank keys
+        flush_table: The strength of each flush, indexed by the rank mask of its flush suit.
+            Masks with fewer than 5 ranks hold 0.
+        scores: The score of each strength, in increasing order. Strength 0 is not a hand.
+        rules: Names the hand rankings the tables score, at most 8 characters
+    """
+
+    def __init__(self, rank_table, flush_table, scores, rules: str = HOLDEM_RULES) -> None:
+        self.rank_table = rank_table
+        self.flush_table = flush_table
+        self.scores = scores
+        self.rules = rules
+        self._mmap: mmap.mmap | None = None
+
+    @classmethod
+    def build(cls, score_ranks: Callable[[tuple[int, ...]], int] = hand_evaluator.score_ranks,
+              score_flush: Callable[[int], int] = hand_evaluator.score_flush,
+              rules: str = HOLDEM_RULES) -> LookupTables:
+        """Builds the tables by scoring every combination of ranks, and every flush suit, once.
+
+        Args:
+            score_ranks: Scores a hand without a flush from its sorted ranks
+            score_flush: Scores a flush from the rank bitmask of its flush suit, with bit n set for rank n
+            rules: Names the hand rankings of score_ranks and score_flush
+        """
+        rank_scores = {}
+        for ranks in combinations_with_replacement(range(len(RANK_KEYS)), NUM_CARDS):
+            if all(ranks.count(rank) <= 4 for rank in set(ranks)):
+                key = sum(RANK_KEYS[rank] for rank in ranks)
+                rank_scores[key] = score_ranks(tuple(rank + Card.RANK_LOWEST for rank in ranks))
+        flush_scores = {mask: score_flush(mask << Card.RANK_LOWEST) for mask in range(FLUSH_TABLE_SIZE)
+                        if 5 <= bin(mask).count('1') <= NUM_CARDS}
+
+        scores = [0] + sorted(set(rank_scores.values()) | set(flush_scores.values()))
+        strengths = {score: strength for strength, score in enumerate(scores)}
+        rank_table = array('H', bytes(2 * RANK_TABLE_SIZE))
+        for key, score in rank_scores.items():
+            rank_table[key] = strengths[score]
+        flush_table = array('H', bytes(2 * FLUSH_TABLE_SIZE))
+        for mask, score in flush_scores.items():
+            flush_table[mask] = strengths[score]
+        return cls(rank_table, flush_table, array('q', scores), rules)
+
+    def save(self, path: str | os.PathLike) -> None:
+        """Saves the tables to a file. The file is replaced in one step, so processes never attach a partial file."""
+        temp_path = f'{os.fspath(path)}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, _BYTE_ORDER_CHECK, _VERSION, len(self.rank_table), len(self.flush_table),
+                                 len(self.scores), self.rules.encode()))
+            f.write(bytes(self.scores))
+            f.write(bytes(self.rank_table))
+            f.write(bytes(self.flush_table))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def attach(cls, path: str | os.PathLike, rules: str = HOLDEM_RULES) -> LookupTables:
+        """Memory-maps tables saved with save(), without copying them.
+
+        Args:
+            path: The file the tables are saved in
+            rules: The hand rankings the tables must score
+
+        Raises:
+            ValueError: If the file does not hold all of the tables of this version, byte order, and rules
+        """
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, byte_order_check, version, rank_size, flush_size, num_scores, saved_rules = _HEADER.unpack_from(mapped)
+        header = (magic, byte_order_check, version, rank_size, flush_size, saved_rules.rstrip(b'\0'))
+        if (header != (_MAGIC, _BYTE_ORDER_CHECK, _VERSION, RANK_TABLE_SIZE, FLUSH_TABLE_SIZE, rules.encode())
+                or len(mapped) != _HEADER.size + 8 * num_scores + 2 * (rank_size + flush_size)):
+            mapped.close()
+            raise ValueError(f'{path} does not hold version {_VERSION} {rules} lookup tables for this machine.')
+        view = memoryview(mapped)
+        start = _HEADER.size
+        scores = view[start:start + 8 * num_scores].cast('q')
+        start += 8 * num_scores
+        rank_table = view[start:start + 2 * rank_size].cast('H')
+        start += 2 * rank_size
+        flush_table = view[start:start + 2 * flush_size].cast('H')
+        tables = cls(rank_table, flush_table, scores, rules)
+        tables._mmap = mapped
+        return tables
+
+    def hand_strength(self, cards: list[int]) -> int:
+        """Returns the strength of a 7 card hand of card numbers from Card.to_int(). Higher is better."""
+        key = 0
+        suit_masks = [0, 0, 0, 0]
+        for card in cards:
+            key += CARD_RANK_KEYS[card]
+            suit_masks[card & 3] |= CARD_RANK_BITS[card]
+        for mask in suit_masks:
+            strength = self.flush_table[mask]
+            if strength:
+                return strength
+        return self.rank_table[key]
+
+    def score(self, cards: list[int]) -> int:
+        """Returns the score of a 7 card hand, in the same layout as hand_ranking_utils.score_hand."""
+        return self.scores[self.hand_strength(cards)]
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self.rank_table.release()
+            self.flush_table.release()
+            self.scores.release()
+            self._mmap.close()
+            self._mmap = None
+
+
+_attached: dict[str, LookupTables] = {}
+
+
+def get_tables(path: str | os.PathLike = DEFAULT_PATH,
+               build: Callable[[], LookupTables] = LookupTables.build, rules: str = HOLDEM_RULES) -> LookupTables:
+    """Returns the tables saved at path, attaching them once per process.
+
+    The first process to ask for tables that have not been saved yet builds and
+    saves them, and every process after that attaches the saved file. A file
+    of another version or other rules is rebuilt in its place.
+
+    Args:
+        path: The file the tables are saved in
+        build: Builds the tables if they have not been saved yet, for tables of other rules
+        rules: Names the hand rankings build scores
+    """
+    path = os.fspath(path)
+    if path not in _attached:
+        try:
+            _attached[path] = LookupTables.attach(path, rules)
+        except (OSError, ValueError):
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            build().save(path)
+            _attached[path] = LookupTables.attach(path, rules)
+    return _attached[path]
+
+
+def worker_pool(processes: int | None = None) -> Pool:
+    """Returns a pool of worker processes that score hands with the standard tables.
+
+    The tables are attached, and built if they have not been saved yet, before the
+    workers start, so that the workers share one copy of them instead of each
+    building its own.
+
+    Args:
+        processes: The number of worker processes, defaults to one per core
+    """
+    # Imported here so that importing the engine does not pay for it
+    import multiprocessing
+
+    get_tables()
+    return multiprocessing.Pool(processes)
@@ -0,0 +1,126 @@
+"""
+#######################################################################################################################
+Omaha hand evaluation. An Omaha hand is the best 5 cards made from exactly 2 of a player's 4 hole cards and exactly 3 of
+the community, so a player with a full board has 6 pairs of hole cards times 10 triples of community cards, 60 hands,
+to choose from, against the 21 that any 5 of 7 cards make in Texas Hold'em.
+
+The community's half of the work is the same for every player, so it is done once per board: each triple's rank key,
+and the rank mask of each triple of one suit, which is all a flush can be made from. A player's hand is then read off a
+table of every 5 card hand without a flush, indexed by pair key plus triple key, with pairs and triples of the same
+ranks only tried once, and off a table of flushes for the suited pairs that match a one-suited triple.
+
+Scores use the same digit layout as hand_ranking_utils.score_hand, so hands scored either way compare correctly.
+#######################################################################################################################
+"""
+
+from __future__ import annotations
+
+from itertools import combinations, combinations_with_replacement
+
+from src.poker.card import Card
+from src.poker.utils import hand_evaluator
+from src.poker.utils.hand_ranking_utils import assign_handrank_subtypes, assign_kicker_card, handrank_int_str_dict
+from src.poker.utils.lookup_tables import CARD_RANK_BITS, CARD_RANK_KEYS, RANK_KEYS
+
+NUM_HOLE_CARDS = 4
+
+# The score of every 5 card hand without a flush, by the sum of its rank keys, and of every flush, by its rank mask.
+# Rank keys sum to a different number for every 7 ranks, so they do for every 5 ranks too.
+_rank_scores: dict[int, int] = {}
+_flush_scores: dict[int, int] = {}
+
+
+def _build_tables() -> None:
+    for ranks in combinations_with_replacement(range(len(RANK_KEYS)), 5):
+        if all(ranks.count(rank) <= 4 for rank in set(ranks)):
+            _rank_scores[sum(RANK_KEYS[rank] for rank in ranks)] = hand_evaluator.score_ranks(
+                tuple(rank + Card.RANK_LOWEST for rank in ranks))
+    for ranks in combinations(range(len(RANK_KEYS)), 5):
+        mask = sum(1 << rank for rank in ranks)
+        _flush_scores[mask] = hand_evaluator.score_flush(mask << Card.RANK_LOWEST)
+
+
+class OmahaBoard:
+    """The community's half of scoring Omaha hands, worked out once and shared by every player.
+
+    Args:
+        board: The community, as card numbers from Card.to_int(), with at least 3 cards
+
+    Attributes:
+        triple_keys: The rank key sum of each triple of community cards, without repeats
+        flush_triples: The suit and rank mask of each triple of community cards of one suit
+    """
+
+    def __init__(self, board: list[int]) -> None:
+        if not _rank_scores:
+            _build_tables()
+        self._board = board
+        triples = list(combinations(board, 3))
+        self.triple_keys = list({CARD_RANK_KEYS[a] + CARD_RANK_KEYS[b] + CARD_RANK_KEYS[c] for a, b, c in triples})
+        self.flush_triples = [(a & 3, CARD_RANK_BITS[a] | CARD_RANK_BITS[b] | CARD_RANK_BITS[c])
+                              for a, b, c in triples if a & 3 == b & 3 == c & 3]
+
+    def score(self, hole: list[int]) -> int:
+        """Returns the score of the best hand made from exactly 2 of the hole cards and 3 of the community."""
+        rank_scores = _rank_scores
+        pair_keys = {CARD_RANK_KEYS[a] + CARD_RANK_KEYS[b] for a, b in combinations(hole, 2)}
+        best = max([rank_scores[pair_key + triple_key] for pair_key in pair_keys for triple_key in self.triple_keys])
+        for suit, mask in self.flush_triples:
+            suited = [CARD_RANK_BITS[card] for card in hole if card & 3 == suit]
+            for a, b in combinations(suited, 2):
+                score = _flush_scores[mask | a | b]
+                if score > best:
+                    best = score
+        return best
+
+    def best_hand(self, hole: list[int]) -> tuple[int, tuple[int, ...]]:
+        """Returns the score of the best hand and its 5 card numbers, hole cards first."""
+        best = self.score(hole)
+        board = self._board
+        for pair in combinations(hole, 2):
+            for triple in combinations(board, 3):
+                if _score_five(pair + triple) == best:
+                    return best, pair + triple
+        raise AssertionError('The best hand is one of the combinations.')
+
+
+def _score_five(cards: tuple[int, ...]) -> int:
+    if len({card & 3 for card in cards}) == 1:
+        return _flush_scores[sum(CARD_RANK_BITS[card] for card in cards)]
+    return _rank_scores[sum(CARD_RANK_KEYS[card] for card in cards)]
+
+
+def score_hand(hole: list[Card], community: list[Card]) -> int:
+    """Returns the score of the best Omaha hand made from the hole cards and a community of at least 3 cards."""
+    return OmahaBoard([card.to_int() for card in community]).score([card.to_int() for card in hole])
+
+
+def determine_showdown_winner(showdown_players, community):
+    """Determines which player(s) wins the showdown, with Omaha hands.
+
+    The community is broken down once and every player's hand is scored against it.
+
+    Args:
+        showdown_players (list): players competing for a particular pot
+        community (list): the 5 cards of the community
+
+    Returns:
+        winners (list): players who won a particular pot
+    """
+    board = OmahaBoard([card.to_int() for card in community])
+    cards = {card.to_int(): card for player in showdown_players for card in player.hand}
+    cards.update((card.to_int(), card) for card in community)
+    winners = []
+    for player in showdown_players:
+        score, best_cards = board.best_hand([card.to_int() for card in player.hand])
+        player.best_hand_score = score
+        player.best_hand_cards = sorted((cards[card] for card in best_cards), key=lambda card: card.rank_value,
+                                        reverse=True)
+        player.best_hand_rank = handrank_int_str_dict[hand_evaluator.get_category(score)]
+        if not winners or score > winners[0].best_hand_score:
+            winners = [player]
+        elif score == winners[0].best_hand_score:
+            winners.append(player)
+    assign_handrank_subtypes(showdown_players)
+    assign_kicker_card(winners, showdown_players)
+    return winners
@@ -0,0 +1,232 @@
+"""
+#######################################################################################################################
+Optional instrumentation for the game engine. A Profiler replaces the methods it is asked to watch with timed
+wrappers, so an engine that is not being profiled runs its original, unwrapped code at no cost.
+
+Timings are kept as call counts, total time, and power-of-two histograms of wall time. Individual calls can also be
+recorded and exported in the Chrome trace event format, which chrome://tracing, Perfetto, and speedscope all read.
+#######################################################################################################################
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable
+
+
+class TimerStats:
+    """Timing statistics for a single instrumented call site.
+
+    Attributes:
+        calls: The number of times the call site ran
+        total: The total wall time spent in the call site, in seconds
+        histogram: Maps a bucket number to the number of calls in that bucket. Bucket n
+            holds calls that took less than 2**n microseconds, and at least 2**(n-1).
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total = 0.0
+        self.histogram: dict[int, int] = {}
+
+    def add(self, duration: float) -> None:
+        self.calls += 1
+        self.total += duration
+        bucket = int(duration * 1_000_000).bit_length()
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+    def percentile(self, fraction: float) -> float:
+        """Returns the upper bound, in seconds, of the histogram bucket holding the given fraction of calls."""
+        target = fraction * self.calls
+        seen = 0
+        for bucket in sorted(self.histogram):
+            seen += self.histogram[bucket]
+            if seen >= target:
+                return (2 ** bucket) / 1_000_000
+        return 0.0
+
+
+class ThroughputStats:
+    """Throughput statistics for a call site that does a varying amount of work per call, like a search.
+
+    Attributes:
+        calls: The number of times the call site ran
+        count: The total units of work done
+        total: The total wall time spent in the call site, in seconds
+        lowest_rate: The fewest units of work per second of any one call
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.count = 0
+        self.total = 0.0
+        self.lowest_rate = float('inf')
+
+    def add(self, count: int, duration: float) -> None:
+        self.calls += 1
+        self.count += count
+        self.total += duration
+        if duration > 0:
+            self.lowest_rate = min(self.lowest_rate, count / duration)
+
+    def rate(self) -> float:
+        """Returns the units of work per second across all calls."""
+        return self.count / self.total if self.total > 0 else 0.0
+
+
+class Profiler:
+    """Collects wall time of instrumented engine calls and hands played per second.
+
+    Args:
+        summary_interval: If set, the number of seconds between summaries reported
+            as hands finish
+        max_trace_events: The most individual calls kept for trace export. Set to 0
+            to keep only the aggregate statistics.
+        report: Called with each periodic summary
+    """
+
+    def __init__(self, summary_interval: float | None = None, max_trace_events: int = 1_000_000,
+                 report: Callable[[str], Any] = lambda summary: print(summary, file=sys.stderr)) -> None:
+        self.stats: dict[str, TimerStats] = {}
+        self.throughput: dict[str, ThroughputStats] = {}
+        self.trace_events: list[tuple[str, float, float]] = []
+        self.max_trace_events = max_trace_events
+        self.summary_interval = summary_interval
+        self.report = report
+        self.hands_played = 0
+        self.start_time = perf_counter()
+        self._last_summary_time = self.start_time
+        self._pid = os.getpid()
+        self._tid = threading.get_ident()
+
+    def record(self, name: str, start: float, duration: float) -> None:
+        """Records one timed call.
+
+        Args:
+            name: The name of the call site
+            start: The perf_counter() value when the call began
+            duration: How long the call took, in seconds
+        """
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = TimerStats()
+        stats.add(duration)
+        if len(self.trace_events) < self.max_trace_events:
+            self.trace_events.append((name, start, duration))
+
+    def record_throughput(self, name: str, count: int, duration: float) -> None:
+        """Records one call that did a number of units of work, like the simulations of one search.
+
+        Args:
+            name: The name of the call site
+            count: The units of work the call did
+            duration: How long the call took, in seconds
+        """
+        stats = self.throughput.get(name)
+        if stats is None:
+            stats = self.throughput[name] = ThroughputStats()
+        stats.add(count, duration)
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        """Returns a version of func that records its wall time under the given name."""
+        @wraps(func)
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(name, start, perf_counter() - start)
+        return timed
+
+    def instrument(self, obj: object, method_names: list[str], prefix: str = '') -> None:
+        """Replaces the named methods of an object with timed versions.
+
+        Args:
+            obj: The object whose methods should be timed
+            method_names: The names of the methods to time
+            prefix: Prepended to each method name in the collected statistics
+        """
+        for method_name in method_names:
+            setattr(obj, method_name, self.wrap(prefix + method_name, getattr(obj, method_name)))
+
+    def instrument_namespace(self, namespace: Any, prefix: str) -> TimedNamespace:
+        """Returns a stand-in for a module whose public functions are all timed.
+
+        Args:
+            namespace: A module or object whose functions should be timed, like text_prompt
+            prefix: Prepended to each function name in the collected statistics
+        """
+        return TimedNamespace(self, namespace, prefix)
+
+    def hand_finished(self) -> None:
+        """Counts a finished hand, reporting a summary if the summary interval has passed."""
+        self.hands_played += 1
+        if self.summary_interval is not None:
+            now = perf_counter()
+            if now - self._last_summary_time >= self.summary_interval:
+                self._last_summary_time = now
+                self.report(self.summary())
+
+    def hands_per_second(self) -> float:
+        elapsed = perf_counter() - self.start_time
+        return self.hands_played / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        """Returns a readable table of the collected statistics, slowest call sites first.
+
+        Example:
+            Hands played: 120    Hands per second: 35.2
+            call                                         calls    total (s)   mean (ms)    p50 (ms)    p99 (ms)
+            step                                          1440        2.104       1.461       1.024       8.192
+
+            work                                         calls        count  per second  lowest/s
+            mcts.simulations                                 96        28800      4102.6    2270.3
+        """
+        lines = [f'Hands played: {self.hands_played}    Hands per second: {self.hands_per_second():.1f}',
+                 f"{'call':<44}{'calls':>6}{'total (s)':>13}{'mean (ms)':>12}{'p50 (ms)':>12}{'p99 (ms)':>12}"]
+        for name, stats in sorted(self.stats.items(), key=lambda item: item[1].total, reverse=True):
+            mean = stats.total / stats.calls * 1000
+            lines.append(f'{name:<44}{stats.calls:>6}{stats.total:>13.3f}{mean:>12.3f}'
+                         f'{stats.percentile(0.5) * 1000:>12.3f}{stats.percentile(0.99) * 1000:>12.3f}')
+        if self.throughput:
+            lines.append(f"\n{'work':<44}{'calls':>6}{'count':>13}{'per second':>12}{'lowest/s':>10}")
+            for name, stats in sorted(self.throughput.items()):
+                lines.append(f'{name:<44}{stats.calls:>6}{stats.count:>13}{stats.rate():>12.1f}'
+                             f'{stats.lowest_rate:>10.1f}')
+        return '\n'.join(lines)
+
+    def export_chrome_trace(self, path: str) -> None:
+        """Writes the recorded calls to a Chrome trace event file.
+
+        The file can be opened in chrome://tracing, Perfetto, or speedscope.
+
+        Args:
+            path: The path of the file to write
+        """
+        events = [{'name': name, 'ph': 'X', 'pid': self._pid, 'tid': self._tid,
+                   'ts': (start - self.start_time) * 1_000_000, 'dur': duration * 1_000_000}
+                  for name, start, duration in self.trace_events]
+        with open(path, 'w') as file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file)
+
+
+class TimedNamespace:
+    """Forwards attribute lookups to a namespace, timing any function that is called through it."""
+
+    def __init__(self, profiler: Profiler, namespace: Any, prefix: str) -> None:
+        self._profiler = profiler
+        self._namespace = namespace
+        self._prefix = prefix
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._namespace, name)
+        if callable(attribute) and not name.startswith('_'):
+            attribute = self._profiler.wrap(f'{self._prefix}.{name}', attribute)
+        # Cache the wrapper so later lookups skip __getattr__ entirely
+        setattr(self, name, attribute)
+        return attribute
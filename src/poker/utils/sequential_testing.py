@@ -0,0 +1,141 @@
+"""
+#######################################################################################################################
+Sequential testing for comparing playing styles. Results are added one sample at a time, and a comparison can stop
+as soon as every pair of styles is decided, instead of after a fixed, very large number of samples.
+
+Each pair of styles is compared on the per-sample difference of their results. Because both styles play the same
+sample (e.g. the same duplicate deck), the difference has much less variance than either result on its own. A pair is
+decided once the confidence interval of its mean difference excludes zero, so one style is better, or once the whole
+interval lies within the indifference margin, so the two styles are too close to call.
+
+The intervals are a confidence sequence, which covers the true mean at every number of samples at once, rather than
+the usual fixed-sample interval. Checking a fixed-sample interval after every sample, and stopping at the first one
+that excludes zero, calls styles that are exactly equal different far more often than alpha, since sooner or later the
+noise carries the interval past zero. A confidence sequence is wider, and widens slowly as samples are added, so it
+can be checked after every sample. It is the normal mixture boundary of Robbins, with the variance of the differences
+estimated from the samples so far.
+#######################################################################################################################
+"""
+
+from __future__ import annotations
+
+import math
+from itertools import combinations
+from typing import Hashable
+
+BETTER = 'better'
+WORSE = 'worse'
+TOO_CLOSE = 'too close to call'
+
+
+class RunningStats:
+    """Streaming mean and variance of a series of numbers, using Welford's algorithm.
+
+    Attributes:
+        count: The number of values added
+        mean: The mean of the values added
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._sum_squared_deviations = 0.0
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._sum_squared_deviations += delta * (x - self.mean)
+
+    @property
+    def variance(self) -> float:
+        """The sample variance of the values added."""
+        if self.count < 2:
+            return math.inf
+        return self._sum_squared_deviations / (self.count - 1)
+
+    @property
+    def standard_error(self) -> float:
+        """The standard error of the mean."""
+        if self.count < 2:
+            return math.inf
+        return math.sqrt(self.variance / self.count)
+
+
+class SequentialComparison:
+    """Compares every pair of competitors as paired samples arrive.
+
+    Args:
+        competitors: The things being compared, such as playing styles
+        alpha: The chance of calling any pair wrongly, however many samples are added.
+            It is split evenly between the pairs, so the whole ranking holds with at
+            least 1 - alpha confidence, up to the error of the variance estimates.
+        margin: Differences in mean result smaller than this are too close to call
+        min_samples: The fewest samples before any pair can be decided, so that
+            the variance estimates are reasonable. The confidence sequence is also
+            narrowest, for its confidence, at around this many samples.
+
+    Attributes:
+        results: The running stats of each competitor's results
+        differences: The running stats of the difference between each pair's results
+        num_samples: The number of samples added
+    """
+
+    def __init__(self, competitors: list[Hashable], alpha: float = 0.05, margin: float = 0.0,
+                 min_samples: int = 30) -> None:
+        self.competitors = list(competitors)
+        self.margin = margin
+        self.min_samples = min_samples
+        self.num_samples = 0
+        self.results = {competitor: RunningStats() for competitor in self.competitors}
+        self.differences = {pair: RunningStats() for pair in combinations(self.competitors, 2)}
+        num_pairs = max(len(self.differences), 1)
+        # The chance of each pair's interval missing its mean on either side, at any number of samples
+        self.side_alpha = alpha / (2 * num_pairs)
+
+    def add(self, sample: dict[Hashable, float]) -> None:
+        """Adds one sample, holding the result of every competitor."""
+        self.num_samples += 1
+        for competitor, stats in self.results.items():
+            stats.add(sample[competitor])
+        for (a, b), stats in self.differences.items():
+            stats.add(sample[a] - sample[b])
+
+    def decide(self, a: Hashable, b: Hashable) -> str | None:
+        """Returns whether competitor a is BETTER or WORSE than b, TOO_CLOSE to call, or None if undecided."""
+        if (a, b) in self.differences:
+            stats, sign = self.differences[(a, b)], 1
+        else:
+            stats, sign = self.differences[(b, a)], -1
+        if self.num_samples < self.min_samples:
+            return None
+        mean = stats.mean * sign
+        half_width = self.half_width(stats)
+        if mean - half_width > 0:
+            return BETTER
+        if mean + half_width < 0:
+            return WORSE
+        if -self.margin < mean - half_width and mean + half_width < self.margin:
+            return TOO_CLOSE
+        return None
+
+    def half_width(self, stats: RunningStats) -> float:
+        """Returns the half width of the confidence sequence for the mean of a pair's differences.
+
+        With n samples of variance s², the sum of the differences stays within
+        sqrt((n + m) s² log((n + m) / (m side_alpha²))) of n times the mean at every n,
+        except with a chance of side_alpha on each side, where m is min_samples.
+        """
+        n = stats.count
+        if n < 2:
+            return math.inf
+        m = max(self.min_samples, 1)
+        return math.sqrt(stats.variance * (n + m) * math.log((n + m) / (m * self.side_alpha ** 2))) / n
+
+    def is_decided(self) -> bool:
+        """Returns True once every pair of competitors has been decided."""
+        return all(self.decide(a, b) is not None for a, b in self.differences)
+
+    def ranking(self) -> list[Hashable]:
+        """Returns the competitors from highest to lowest mean result."""
+        return sorted(self.competitors, key=lambda competitor: self.results[competitor].mean, reverse=True)
@@ -0,0 +1,120 @@
+"""
+#######################################################################################################################
+Short deck (6+) hold'em. The deck has 36 cards, 6 up to Ace, and two hand rankings change with it: an Ace also plays
+low in the A-6-7-8-9 straight, and a flush beats a full house, since with 4 fewer ranks a flush is the rarer hand.
+
+Hands are scored by adjusting the standard evaluator's scores for both rules, in the same layout, with the categories
+of a flush and a full house swapped so that scores still compare directly. Those scoring functions are handed to the
+same LookupTables.build as the standard deck's, and the tables are saved to their own file, so a short deck game scores
+a hand with the same one table read as a standard game, and picks its tables once instead of checking rules per hand.
+#######################################################################################################################
+"""
+
+from __future__ import annotations
+
+import os
+from itertools import combinations
+
+from src.poker.card import Card
+from src.poker.utils import hand_evaluator, lookup_tables
+from src.poker.utils.equity import EquityCalculator
+from src.poker.utils.hand_evaluator import STRAIGHT, STRAIGHT_FLUSH, get_category, make_score
+from src.poker.utils.hand_ranking_utils import assign_handrank_subtypes, assign_kicker_card, handrank_int_str_dict
+from src.poker.utils.lookup_tables import DEFAULT_PATH, LookupTables
+
+RANK_LOWEST = 6
+# The card number from Card.to_int() of the lowest card in the deck
+LOWEST_CARD = Card(RANK_LOWEST, Card.SUITS[0]).to_int()
+
+# A flush and a full house trade categories, so that a flush scores higher
+FLUSH = hand_evaluator.FULL_HOUSE
+FULL_HOUSE = hand_evaluator.FLUSH
+
+HANDRANKS = {**handrank_int_str_dict, FLUSH: 'Flush', FULL_HOUSE: 'Full House'}
+
+# Ace, 6, 7, 8, 9, the lowest straight. Bit n is set for rank n.
+LOW_STRAIGHT_MASK = sum(1 << rank for rank in (Card.RANK_HIGHEST, 6, 7, 8, 9))
+LOW_STRAIGHT_HIGH = 9
+
+# Names the short deck's hand rankings in its tables' file, so that they are never mixed up with the standard deck's
+RULES = 'short'
+TABLES_PATH = os.path.join(os.path.dirname(DEFAULT_PATH), f'short_deck_{os.path.basename(DEFAULT_PATH)}')
+
+_CATEGORY = make_score(1, [])
+
+
+def score_ranks(ranks: tuple[int, ...]) -> int:
+    """Returns the short deck score of a hand without a flush from its sorted ranks."""
+    score = hand_evaluator.score_ranks(ranks)
+    category = get_category(score)
+    if category == hand_evaluator.FULL_HOUSE:
+        return score + (FULL_HOUSE - category) * _CATEGORY
+    if category < STRAIGHT and sum(1 << rank for rank in set(ranks)) & LOW_STRAIGHT_MASK == LOW_STRAIGHT_MASK:
+        return make_score(STRAIGHT, [LOW_STRAIGHT_HIGH])
+    return score
+
+
+def score_flush(flush_mask: int) -> int:
+    """Returns the short deck score of a hand with a flush from the rank bitmask of its flush suit."""
+    score = hand_evaluator.score_flush(flush_mask)
+    category = get_category(score)
+    if category != hand_evaluator.FLUSH:
+        return score
+    if flush_mask & LOW_STRAIGHT_MASK == LOW_STRAIGHT_MASK:
+        return make_score(STRAIGHT_FLUSH, [LOW_STRAIGHT_HIGH])
+    return score + (FLUSH - category) * _CATEGORY
+
+
+def build_tables() -> LookupTables:
+    """Builds the short deck's lookup tables with the standard table builder."""
+    return LookupTables.build(score_ranks, score_flush, RULES)
+
+
+def get_tables() -> LookupTables:
+    """Returns the short deck's lookup tables, building and saving them the first time they are asked for."""
+    return lookup_tables.get_tables(TABLES_PATH, build_tables, RULES)
+
+
+def score_hand(cards: list[Card]) -> int:
+    """Returns the short deck score of the best hand in any number of cards, such as a 5 card combination."""
+    suit_masks = dict.fromkeys(Card.SUITS, 0)
+    for card in cards:
+        suit_masks[card.suit_value] |= 1 << card.rank_value
+    flush_mask = next((mask for mask in suit_masks.values() if bin(mask).count('1') >= 5), 0)
+    if flush_mask:
+        return score_flush(flush_mask)
+    return score_ranks(tuple(sorted(card.rank_value for card in cards)))
+
+
+def determine_showdown_winner(showdown_players, community):
+    """Determines which player(s) wins the showdown, with short deck hand rankings.
+
+    Each player's hand is scored with one read of the short deck's lookup tables.
+
+    Args:
+        showdown_players (list): players competing for a particular pot
+        community (list): the 5 cards of the community
+
+    Returns:
+        winners (list): players who won a particular pot
+    """
+    tables = get_tables()
+    board = [card.to_int() for card in community]
+    winners = []
+    for player in showdown_players:
+        score = tables.score([card.to_int() for card in player.hand] + board)
+        player.best_hand_score = score
+        best_cards = next(combo for combo in combinations(player.hand + community, 5) if score_hand(combo) == score)
+        player.best_hand_cards = sorted(best_cards, key=lambda card: card.rank_value, reverse=True)
+        player.best_hand_rank = HANDRANKS[get_category(score)]
+        if not winners or score > winners[0].best_hand_score:
+            winners = [player]
+        elif score == winners[0].best_hand_score:
+            winners.append(player)
+    assign_handrank_subtypes(showdown_players)
+    assign_kicker_card(winners, showdown_players)
+    return winners
+
+
+# The calculator shared by computer players in short deck games
+shared_calculator = EquityCalculator(get_tables=get_tables, lowest_card=LOWEST_CARD)
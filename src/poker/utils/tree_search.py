@@ -0,0 +1,151 @@
+"""
+#######################################################################################################################
+Information set Monte Carlo tree search over the betting of a fixed-limit hand. With at most 4 raises a round, each
+decision has at most 3 moves, so the tree of betting sequences stays small enough to search thousands of times a move.
+
+The searching player cannot see the other players' hole cards or the cards still to come, so each simulation deals
+them again at random from the cards the player cannot see, then follows the tree down by betting moves alone. The moves
+a player may make only depend on the chips and bets, never on the cards, so every deal shares the same tree. Below the
+tree, the hand is played out with a simple rollout policy, and what each seat won or lost is added up the path.
+
+The tree is kept between the player's decisions in the same hand. At the next decision, the moves made since are
+followed down the old tree, and the search carries on from the subtree it finds.
+#######################################################################################################################
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from time import perf_counter
+
+from src.poker.enums.betting_move import BettingMove
+from src.poker.hand_state import HandState
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from src.poker.game import Game
+    from src.poker.players.player import Player
+
+# The chance the rollout policy picks each of the legal moves, in the order of HandState.legal_actions()
+_ROLLOUT_WEIGHTS = (.70, .20, .10)
+
+
+class Node:
+    """A betting sequence in the search tree.
+
+    Attributes:
+        seat: The seat to act, or None if the hand is over
+        untried: The legal moves not yet added as children
+        children: The node reached by each move tried
+        visits: The number of simulations through this node
+        reward: The big blinds won in those simulations by the seat that moved into this node
+    """
+
+    __slots__ = ('seat', 'untried', 'children', 'visits', 'reward')
+
+    def __init__(self, state: HandState, rng: random.Random):
+        self.seat = None if state.is_terminal else state.current
+        self.untried = state.legal_actions()
+        rng.shuffle(self.untried)
+        self.children: dict[BettingMove, Node] = {}
+        self.visits = 0
+        self.reward = 0.0
+
+    def select(self, exploration: float) -> tuple[BettingMove, Node]:
+        """Returns the child with the highest upper confidence bound."""
+        log_visits = math.log(self.visits)
+        return max(self.children.items(), key=lambda item: item[1].reward / item[1].visits +
+                   exploration * math.sqrt(log_visits / item[1].visits))
+
+
+class TreeSearch:
+    """Chooses a computer player's moves by searching the betting of the hand.
+
+    Args:
+        iterations: The most simulations a decision runs
+        time_limit: If set, the most seconds a decision searches for
+        exploration: How much the search favors moves it has tried less, in big blinds
+        rng: Deals the cards the player cannot see and picks the rollout moves
+
+    Attributes:
+        root: The node of the player's last decision
+        simulations: The simulations the last decision ran
+    """
+
+    def __init__(self, iterations: int = 300, time_limit: float | None = None, exploration: float = 4.0,
+                 rng: random.Random | None = None):
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.rng = rng or random.Random()
+        self.root: Node | None = None
+        self.simulations = 0
+        self._root_game: Game | None = None
+        self._root_hand = -1
+        self._root_history = 0
+
+    def choose_move(self, game: Game, player: Player) -> BettingMove:
+        """Searches the decision the game is waiting on, which must be the player's, and returns the best move."""
+        start = perf_counter()
+        state = HandState.from_game(game, player, self.rng)
+        self.root = self.reuse_subtree(game) or Node(state, self.rng)
+        self._root_game = game
+        self._root_hand = game.table.hands_played
+        self._root_history = len(game.hand_history)
+
+        seat = state.current
+        self.simulations = 0
+        while self.simulations < self.iterations:
+            if self.time_limit is not None and perf_counter() - start >= self.time_limit:
+                break
+            self.simulate(state, seat)
+            self.simulations += 1
+
+        if game.profiler:
+            game.profiler.record_throughput('mcts.simulations', self.simulations, perf_counter() - start)
+        if not self.root.children:
+            return state.legal_actions()[0]
+        return max(self.root.children.items(), key=lambda item: item[1].visits)[0]
+
+    def reuse_subtree(self, game: Game) -> Node | None:
+        """Returns the node of the current decision in the tree of the last one, if they are in the same hand."""
+        if self.root is None or game is not self._root_game or game.table.hands_played != self._root_hand:
+            return None
+        node = self.root
+        for _, _, move in game.hand_history[self._root_history:]:
+            node = node.children.get(move)
+            if node is None:
+                return None
+        return node
+
+    def simulate(self, root_state: HandState, seat: int) -> None:
+        """Runs one simulation from the root: deals the unseen cards, follows the tree, and plays out the hand."""
+        state = root_state.copy()
+        state.redeal_unseen(seat, self.rng)
+        node = self.root
+        path = [node]
+        while not state.is_terminal:
+            if node.untried:
+                move = node.untried.pop()
+                state.apply(move)
+                child = node.children[move] = Node(state, self.rng)
+                path.append(child)
+                break
+            move, node = node.select(self.exploration)
+            state.apply(move)
+            path.append(node)
+        while not state.is_terminal:
+            legal_actions = state.legal_actions()
+            # Never fold when checking is free
+            if legal_actions[0] is BettingMove.CHECKED:
+                legal_actions.pop()
+            state.apply(self.rng.choices(legal_actions, _ROLLOUT_WEIGHTS[:len(legal_actions)])[0])
+
+        payouts = state.payouts()
+        won = [(state.chips[i] + payouts[i] - root_state.chips[i]) / state.big_blind
+               for i in range(state.num_seats)]
+        path[0].visits += 1
+        for parent, child in zip(path, path[1:]):
+            child.visits += 1
+            child.reward += won[parent.seat]
@@ -0,0 +1,216 @@
+"""
+#######################################################################################################################
+A vector environment that plays many independent tables in lockstep, for evaluating policies in bulk.
+
+Each call to step() takes one action for every table, as an array, and returns the observation of every table's next
+decision as one preallocated array. A policy is then a function from the observations to an array of actions, so it
+can decide for thousands of tables in one call, like the array versions of the computer playing styles below.
+#######################################################################################################################
+"""
+
+from __future__ import annotations
+
+import random
+
+import numpy as np
+
+from src.poker.enums.betting_move import BettingMove
+from src.poker.enums.computer_playing_style import ComputerPlayingStyle
+from src.poker.game import Game
+from src.poker.players.computer import Computer
+from src.poker.prompts.silent_prompt import SilentPresenter
+
+# Actions, which the game turns into the betting move that fits the current bet
+FOLD = 0
+CHECK_OR_CALL = 1
+BET_OR_RAISE = 2
+ALL_IN = 3
+NUM_ACTIONS = 4
+
+# Columns of an observation. Cards are numbers from Card.to_int(), or -1 if not dealt.
+OBS_HOLE = slice(0, 2)
+OBS_BOARD = slice(2, 7)
+OBS_POT = 7
+OBS_LAST_BET = 8
+OBS_RAISE_AMOUNT = 9
+OBS_NUM_TIMES_RAISED = 10
+OBS_BET = 11
+OBS_CHIPS = 12
+OBS_PHASE = 13
+OBS_SEAT = 14
+OBS_NUM_OPPONENTS = 15
+OBS_SIZE = 16
+
+
+def get_action(move: BettingMove) -> int:
+    """Returns the action of a betting move."""
+    if move is BettingMove.FOLDED:
+        return FOLD
+    if move is BettingMove.CHECKED or move is BettingMove.CALLED:
+        return CHECK_OR_CALL
+    if move is BettingMove.BET or move is BettingMove.RAISED:
+        return BET_OR_RAISE
+    return ALL_IN
+
+
+class VectorEnv:
+    """Plays a number of tables in lockstep, one decision per table per step.
+
+    A table whose hand ends starts its next hand in the same step. Players who run
+    out of chips buy back in for the starting chips, so every table keeps playing.
+
+    Args:
+        num_tables: The number of tables
+        num_players: The number of players at each table
+        starting_chips: The chips each player starts with, and buys back in for
+        big_blind: The big blind bet, which stays the same
+        seed: Seeds the shuffles, so that the deals can be repeated
+
+    Attributes:
+        games: The game played at each table
+        observations: The observation of the decision at each table, one row per table
+        legal_actions: Whether each action is legal at each table, one row per table
+        buy_ins: The number of times each player at each table has bought in
+    """
+
+    def __init__(self, num_tables: int, num_players: int = 6, starting_chips: int = 1000, big_blind: int = 20,
+                 seed: int | None = None):
+        if num_players < 2:
+            raise ValueError(f'A table needs at least 2 players, not {num_players}.')
+        self.starting_chips = starting_chips
+        rng = random.Random(seed)
+        presenter = SilentPresenter()
+        self.games: list[Game] = []
+        for _ in range(num_tables):
+            players = [Computer(f'Seat {seat + 1}', ComputerPlayingStyle.RANDOM) for seat in range(num_players)]
+            for player in players:
+                player.chips = starting_chips
+            game = Game(presenter=presenter, players=players, big_blind=big_blind)
+            game.deck.rng = random.Random(rng.getrandbits(64))
+            self.games.append(game)
+        self.observations = np.zeros((num_tables, OBS_SIZE), dtype=np.int64)
+        self.legal_actions = np.zeros((num_tables, NUM_ACTIONS), dtype=bool)
+        self.buy_ins = np.ones((num_tables, num_players), dtype=np.int64)
+
+    def reset(self) -> np.ndarray:
+        """Starts a new hand at every table and returns the observations of the first decisions."""
+        for i in range(len(self.games)):
+            self.start_hand(i)
+        return self.observations
+
+    def step(self, actions: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Makes one action at every table.
+
+        Args:
+            actions: The action of the player to act at each table
+
+        Returns:
+            The observations of the next decisions, and whether each table's hand ended
+        """
+        hands_over = np.zeros(len(self.games), dtype=bool)
+        for i, action in enumerate(actions.tolist()):
+            game = self.games[i]
+            game.step(self.get_move(game, action))
+            if game.is_terminal():
+                hands_over[i] = True
+                self.start_hand(i)
+            else:
+                self.observe(i)
+        return self.observations, hands_over
+
+    def get_move(self, game: Game, action: int) -> BettingMove:
+        """Returns the legal betting move of an action.
+
+        Raises:
+            ValueError: If the action is not legal
+        """
+        for move in game.legal_actions():
+            if get_action(move) == action:
+                return move
+        raise ValueError(f'Player {game.current_player().name} made an illegal action. '
+                         f'Cannot make action {action} when the legal moves are '
+                         f'{", ".join(move.name for move in game.legal_actions())}.')
+
+    def start_hand(self, i: int) -> None:
+        game = self.games[i]
+        # Hands can end before anyone acts, when the blinds put players all-in
+        while game.is_terminal():
+            for seat, player in enumerate(game.players):
+                if player.chips == 0:
+                    player.chips = self.starting_chips
+                    self.buy_ins[i, seat] += 1
+            game.reset()
+        self.observe(i)
+
+    def observe(self, i: int) -> None:
+        """Writes the observation and legal actions of the decision at table i."""
+        game = self.games[i]
+        player = game.current_player()
+        table = game.table
+        hole = [card.to_int() for card in player.hand] + [-1] * (2 - len(player.hand))
+        board = [card.to_int() for card in table.community] + [-1] * (5 - len(table.community))
+        pot = sum(pot[0] for pot in table.pots) + sum(other.bet for other in game.players)
+        num_opponents = sum(1 for other in game.players if other is not player and not other.is_folded)
+        self.observations[i] = (hole + board + [pot, table.last_bet, table.raise_amount, table.num_times_raised,
+                                                player.bet, player.chips, game.phase.value,
+                                                game.players.index(player), num_opponents])
+        self.legal_actions[i] = False
+        for move in game.legal_actions():
+            self.legal_actions[i, get_action(move)] = True
+
+    def chips_won(self) -> np.ndarray:
+        """Returns the chips each player at each table has won, net of their buy-ins."""
+        chips = np.array([[player.chips for player in game.players] for game in self.games], dtype=np.int64)
+        return chips - self.buy_ins * self.starting_chips
+
+
+# Situations a player can be in, which decide the choices of the simple playing styles
+_CANNOT_CALL = 0
+_CANNOT_RAISE = 1
+_CAN_CHECK = 2
+_CAN_CALL = 3
+_RAISES_CAPPED = 4
+
+# The actions of each situation, tried in order against one random number
+_SITUATION_ACTIONS = np.array([
+    [ALL_IN, FOLD, FOLD],
+    [CHECK_OR_CALL, ALL_IN, FOLD],
+    [CHECK_OR_CALL, BET_OR_RAISE, FOLD],
+    [CHECK_OR_CALL, BET_OR_RAISE, FOLD],
+    [CHECK_OR_CALL, FOLD, FOLD],
+])
+
+# For each playing style and situation, the random numbers up to which the first and second actions are chosen.
+# These are the probabilities of Computer.safe_play, risky_play, and random_play.
+STYLE_THRESHOLDS = {
+    ComputerPlayingStyle.SAFE: np.array([[.60, 1], [.60, .80], [.70, .90], [.70, .90], [.90, 1]]),
+    ComputerPlayingStyle.RISKY: np.array([[.90, 1], [.40, .90], [.40, .90], [.40, .90], [.90, 1]]),
+    ComputerPlayingStyle.RANDOM: np.array([[.50, 1], [.30, .66], [.33, .66], [.33, .66], [.66, 1]]),
+}
+
+
+def style_policy(style: ComputerPlayingStyle, observations: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Chooses an action at every table the way a computer player of a simple playing style would.
+
+    Args:
+        style: SAFE, RISKY, or RANDOM
+        observations: The observations from a VectorEnv
+        rng: Draws the random number behind each choice
+
+    Returns:
+        The action at each table
+    """
+    chips = observations[:, OBS_CHIPS]
+    bet = observations[:, OBS_BET]
+    last_bet = observations[:, OBS_LAST_BET]
+    situations = np.select(
+        [chips <= np.abs(bet - last_bet),
+         chips <= np.abs(bet - observations[:, OBS_RAISE_AMOUNT]),
+         observations[:, OBS_NUM_TIMES_RAISED] >= 4,
+         bet == last_bet],
+        [_CANNOT_CALL, _CANNOT_RAISE, _RAISES_CAPPED, _CAN_CHECK],
+        default=_CAN_CALL)
+    thresholds = STYLE_THRESHOLDS[style][situations]
+    x = rng.random(len(observations))
+    choice = (x > thresholds[:, 0]).astype(np.int64) + (x > thresholds[:, 1])
+    return _SITUATION_ACTIONS[situations, choice]
@@ -0,0 +1,87 @@
+import json
+import os
+import tempfile
+
+from src.poker.blind_schedule import BlindLevel, BlindSchedule
+from src.tests.test_utils.test_utils import PokerTestCase
+
+
+class MockClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestBlindLevel(PokerTestCase):
+
+    def test_value_error_when_level_has_hands_and_seconds(self):
+        with self.assertRaises(ValueError):
+            BlindLevel(10, 20, hands=5, seconds=60)
+
+    def test_value_error_when_small_blind_greater_than_big_blind(self):
+        with self.assertRaises(ValueError):
+            BlindLevel(30, 20)
+
+    def test_from_dict_defaults_small_blind_to_half_big_blind(self):
+        level = BlindLevel.from_dict({'big_blind': 100, 'hands': 3})
+
+        self.assertEqual(50, level.small_blind)
+        self.assertEqual(0, level.ante)
+        self.assertEqual(3, level.hands)
+
+
+class TestBlindScheduleAdvance(PokerTestCase):
+
+    def test_advance_hand_based_levels(self):
+        schedule = BlindSchedule([BlindLevel(10, 20, hands=2),
+                                  BlindLevel(20, 40, ante=5, hands=3),
+                                  BlindLevel(50, 100)])
+
+        self.assertEqual(20, schedule.advance(0).big_blind)
+        self.assertEqual(20, schedule.advance(1).big_blind)
+        self.assertEqual(40, schedule.advance(2).big_blind)
+        self.assertEqual(5, schedule.advance(4).ante)
+        self.assertEqual(100, schedule.advance(5).big_blind)
+        self.assertEqual(100, schedule.advance(500).big_blind)
+
+    def test_advance_time_based_levels(self):
+        clock = MockClock()
+        schedule = BlindSchedule([BlindLevel(10, 20, seconds=60),
+                                  BlindLevel(20, 40, seconds=60),
+                                  BlindLevel(50, 100)], clock=clock)
+
+        self.assertEqual(20, schedule.advance(0).big_blind)
+        clock.now = 59
+        self.assertEqual(20, schedule.advance(10).big_blind)
+        clock.now = 61
+        self.assertEqual(40, schedule.advance(11).big_blind)
+        clock.now = 125
+        self.assertEqual(100, schedule.advance(12).big_blind)
+
+    def test_advance_is_shared_across_tables(self):
+        schedule = BlindSchedule([BlindLevel(10, 20, hands=3), BlindLevel(20, 40)])
+
+        schedule.advance(3)
+
+        # A slower table still plays at the level of the busiest table
+        self.assertEqual(40, schedule.advance(1).big_blind)
+
+
+class TestBlindScheduleFromFile(PokerTestCase):
+
+    def test_from_file(self):
+        levels = {'levels': [{'small_blind': 5, 'big_blind': 10, 'hands': 4},
+                             {'small_blind': 10, 'big_blind': 20, 'ante': 2, 'seconds': 300}]}
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'blinds.json')
+            with open(path, 'w') as file:
+                json.dump(levels, file)
+
+            schedule = BlindSchedule.from_file(path)
+
+        self.assertEqual(2, len(schedule.levels))
+        self.assertEqual(10, schedule.levels[0].big_blind)
+        self.assertEqual(300, schedule.levels[1].seconds)
+        self.assertEqual(2, schedule.levels[1].ante)
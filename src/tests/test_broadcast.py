@@ -0,0 +1,72 @@
+from src.poker.broadcast import TableBroadcaster, TableReplica, table_fields
+from src.poker.players.remote import RemotePlayer
+from src.poker.table import Table
+from src.tests.test_utils.test_utils import PokerTestCase, cards_from_str
+
+
+class Recorder:
+    def __init__(self):
+        self.lines = []
+
+    def send_line(self, data):
+        self.lines.append(data)
+
+
+class TestBroadcast(PokerTestCase):
+
+    def test_delta_holds_only_changes(self):
+        broadcaster = TableBroadcaster()
+        broadcaster.update({'board': '-', 'pots': '30', 'chips0': '980', 'chips1': '990'})
+
+        self.assertEqual(b'DELTA 2 board=2H,3H,4H chips1=970\n',
+                         broadcaster.update({'board': '2H,3H,4H', 'pots': '30', 'chips0': '980', 'chips1': '970'}))
+        self.assertIsNone(broadcaster.update({'board': '2H,3H,4H', 'pots': '30', 'chips0': '980', 'chips1': '970'}))
+        self.assertEqual(b'DELTA 3 chips1\n', broadcaster.update({'board': '2H,3H,4H', 'pots': '30', 'chips0': '980'}))
+
+    def test_subscribers_share_lines(self):
+        broadcaster = TableBroadcaster()
+        early, late = Recorder(), Recorder()
+        broadcaster.subscribe(early)
+        broadcaster.update({'pots': '-', 'flags0': 'D'})
+        broadcaster.update({'pots': '30', 'flags0': 'D'})
+        broadcaster.subscribe(late)
+        broadcaster.update({'pots': '60', 'flags0': ''})
+
+        self.assertEqual([b'KEYFRAME 0\n', b'DELTA 1 pots=- flags0=D\n', b'DELTA 2 pots=30\n',
+                          b'DELTA 3 pots=60 flags0=\n'], early.lines)
+        self.assertEqual([b'KEYFRAME 2 pots=30 flags0=D\n', b'DELTA 3 pots=60 flags0=\n'], late.lines)
+        self.assertIs(early.lines[-1], late.lines[-1])
+
+    def test_replica_follows_broadcaster(self):
+        players = [RemotePlayer('Lenny'), RemotePlayer('Carl')]
+        for player in players:
+            player.chips = 1000
+        players[0].is_dealer = True
+        table = Table()
+        broadcaster = TableBroadcaster()
+        replica = TableReplica()
+        broadcaster.update(table_fields(players, table))
+        broadcaster.subscribe(replica)
+
+        players[1].chips, players[1].bet = 980, 20
+        table.pots = [[20, players]]
+        broadcaster.update(table_fields(players, table))
+        table.community = cards_from_str('2H 3H 4H')
+        players[0].is_folded = True
+        broadcaster.update(table_fields(players, table))
+
+        self.assertEqual(broadcaster.fields, replica.fields)
+        self.assertEqual('2H,3H,4H', replica.fields['board'])
+        self.assertEqual([('Lenny', 1000, 0, 'DF'), ('Carl', 980, 20, '')], replica.players())
+
+    def test_replica_needs_keyframe_after_missed_delta(self):
+        replica = TableReplica()
+
+        self.assertFalse(replica.apply('ACTION Lenny CALLED 20'))
+        with self.assertRaises(ValueError):
+            replica.apply('DELTA 4 pots=30')
+        self.assertTrue(replica.apply('KEYFRAME 4 pots=30 board=-'))
+        with self.assertRaises(ValueError):
+            replica.apply('DELTA 6 pots=60')
+        self.assertTrue(replica.apply('DELTA 5 pots=60 board'))
+        self.assertEqual({'pots': '60'}, replica.fields)
@@ -0,0 +1,91 @@
+import random
+import tempfile
+
+import numpy as np
+
+from src.poker.utils.buckets import (BucketTables, board_rank, cluster, compute_features, equity_histograms,
+                                     index_boards, kmeans, open_features)
+from src.poker.utils.canonical import RELABELINGS
+from src.poker.utils.cfr import HAND_INDEX, river_equities, valid_hands
+from src.tests.test_utils.test_utils import PokerTestCase
+
+
+class TestBuckets(PokerTestCase):
+
+    def test_index_boards(self):
+        boards, rows, relabelings = index_boards(3)
+        rng = random.Random(0)
+
+        self.assertEqual(1755, len(boards))
+        for _ in range(100):
+            board = rng.sample(range(52), 3)
+            rank = board_rank(board)
+            relabeled = sorted(RELABELINGS[relabelings[rank]][card] for card in board)
+            self.assertEqual(boards[rows[rank]].tolist(), relabeled)
+
+    def test_equity_histograms(self):
+        board = [0, 13, 26, 40]
+        hand = [5, 50]
+
+        histograms = equity_histograms(board, lambda river_boards: river_equities(river_boards.tolist()), 10)
+
+        equities = [river_equities([board + [card]])[0][HAND_INDEX[5, 50]] for card in range(52)
+                    if card not in board + hand]
+        expected = np.bincount(np.minimum((np.array(equities) * 10).astype(int), 9), minlength=10) / len(equities)
+        self.assertTrue(np.allclose(expected, histograms[HAND_INDEX[5, 50]]))
+        self.assertTrue(np.allclose(valid_hands(board), histograms.sum(axis=1)))
+
+    def test_kmeans(self):
+        rng = np.random.default_rng(0)
+        means = np.array([[0, 0], [10, 0], [0, 10]])
+        points = np.concatenate([mean + rng.normal(size=(100, 2)) for mean in means])
+
+        centers = kmeans(points, 3, rng=rng)
+
+        for mean in means:
+            self.assertLess(np.abs(centers - mean).sum(axis=1).min(), 0.5)
+
+    def test_compute_needs_river_first(self):
+        with tempfile.TemporaryDirectory() as path:
+            with self.assertRaises(ValueError):
+                compute_features(path, 'flop')
+
+    def test_cluster_and_look_up(self):
+        rng = random.Random(0)
+        river_boards = [rng.sample(range(52), 5) for _ in range(300)]
+        equities = river_equities(river_boards)
+        valid = np.array([valid_hands(board) for board in river_boards])
+        with tempfile.TemporaryDirectory() as path:
+            features, done = open_features(path, 'preflop', 10)
+            for index in range(10):
+                features[0, :, index] = (valid & (np.minimum(equities * 10, 9).astype(int) == index)).sum(axis=0)
+            features[0] /= valid.sum(axis=0)[:, None]
+            done[:] = True
+            features.flush()
+            done.flush()
+
+            cluster(path, 'preflop', num_buckets=8, max_points=5000)
+            tables = BucketTables(path)
+
+            self.assertEqual({'preflop': 8}, tables.num_buckets)
+            # Pocket aces, the same in any suits, are in a higher bucket than 7 2 offsuit
+            self.assertEqual(tables.bucket([48, 49], []), tables.bucket([50, 51], []))
+            self.assertGreater(tables.bucket([48, 49], []), tables.bucket([20, 1], []))
+            self.assertEqual(tables.bucket([20, 1], []), tables.bucket_hands([], 8)[HAND_INDEX[1, 20]])
+            with self.assertRaises(ValueError):
+                tables.bucket_hands([], 10)
+            with self.assertRaises(ValueError):
+                tables.bucket([48, 49], [0, 1, 2])
+
+    def test_subgame_num_buckets(self):
+        with tempfile.TemporaryDirectory() as path:
+            tables = BucketTables(path)
+            tables.num_buckets = {'turn': 50, 'river': 50}
+
+            self.assertEqual(50, tables.subgame_num_buckets(4))
+            self.assertEqual(50, tables.subgame_num_buckets(5))
+            with self.assertRaises(ValueError):
+                tables.subgame_num_buckets(3)
+            tables.num_buckets['river'] = 20
+            with self.assertRaises(ValueError):
+                tables.subgame_num_buckets(4)
@@ -0,0 +1,45 @@
+from src.poker.utils.canonical import canonical_key, cards_from_key, iter_canonical_keys, preflop_class
+from src.tests.test_utils.test_utils import PokerTestCase, cards_from_str
+
+
+class TestCanonicalKey(PokerTestCase):
+
+    def test_suit_relabeling_has_same_key(self):
+        key = canonical_key(cards_from_str('AH KH'), cards_from_str('QH 7S 2D'))
+
+        self.assertEqual(key, canonical_key(cards_from_str('AS KS'), cards_from_str('QS 7C 2H')))
+
+    def test_card_order_has_same_key(self):
+        key = canonical_key(cards_from_str('AH KH'), cards_from_str('QH 7S 2D'))
+
+        self.assertEqual(key, canonical_key(cards_from_str('KH AH'), cards_from_str('2D QH 7S')))
+
+    def test_suited_and_offsuit_have_different_keys(self):
+        self.assertNotEqual(canonical_key(cards_from_str('AH KH')), canonical_key(cards_from_str('AH KS')))
+
+    def test_hole_and_community_are_not_interchangeable(self):
+        key = canonical_key(cards_from_str('AH KH'), cards_from_str('QH 7S 2D'))
+
+        self.assertNotEqual(key, canonical_key(cards_from_str('AH QH'), cards_from_str('KH 7S 2D')))
+
+    def test_cards_from_key_round_trips(self):
+        key = canonical_key(cards_from_str('9C 9D'), cards_from_str('AS 10S 4S'))
+
+        self.assertEqual(key, canonical_key(*cards_from_key(key)))
+
+    def test_preflop_has_169_classes(self):
+        keys = list(iter_canonical_keys(2, 0))
+
+        self.assertEqual(169, len(keys))
+        self.assertEqual(169, len({preflop_class(cards_from_key(key)[0]) for key in keys}))
+
+    def test_flop_has_1755_classes(self):
+        self.assertEqual(1755, len(list(iter_canonical_keys(0, 3))))
+
+
+class TestPreflopClass(PokerTestCase):
+
+    def test_preflop_class(self):
+        self.assertEqual('AKs', preflop_class(cards_from_str('KH AH')))
+        self.assertEqual('T9o', preflop_class(cards_from_str('10D 9C')))
+        self.assertEqual('QQ', preflop_class(cards_from_str('QH QS')))
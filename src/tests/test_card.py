@@ -1,3 +1,6 @@
+import subprocess
+import sys
+
 from src.poker.card import Card
 from src.tests.test_utils.test_utils import PokerTestCase
 
@@ -60,3 +63,20 @@ class TestCard(PokerTestCase):
         card_a = Card(2, 'D')
         card_b = Card(9, 'C')
         self.assertNotEqual(card_a, card_b)
+
+    def test_to_int_round_trips(self):
+        numbers = [Card(rank, suit).to_int() for rank in range(2, 15) for suit in 'CDHS']
+
+        self.assertEqual(list(range(52)), numbers)
+        self.assertEqual(Card(12, 'H'), Card.from_int(Card(12, 'H').to_int()))
+
+    def test_str_is_plain_text(self):
+        self.assertEqual('[A ♠]', str(Card(14, 'S')))
+
+    def test_importing_engine_does_not_set_up_terminal(self):
+        code = ('import sys; import src.poker.game, src.poker.utils.hand_ranking_utils; '
+                'print("blessed" in sys.modules)')
+
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+
+        self.assertEqual('False', result.stdout.strip())
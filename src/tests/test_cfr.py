@@ -0,0 +1,184 @@
+import os
+import random
+import tempfile
+
+import numpy as np
+
+from src.poker.card import Card
+from src.poker.enums.betting_move import BettingMove
+from src.poker.enums.computer_playing_style import ComputerPlayingStyle
+from src.poker.enums.phase import Phase
+from src.poker.game import Game
+from src.poker.players.computer import Computer
+from src.poker.prompts.silent_prompt import SilentPresenter
+from src.poker.utils.cfr import (CHANCE, DECISION, HAND_INDEX, HANDS, Showdown, StrategyTable, SubgameSolver,
+                                 SubgameTree, hand_strengths, river_cards, solve_boards, valid_hands)
+from src.poker.utils.lookup_tables import get_tables
+from src.tests.test_utils.test_utils import PokerTestCase
+
+
+def play_to_river(game: Game) -> None:
+    while game.phase is not Phase.RIVER:
+        game.step(game.legal_actions()[0])
+
+
+class TestSubgameTree(PokerTestCase):
+
+    def test_river_tree_mirrors_game(self):
+        tree = SubgameTree(5, pot=80, last_bet=20, big_blind=20, num_buckets=10)
+        rng = random.Random(0)
+        for _ in range(20):
+            players = [Computer(name, ComputerPlayingStyle.SAFE) for name in ['Homer', 'Bart']]
+            for player in players:
+                player.chips = 1000
+            game = Game(presenter=SilentPresenter(), players=players, big_blind=20)
+            game.reset()
+            play_to_river(game)
+            moves = []
+            while not game.is_terminal():
+                node = tree.nodes[tree.find_node(moves)]
+                self.assertEqual(DECISION, node.kind)
+                self.assertEqual(game.legal_actions(), node.moves)
+                moves.append(rng.choice(node.moves))
+                game.step(moves[-1])
+            self.assertNotEqual(DECISION, tree.nodes[tree.find_node(moves)].kind)
+
+    def test_turn_tree_deals_river(self):
+        tree = SubgameTree(4, pot=80, last_bet=20, big_blind=20, num_buckets=10)
+
+        node_id = tree.find_node([BettingMove.CALLED, BettingMove.CALLED])
+
+        self.assertTrue(any(node.kind == CHANCE for node in tree.nodes))
+        self.assertEqual(1, tree.nodes[node_id].street)
+        self.assertEqual([1, 48], tree.batch_sizes)
+
+
+class TestShowdown(PokerTestCase):
+
+    def test_hand_strengths_match_lookup_tables(self):
+        tables = get_tables()
+        # A flush board, and one without a flush
+        for board in [[0, 8, 20, 32, 49], [2, 7, 12, 17, 30]]:
+            strengths = hand_strengths(board)
+            for hand, valid in zip(HANDS.tolist(), valid_hands(board)):
+                expected = tables.hand_strength([*hand, *board]) if valid else 0
+                self.assertEqual(expected, strengths[HAND_INDEX[hand[0], hand[1]]])
+
+    def test_evaluate_leaves_out_blocked_hands(self):
+        board = [0, 9, 22, 35, 51]
+        strengths = hand_strengths(board)
+        valid = valid_hands(board)
+        reach = np.random.default_rng(0).random(len(HANDS)) * valid
+
+        beaten, beating = Showdown(strengths[None]).evaluate(reach[None])
+
+        for hand in [100, 500, 1000]:
+            unblocked = valid & ~np.isin(HANDS, HANDS[hand]).any(axis=1)
+            self.assertAlmostEqual((reach * unblocked * (strengths < strengths[hand])).sum(), beaten[0, hand])
+            self.assertAlmostEqual((reach * unblocked * (strengths > strengths[hand])).sum(), beating[0, hand])
+
+
+class TestSubgameSolver(PokerTestCase):
+
+    def test_river_exploitability_falls(self):
+        solver = SubgameSolver([0, 9, 22, 35, 51], pot=80, last_bet=20, big_blind=20, num_buckets=5)
+        solver.solve(2)
+        start = solver.exploitability()
+
+        solver.solve(100)
+
+        self.assertGreaterEqual(solver.exploitability(), 0)
+        self.assertLess(solver.exploitability(), start / 5)
+
+    def test_deal_river_leaves_out_the_hand_own_cards(self):
+        board = [0, 9, 22, 35]
+        solver = SubgameSolver(board, pot=80, last_bet=20, big_blind=20, num_buckets=3)
+        values = np.random.default_rng(0).random((48, len(HANDS)))
+
+        dealt = solver.deal_river(values)[0]
+
+        for hand in random.Random(0).sample(range(len(HANDS)), 100):
+            if set(HANDS[hand]) & set(board):
+                continue
+            expected = sum(values[i, hand] for i, card in enumerate(river_cards(board)) if card not in HANDS[hand])
+            self.assertAlmostEqual(expected / 44, dealt[hand])
+
+    def test_average_strategy_sums_to_one(self):
+        solver = SubgameSolver([0, 9, 22, 35, 51], pot=80, last_bet=20, big_blind=20, num_buckets=5)
+        solver.solve(10)
+
+        strategy = solver.average_strategy()
+
+        self.assertTrue(np.allclose(1, strategy.sum(axis=1)))
+
+
+class TestStrategyTable(PokerTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, 'river.db')
+        solve_boards(cls.path, 'river', num_boards=2, iterations=20, num_buckets=5, processes=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_solve_boards_skips_solved_boards(self):
+        self.assertEqual(0, solve_boards(self.path, 'river', num_boards=2, iterations=20, num_buckets=5,
+                                         processes=1))
+        self.assertEqual(2, len(StrategyTable(self.path, read_only=True)))
+
+    def test_other_settings_raise(self):
+        with self.assertRaises(ValueError):
+            solve_boards(self.path, 'river', num_boards=2, num_buckets=8, processes=1)
+
+    def test_bucket_tables_without_the_buckets_raise_before_solving(self):
+        path = os.path.join(self.directory.name, 'unsolved.db')
+        with tempfile.TemporaryDirectory() as bucket_path:
+            # Holds no river buckets at all
+            with self.assertRaises(ValueError):
+                solve_boards(path, 'river', num_boards=2, processes=1, bucket_tables=bucket_path)
+
+        self.assertFalse(os.path.exists(path))
+
+    def test_suit_relabeling_has_same_strategy(self):
+        table = StrategyTable(self.path, read_only=True)
+        board = list(next(iter(table.solved_boards())))
+        hole = [card for card in range(52) if card not in board][:2]
+        # Swap clubs and spades
+        swap = [card ^ 3 if card % 4 in (0, 3) else card for card in range(52)]
+
+        probabilities = table.move_probabilities(board, hole, [])
+        swapped = table.move_probabilities([swap[card] for card in board], [swap[card] for card in hole], [])
+
+        self.assertEqual([BettingMove.CALLED, BettingMove.RAISED, BettingMove.FOLDED], list(probabilities))
+        self.assertAlmostEqual(1, sum(probabilities.values()), delta=0.01)
+        self.assertEqual(probabilities, swapped)
+        self.assertIsNone(table.move_probabilities([0, 1, 2, 3, 4], hole, []))
+
+    def test_solved_computer_looks_up_river(self):
+        table = StrategyTable(self.path, read_only=True)
+        board = list(next(iter(table.solved_boards())))
+        players = [Computer(name, ComputerPlayingStyle.SOLVED) for name in ['Homer', 'Bart']]
+        for player in players:
+            player.chips = 1000
+            player.strategy_tables = [table]
+        game = Game(presenter=SilentPresenter(), players=players, big_blind=20)
+        game.reset()
+        # Deal the solved board, burning a card before each street
+        others = [Card.from_int(card) for card in range(52) if card not in board]
+        players[0].hand, players[1].hand = others[:2], others[2:4]
+        burned = others[4:7]
+        game.deck.cards = others[7:] + [Card.from_int(board[4]), burned[0], Card.from_int(board[3]), burned[1],
+                                        *(Card.from_int(card) for card in reversed(board[:3])), burned[2]]
+
+        self.assertIsNone(game.current_player().get_solved_strategy())
+        play_to_river(game)
+
+        self.assertEqual(board, [card.to_int() for card in game.table.community])
+        probabilities = game.current_player().get_solved_strategy()
+        self.assertEqual(game.legal_actions(), list(probabilities))
+        move = game.current_player().choose_next_move(game.table.raise_amount, game.table.num_times_raised,
+                                                      game.table.last_bet)
+        self.assertIn(move, game.legal_actions())
@@ -1,3 +1,4 @@
+import random
 from collections import Counter
 
 from src.poker.card import Card
@@ -26,6 +27,15 @@ class TestDeck(PokerTestCase):
         self.assertEqual(52, len(deck.cards))
         self.assertEqual(52, len(set(deck.cards)))
 
+    def test_refill_short_deck(self):
+        deck = Deck(lowest_rank=6)
+        deck.cards = []
+
+        deck.refill()
+
+        self.assertEqual(36, len(set(deck.cards)))
+        self.assertEqual(6, min(card.rank_value for card in deck.cards))
+
     def test_shuffle(self):
         deck = Deck()
         cards_before = deck.cards.copy()
@@ -39,6 +49,15 @@ class TestDeck(PokerTestCase):
                 differences += 1
         self.assertGreater(differences, 0)
 
+    def test_shuffle_with_seeded_rng_is_repeatable(self):
+        deck_a = Deck(random.Random(7))
+        deck_b = Deck(random.Random(7))
+
+        deck_a.shuffle()
+        deck_b.shuffle()
+
+        self.assertListEqual(deck_a.cards, deck_b.cards)
+
     def test_burn(self):
         deck = Deck()
 
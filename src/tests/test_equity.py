@@ -0,0 +1,142 @@
+import os
+import random
+import sqlite3
+import tempfile
+
+from src.poker.enums.betting_move import BettingMove
+from src.poker.enums.computer_playing_style import ComputerPlayingStyle
+from src.poker.game import Game
+from src.poker.players.computer import Computer
+from src.poker.prompts.silent_prompt import SilentPresenter
+from src.poker.utils.canonical import canonical_key
+from src.poker.utils.equity import (EquityCache, EquityCalculator, all_in_equities, calculate_equity, fill_cache,
+                                    score_runouts)
+from src.poker.utils.lookup_tables import get_tables
+from src.tests.test_utils.test_utils import PokerTestCase, cards_from_str
+
+
+class TestCalculateEquity(PokerTestCase):
+
+    def test_pocket_aces_heads_up(self):
+        equity = calculate_equity(cards_from_str('AH AD'), [], 1, 5000, random.Random(1))
+
+        self.assertAlmostEqual(0.85, equity, delta=0.02)
+
+    def test_nuts_on_the_river_always_wins(self):
+        equity = calculate_equity(cards_from_str('AS KS'), cards_from_str('QS JS 10S 2D 3C'), 3, 200)
+
+        self.assertEqual(1.0, equity)
+
+    def test_board_plays_splits_pot(self):
+        equity = calculate_equity(cards_from_str('2C 3D'), cards_from_str('AS KS QS JS 10S'), 1, 200)
+
+        self.assertEqual(0.5, equity)
+
+    def test_no_opponents_raises(self):
+        with self.assertRaises(ValueError):
+            calculate_equity(cards_from_str('AH AD'), [], 0)
+
+
+class TestScoreRunouts(PokerTestCase):
+
+    def test_matches_scoring_each_board(self):
+        rng = random.Random(49)
+        tables = get_tables()
+        for num_dealt in [0, 3, 4]:
+            cards = rng.sample(range(52), 6 + num_dealt + 10)
+            holes, community, rest = [cards[0:2], cards[2:4], cards[4:6]], cards[6:6 + num_dealt], cards[6 + num_dealt:]
+            runouts = [rng.sample(rest, 5 - num_dealt) for _ in range(20)]
+
+            strengths = score_runouts(holes, community, runouts)
+
+            for runout, board_strengths in zip(runouts, strengths):
+                self.assertEqual([tables.hand_strength(hole + community + runout) for hole in holes], board_strengths)
+
+    def test_all_in_equities_enumerates_the_river(self):
+        aces, kings = [[card.to_int() for card in cards_from_str(hole)] for hole in ['AS AH', 'KS KH']]
+        community = [card.to_int() for card in cards_from_str('2C 7D 9S 3H')]
+        unseen = [card for card in range(52) if card not in aces + kings + community]
+
+        # Only the 2 kings left in the deck win it for the kings
+        self.assertEqual([(42 / 44, 0), (2 / 44, 0)], all_in_equities([aces, kings], community, unseen))
+
+
+class TestEquityCache(PokerTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'equity.db')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_put_and_get(self):
+        key = canonical_key(cards_from_str('AH KH'), cards_from_str('QH 7S 2D'))
+        cache = EquityCache(self.path)
+        cache.put_many([(key, 2, 0.42, 1000)])
+        cache.close()
+
+        cache = EquityCache(self.path, read_only=True)
+
+        self.assertEqual(0.42, cache.get(key, 2))
+        self.assertIsNone(cache.get(key, 3))
+        cache.close()
+
+    def test_read_only_cannot_write(self):
+        EquityCache(self.path).close()
+        cache = EquityCache(self.path, read_only=True)
+
+        with self.assertRaises(sqlite3.OperationalError):
+            cache.put_many([(canonical_key(cards_from_str('AH KH')), 1, 0.5, 1)])
+        cache.close()
+
+    def test_calculator_uses_cache_for_every_suit_relabeling(self):
+        cache = EquityCache(self.path)
+        cache.put_many([(canonical_key(cards_from_str('AH KH')), 1, 0.66, 1000)])
+        calculator = EquityCalculator(cache)
+
+        self.assertEqual(0.66, calculator.equity(cards_from_str('AS KS'), [], 1))
+        self.assertEqual(0, calculator.misses)
+        cache.close()
+
+    def test_fill_cache_every_preflop_class_once(self):
+        num_added = fill_cache(self.path, ['preflop'], [1], num_samples=5, processes=2)
+        num_added_again = fill_cache(self.path, ['preflop'], [1], num_samples=5, processes=2)
+
+        cache = EquityCache(self.path, read_only=True)
+        self.assertEqual(169, num_added)
+        self.assertEqual(0, num_added_again)
+        self.assertEqual(169, len(cache))
+        cache.close()
+
+
+class TestCalculatedPlay(PokerTestCase):
+
+    def setUp(self):
+        self.computer = Computer('Homer', ComputerPlayingStyle.CALCULATED)
+        self.opponent = Computer('Bart', ComputerPlayingStyle.SAFE)
+        for player in [self.computer, self.opponent]:
+            player.chips = 1000
+        self.game = Game(presenter=SilentPresenter(), players=[self.computer, self.opponent], big_blind=20)
+        self.game.table.reset(self.game.players)
+
+    def deal(self, hole, opponent_hole, community):
+        for player, cards in [(self.computer, hole), (self.opponent, opponent_hole)]:
+            for card in cards_from_str(cards):
+                player.hand.append(card)
+                player.hand_evaluator.add(card)
+        self.game.add_to_community(cards_from_str(community))
+
+    def test_bets_the_nuts(self):
+        self.deal('AS KS', '2D 3C', 'QS JS 10S')
+
+        self.assertIs(BettingMove.BET, self.computer.choose_next_move(40, 0, 0))
+
+    def test_folds_dead_hand_to_bet(self):
+        self.deal('2D 3C', 'AS KS', 'QS JS 10S 9H 9D')
+        self.opponent.match_bet(100)
+
+        self.assertIs(BettingMove.FOLDED, self.computer.choose_next_move(140, 1, 100))
+
+    def test_seated_computer_knows_its_game(self):
+        self.assertIs(self.game, self.computer.game)
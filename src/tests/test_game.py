@@ -0,0 +1,137 @@
+import random
+
+from src.poker.blind_schedule import BlindLevel, BlindSchedule
+from src.poker.enums.betting_move import BettingMove
+from src.poker.enums.computer_playing_style import ComputerPlayingStyle
+from src.poker.enums.phase import Phase
+from src.poker.game import Game
+from src.poker.players.computer import Computer
+from src.poker.prompts.silent_prompt import SilentPresenter
+from src.tests.test_utils.test_utils import PokerTestCase
+
+
+class EquityRecordingPresenter(SilentPresenter):
+
+    def __init__(self):
+        self.shown = []
+
+    def show_all_in_equities(self, players, equities, time):
+        self.shown.append((len(self.game.table.community), dict(zip(players, equities))))
+
+
+class TestGameSteps(PokerTestCase):
+
+    def setUp(self):
+        self.players = [Computer(name, ComputerPlayingStyle.SAFE) for name in ['Homer', 'Bart', 'Lisa']]
+        for player in self.players:
+            player.chips = 1000
+        self.game = Game(presenter=SilentPresenter(), players=self.players, big_blind=20)
+
+    def test_reset_stops_at_first_decision(self):
+        self.game.reset()
+
+        self.assertFalse(self.game.is_terminal())
+        self.assertIs(Phase.PREFLOP, self.game.phase)
+        self.assertIn(self.game.current_player(), self.players)
+        self.assertEqual(30, sum(1000 - player.chips for player in self.players))
+
+    def test_legal_actions_facing_big_blind(self):
+        self.game.reset()
+
+        self.assertEqual([BettingMove.CALLED, BettingMove.RAISED, BettingMove.FOLDED], self.game.legal_actions())
+
+    def test_legal_actions_short_stack(self):
+        self.game.reset()
+        self.game.current_player().chips = 5
+
+        self.assertEqual([BettingMove.ALL_IN, BettingMove.FOLDED], self.game.legal_actions())
+
+    def test_step_illegal_move_raises(self):
+        self.game.reset()
+
+        with self.assertRaises(ValueError):
+            self.game.step(BettingMove.BET)
+
+    def test_everyone_folds_to_big_blind(self):
+        self.game.reset()
+        self.game.step(BettingMove.FOLDED)
+        self.game.step(BettingMove.FOLDED)
+
+        self.assertTrue(self.game.is_terminal())
+        self.assertIsNone(self.game.current_player())
+        self.assertEqual([], self.game.legal_actions())
+        self.assertEqual(3000, sum(player.chips for player in self.players))
+        self.assertEqual(1, self.game.table.hands_played)
+        with self.assertRaises(ValueError):
+            self.game.step(BettingMove.FOLDED)
+
+    def test_check_down_to_showdown(self):
+        self.game.reset()
+        phases = set()
+        while not self.game.is_terminal():
+            phases.add(self.game.phase)
+            self.game.step(self.game.legal_actions()[0])
+
+        self.assertEqual(set(Phase), phases)
+        self.assertEqual(5, len(self.game.table.community))
+        self.assertEqual(3000, sum(player.chips for player in self.players))
+
+    def test_all_in_runs_out_the_board(self):
+        self.players[0].chips = 30
+        self.game.reset()
+        while not self.game.is_terminal():
+            legal_actions = self.game.legal_actions()
+            self.game.step(BettingMove.ALL_IN if BettingMove.ALL_IN in legal_actions else legal_actions[0])
+
+        self.assertEqual(5, len(self.game.table.community))
+        self.assertEqual(2030, sum(player.chips for player in self.players))
+
+    def test_shows_equities_before_each_card_dealt_to_all_in_players(self):
+        self.players[0].chips = 30
+        self.players[1].chips = 35
+        self.game.presenter = presenter = EquityRecordingPresenter()
+        presenter.game = self.game
+        self.game.live_equities = True
+        self.game.reset()
+        while not self.game.is_terminal():
+            legal_actions = self.game.legal_actions()
+            self.game.step(BettingMove.ALL_IN if BettingMove.ALL_IN in legal_actions else legal_actions[0])
+
+        self.assertEqual([0, 1, 2, 3, 4], [num_dealt for num_dealt, _ in presenter.shown])
+        for _, equities in presenter.shown:
+            self.assertEqual(set(self.players), set(equities))
+            self.assertLessEqual(sum(win for win, _ in equities.values()), 1)
+        # Every one of the 42 unseen river cards was counted, and the best hand at the showdown had a chance to win
+        for win, tie in presenter.shown[-1][1].values():
+            self.assertAlmostEqual(round(win * 42), win * 42)
+        best = max(self.players, key=lambda player: player.best_hand_score)
+        self.assertGreater(sum(presenter.shown[-1][1][best]), 0)
+
+    def test_all_in_on_the_ante_wins_at_most_the_antes(self):
+        for seed in range(10):
+            players = [Computer(name, ComputerPlayingStyle.SAFE) for name in ['Homer', 'Bart', 'Lisa']]
+            for player, chips in zip(players, [3, 1000, 1000]):
+                player.chips = chips
+            game = Game(BlindSchedule([BlindLevel(10, 20, ante=5)]), presenter=SilentPresenter(), players=players)
+            game.deck.rng = random.Random(seed)
+            game.reset()
+            while not game.is_terminal():
+                game.step(game.legal_actions()[0])
+
+            self.assertLessEqual(players[0].chips, 9)
+            self.assertEqual(2003, sum(player.chips for player in players))
+
+    def test_run_it_multiple_times_splits_pots(self):
+        self.players[0].chips = 30
+        self.players[1].chips = 35
+        self.game.deck.rng = random.Random(0)
+        self.game.run_it_times = 100
+        self.game.reset()
+        while not self.game.is_terminal():
+            legal_actions = self.game.legal_actions()
+            self.game.step(BettingMove.ALL_IN if BettingMove.ALL_IN in legal_actions else legal_actions[0])
+
+        self.assertEqual(5, len(self.game.table.community))
+        # Homer is all-in for the 90 chip main pot, and wins some but not all of it
+        self.assertTrue(0 < self.players[0].chips < 90)
+        self.assertEqual(1065, sum(player.chips for player in self.players))
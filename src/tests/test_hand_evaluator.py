@@ -0,0 +1,85 @@
+import random
+from itertools import combinations
+
+from src.poker.card import Card
+from src.poker.deck import Deck
+from src.poker.utils import hand_ranking_utils
+from src.poker.utils.hand_evaluator import HandEvaluator, make_score, FLUSH, FULL_HOUSE, STRAIGHT, TWO_PAIR
+from src.tests.test_utils.test_utils import PokerTestCase, cards_from_str
+
+
+class TestHandEvaluatorScore(PokerTestCase):
+
+    def test_score_matches_score_hand(self):
+        rng = random.Random(52)
+        for n in [5, 6, 7] * 300:
+            deck = Deck()
+            rng.shuffle(deck.cards)
+            cards = deck.deal(n)
+
+            expected = max(hand_ranking_utils.score_hand(combo) for combo in combinations(cards, 5))
+
+            self.assertEqual(expected, HandEvaluator(cards).score())
+
+    def test_score_royal_flush(self):
+        evaluator = HandEvaluator(cards_from_str('AS KS QS JS 10S 2D 2C'))
+
+        self.assertEqual(100000000000, evaluator.score())
+
+    def test_score_straight_flush_beats_flush(self):
+        evaluator = HandEvaluator(cards_from_str('9S 8S 7S 6S 5S AS 2D'))
+
+        self.assertEqual(90900000000, evaluator.score())
+
+    def test_score_four_of_a_kind_with_best_kicker(self):
+        evaluator = HandEvaluator(cards_from_str('7S 7D 7H 7C KD KS 2D'))
+
+        self.assertEqual(80713000000, evaluator.score())
+
+    def test_score_full_house_from_two_triples(self):
+        evaluator = HandEvaluator(cards_from_str('7S 7D 7H 9C 9D 9S 2D'))
+
+        self.assertEqual(make_score(FULL_HOUSE, [9, 7]), evaluator.score())
+
+    def test_score_two_pair_from_three_pairs(self):
+        evaluator = HandEvaluator(cards_from_str('7S 7D 4H 4C 9D 9S 2D'))
+
+        self.assertEqual(make_score(TWO_PAIR, [9, 7, 4]), evaluator.score())
+
+    def test_score_wheel_is_not_a_straight(self):
+        evaluator = HandEvaluator(cards_from_str('AS 2D 3H 4C 5D'))
+
+        self.assertNotEqual(STRAIGHT, evaluator.category())
+
+    def test_best_hand_cards(self):
+        evaluator = HandEvaluator(cards_from_str('AH 3H 9S 8H 7H 2H 2D'))
+
+        best_hand_cards = evaluator.best_hand_cards()
+
+        self.assertListEqual(cards_from_str('AH 8H 7H 3H 2H'), best_hand_cards)
+        self.assertEqual(FLUSH, evaluator.category())
+
+
+class TestHandEvaluatorUpdates(PokerTestCase):
+
+    def test_add_and_remove(self):
+        evaluator = HandEvaluator(cards_from_str('AH KH'))
+        score = evaluator.score()
+
+        evaluator.add(Card(14, 'D'))
+        self.assertGreater(evaluator.score(), score)
+
+        evaluator.remove(Card(14, 'D'))
+        self.assertEqual(score, evaluator.score())
+        self.assertEqual(1 << 14 | 1 << 13, evaluator.rank_mask)
+
+    def test_outs(self):
+        evaluator = HandEvaluator(cards_from_str('AH KH 7H 2H 9S'))
+        seen = set(evaluator.cards)
+        unseen = [card for card in Deck().cards if card not in seen]
+
+        outs = evaluator.outs(unseen)
+
+        # 9 hearts make a flush, and 3 aces, 3 kings, 3 sevens, 3 twos, and 2 nines make a pair
+        self.assertEqual(23, len(outs))
+        self.assertEqual(5, len(evaluator.cards))
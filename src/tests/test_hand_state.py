@@ -0,0 +1,80 @@
+import random
+
+from src.poker.enums.betting_move import BettingMove
+from src.poker.enums.computer_playing_style import ComputerPlayingStyle
+from src.poker.game import Game
+from src.poker.hand_state import HandState
+from src.poker.players.computer import Computer
+from src.poker.prompts.silent_prompt import SilentPresenter
+from src.tests.test_utils.test_utils import PokerTestCase
+
+
+class TestHandState(PokerTestCase):
+
+    def setUp(self):
+        self.players = [Computer(name, ComputerPlayingStyle.RANDOM) for name in ['Homer', 'Bart', 'Lisa', 'Marge']]
+        for player, chips in zip(self.players, [1000, 1000, 45, 120]):
+            player.chips = chips
+        self.game = Game(presenter=SilentPresenter(), players=self.players, big_blind=20)
+        self.game.deck.rng = random.Random(0)
+
+    def test_follows_the_game_to_the_same_chips(self):
+        rng = random.Random(0)
+        for _ in range(20):
+            if len(self.game.get_active_players()) < 2:
+                break
+            self.game.reset()
+            betting_players = self.game.betting_players
+            states = []
+            while not self.game.is_terminal():
+                states.append(HandState.from_game(self.game))
+                self.assertEqual(self.game.legal_actions(), states[-1].legal_actions())
+                move = rng.choice(self.game.legal_actions())
+                self.game.step(move)
+                for state in states:
+                    state.apply(move)
+                    self.assertEqual(self.game.is_terminal(), state.is_terminal)
+
+            for state in states:
+                chips = [chips + won for chips, won in zip(state.chips, state.payouts())]
+                self.assertEqual([player.chips for player in betting_players], chips)
+
+    def test_copy_is_independent(self):
+        self.game.reset()
+        state = HandState.from_game(self.game)
+        copy = state.copy()
+
+        copy.apply(BettingMove.RAISED)
+
+        self.assertEqual(HandState.from_game(self.game).chips, state.chips)
+        self.assertEqual(state.current, HandState.from_game(self.game).current)
+        self.assertNotEqual(state.chips, copy.chips)
+
+    def test_folds_to_one_player_pays_out_pots(self):
+        self.game.reset()
+        state = HandState.from_game(self.game)
+        while not state.is_terminal:
+            state.apply(BettingMove.FOLDED)
+
+        self.assertEqual(3, bin(state.folded).count('1'))
+        self.assertEqual(30, sum(state.payouts()))
+
+    def test_redeal_keeps_what_the_player_can_see(self):
+        self.game.reset()
+        player = self.game.current_player()
+        seat = self.game.betting_players.index(player)
+
+        state = HandState.from_game(self.game, player, random.Random(1))
+
+        self.assertEqual(tuple(card.to_int() for card in player.hand), state.hole[seat])
+        cards = [card for hole in state.hole for card in hole] + list(state.deck)
+        self.assertEqual(52, len(set(cards)))
+        self.assertEqual(52, len(cards))
+
+    def test_snapshot_of_finished_hand_raises(self):
+        self.game.reset()
+        while not self.game.is_terminal():
+            self.game.step(BettingMove.FOLDED)
+
+        with self.assertRaises(ValueError):
+            HandState.from_game(self.game)
@@ -0,0 +1,74 @@
+import os
+import random
+import tempfile
+from itertools import combinations
+
+from src.poker.card import Card
+from src.poker.utils import hand_ranking_utils
+from src.poker.utils.lookup_tables import LookupTables, get_tables
+from src.tests.test_utils.test_utils import PokerTestCase, cards_from_str
+
+
+class TestLookupTables(PokerTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, 'tables.bin')
+        LookupTables.build().save(cls.path)
+        cls.tables = LookupTables.attach(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tables.close()
+        cls.directory.cleanup()
+
+    def test_score_matches_score_hand(self):
+        rng = random.Random(7)
+        for _ in range(500):
+            cards = rng.sample(range(52), 7)
+
+            expected = max(hand_ranking_utils.score_hand([Card.from_int(card) for card in combo])
+                           for combo in combinations(cards, 5))
+
+            self.assertEqual(expected, self.tables.score(cards))
+
+    def test_score_royal_flush(self):
+        cards = [card.to_int() for card in cards_from_str('AS KS QS JS 10S 2D 2C')]
+
+        self.assertEqual(100000000000, self.tables.score(cards))
+
+    def test_strength_orders_hands(self):
+        full_house = [card.to_int() for card in cards_from_str('7S 7D 7H 9C 9D 2S 3D')]
+        flush = [card.to_int() for card in cards_from_str('AH JH 8H 4H 2H KD QC')]
+
+        self.assertGreater(self.tables.hand_strength(full_house), self.tables.hand_strength(flush))
+
+    def test_attach_rejects_other_files(self):
+        path = os.path.join(self.directory.name, 'other.bin')
+        with open(path, 'wb') as f:
+            f.write(bytes(64))
+
+        with self.assertRaises(ValueError):
+            LookupTables.attach(path)
+
+    def test_attach_rejects_other_rules(self):
+        path = os.path.join(self.directory.name, 'short.bin')
+        LookupTables(self.tables.rank_table, self.tables.flush_table, self.tables.scores, 'short').save(path)
+
+        with self.assertRaises(ValueError):
+            LookupTables.attach(path)
+        LookupTables.attach(path, 'short').close()
+
+    def test_attach_rejects_truncated_file(self):
+        path = os.path.join(self.directory.name, 'truncated.bin')
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        with open(path, 'wb') as f:
+            f.write(data[:-2])
+
+        with self.assertRaises(ValueError):
+            LookupTables.attach(path)
+
+    def test_get_tables_attaches_once(self):
+        self.assertIs(get_tables(self.path), get_tables(self.path))
@@ -0,0 +1,100 @@
+import random
+from itertools import combinations
+
+from src.poker.deck import Deck
+from src.poker.enums.computer_playing_style import ComputerPlayingStyle
+from src.poker.enums.variant import Variant
+from src.poker.game import Game
+from src.poker.hand_state import HandState
+from src.poker.players.computer import Computer
+from src.poker.prompts.silent_prompt import SilentPresenter
+from src.poker.showdown_batch import ShowdownBatch
+from src.poker.utils import hand_ranking_utils, omaha
+from src.poker.utils.equity import calculate_equity
+from src.poker.utils.hand_evaluator import FLUSH, ONE_PAIR, THREE_OF_A_KIND, get_category
+from src.tests.test_utils.test_utils import PokerTestCase, cards_from_str, make_player
+
+
+class TestOmahaBoard(PokerTestCase):
+
+    def test_uses_exactly_two_hole_cards(self):
+        community = cards_from_str('AH KH 7H 2H 9C')
+
+        # Four hearts on the board and one in the hole is no flush
+        self.assertEqual(ONE_PAIR, get_category(omaha.score_hand(cards_from_str('QH 3S 3D 4C'), community)))
+        self.assertEqual(FLUSH, get_category(omaha.score_hand(cards_from_str('QH 3H 3D 4C'), community)))
+        # Nor are three aces in the hole and one on the board four of a kind
+        score = omaha.score_hand(cards_from_str('AS AD AC KD'), cards_from_str('AH 7C 2D 9S 5H'))
+        self.assertEqual(THREE_OF_A_KIND, get_category(score))
+
+    def test_score_matches_every_combination(self):
+        rng = random.Random(47)
+        for _ in range(300):
+            deck = Deck()
+            rng.shuffle(deck.cards)
+            hole, community = deck.deal(4), deck.deal(rng.choice([3, 4, 5]))
+
+            expected = max(hand_ranking_utils.score_hand(list(pair) + list(triple))
+                           for pair in combinations(hole, 2) for triple in combinations(community, 3))
+
+            self.assertEqual(expected, omaha.score_hand(hole, community))
+
+    def test_determine_showdown_winner(self):
+        community = cards_from_str('AH KH 7H 2H 9C')
+        john = make_player('John', 'QH 3S 3D 4C')
+        jane = make_player('Jane', 'KS KD 5C 6S')
+        mary = make_player('Mary', '10H 4H 8S 8D')
+
+        winners = omaha.determine_showdown_winner([john, jane, mary], community)
+
+        self.assertListEqual([mary], winners)
+        self.assertEqual('Flush', mary.best_hand_rank)
+        self.assertEqual('Three of a Kind', jane.best_hand_rank)
+        self.assertEqual('One Pair', john.best_hand_rank)
+        self.assertEqual(cards_from_str('AH KH 10H 7H 4H'), mary.best_hand_cards)
+
+    def test_showdown_batch_scores_omaha_hands(self):
+        community = cards_from_str('AH KH 7H 2H 9C')
+        john = make_player('John', 'QH 3S 3D 4C')
+        jane = make_player('Jane', 'KS KD 5C 6S')
+        batch = ShowdownBatch()
+
+        batch.submit('table', [[john, jane]], community, Variant.OMAHA)
+
+        self.assertListEqual([[jane]], batch.resolve()['table'])
+
+    def test_equity(self):
+        rng = random.Random(0)
+        aces = calculate_equity(cards_from_str('AS AH KS KH'), [], 1, 2000, rng)
+        trash = calculate_equity(cards_from_str('7C 2D 8S 3H'), [], 1, 2000, rng)
+
+        self.assertGreater(aces, 0.6)
+        self.assertLess(trash, 0.45)
+
+
+class TestOmahaGame(PokerTestCase):
+
+    def test_follows_the_game_to_the_same_chips(self):
+        players = [Computer(name, ComputerPlayingStyle.RANDOM) for name in ['Homer', 'Bart', 'Lisa']]
+        for player, chips in zip(players, [1000, 1000, 60]):
+            player.chips = chips
+        game = Game(presenter=SilentPresenter(), players=players, big_blind=20, variant=Variant.OMAHA)
+        game.deck.rng = random.Random(0)
+        rng = random.Random(0)
+        for _ in range(10):
+            if len(game.get_active_players()) < 2:
+                break
+            game.reset()
+            self.assertTrue(all(len(player.hand) == 4 for player in game.get_active_players()))
+            betting_players = game.betting_players
+            states = []
+            while not game.is_terminal():
+                states.append(HandState.from_game(game))
+                move = rng.choice(game.legal_actions())
+                game.step(move)
+                for state in states:
+                    state.apply(move)
+
+            for state in states:
+                chips = [chips + won for chips, won in zip(state.chips, state.payouts())]
+                self.assertEqual([player.chips for player in betting_players], chips)
@@ -40,6 +40,7 @@ class TestPlayer(PokerTestCase):
         player.best_hand_rank = 'best hand rank'
         player.rank_subtype = 'rank subtype'
         player.kicker_card = card
+        player.hand_evaluator.add(card)
 
         player.reset()
 
@@ -57,6 +58,7 @@ class TestPlayer(PokerTestCase):
         self.assertEqual('', player.best_hand_rank)
         self.assertEqual('', player.rank_subtype)
         self.assertIsNone(player.kicker_card)
+        self.assertListEqual([], player.hand_evaluator.cards)
         # These properties should not change when a player is reset
         self.assertEqual(name, player.name)
         self.assertEqual(chips, player.chips)
@@ -0,0 +1,177 @@
+import random
+
+from src.poker.enums.betting_move import BettingMove
+from src.poker.enums.computer_playing_style import ComputerPlayingStyle
+from src.poker.enums.phase import Phase
+from src.poker.game import Game
+from src.poker.player_stats import StatsTracker
+from src.poker.players.computer import Computer
+from src.poker.players.remote import RemotePlayer
+from src.poker.prompts.silent_prompt import SilentPresenter
+from src.poker.utils.equity import EquityCalculator
+from src.tests.test_utils.test_utils import PokerTestCase, cards_from_str
+
+
+class TestPlayerStats(PokerTestCase):
+
+    def setUp(self):
+        self.lenny, self.carl = RemotePlayer('Lenny'), RemotePlayer('Carl')
+
+    def test_statistics(self):
+        stats = StatsTracker()
+        # Lenny raises and bets the flop, Carl calls down and wins the showdown
+        stats.hand_started([self.lenny, self.carl])
+        stats.record_move(Phase.PREFLOP, self.lenny, BettingMove.RAISED, True, True)
+        stats.record_move(Phase.PREFLOP, self.carl, BettingMove.CALLED, True, False)
+        stats.flop_dealt([self.lenny, self.carl])
+        stats.record_move(Phase.FLOP, self.lenny, BettingMove.BET, False, True)
+        stats.record_move(Phase.FLOP, self.carl, BettingMove.CALLED, True, False)
+        stats.record_move(Phase.TURN, self.lenny, BettingMove.CHECKED, False, False)
+        stats.record_move(Phase.TURN, self.carl, BettingMove.CHECKED, False, False)
+        stats.record_showdown([self.lenny, self.carl], [self.carl])
+        # Lenny goes all-in over Carl's check before the flop, and Carl folds
+        stats.hand_started([self.lenny, self.carl])
+        stats.record_move(Phase.PREFLOP, self.carl, BettingMove.CHECKED, False, False)
+        stats.record_move(Phase.PREFLOP, self.lenny, BettingMove.ALL_IN, False, True)
+        stats.record_move(Phase.PREFLOP, self.carl, BettingMove.FOLDED, True, False)
+
+        lenny, carl = stats['Lenny'], stats['Carl']
+        self.assertEqual((1.0, 1.0), (lenny.vpip, lenny.pfr))
+        self.assertEqual((0.5, 0.0), (carl.vpip, carl.pfr))
+        self.assertEqual(float('inf'), lenny.aggression_factor)
+        self.assertEqual(0.0, carl.aggression_factor)
+        self.assertEqual((1.0, 0.0), (lenny.wtsd, lenny.wsd))
+        self.assertEqual((1.0, 1.0), (carl.wtsd, carl.wsd))
+        self.assertEqual(0.5, carl.fold_to_bet(Phase.PREFLOP))
+        self.assertEqual(0.0, carl.fold_to_bet(Phase.FLOP))
+        self.assertEqual(1.0, lenny.raise_frequency(Phase.PREFLOP))
+        self.assertEqual((1.0, 0.0), (lenny.raise_frequency(Phase.FLOP), lenny.raise_frequency(Phase.TURN)))
+
+    def test_all_in_call_is_not_a_raise(self):
+        stats = StatsTracker()
+        stats.hand_started([self.lenny, self.carl])
+        stats.record_move(Phase.PREFLOP, self.lenny, BettingMove.RAISED, True, True)
+        stats.record_move(Phase.PREFLOP, self.carl, BettingMove.ALL_IN, True, False)
+        stats.record_showdown([self.lenny, self.carl], [self.lenny, self.carl])
+
+        carl = stats['Carl']
+        self.assertEqual((1.0, 0.0), (carl.vpip, carl.pfr))
+        # All-in before the flop, so Carl saw it without moving after it
+        self.assertEqual((1.0, 1.0), (carl.wtsd, carl.wsd))
+
+    def test_flop_counts_players_who_never_move_after_it(self):
+        moe = RemotePlayer('Moe')
+        stats = StatsTracker()
+        stats.hand_started([self.lenny, self.carl, moe])
+        stats.record_move(Phase.PREFLOP, self.lenny, BettingMove.CALLED, True, False)
+        stats.record_move(Phase.PREFLOP, self.carl, BettingMove.CALLED, True, False)
+        stats.record_move(Phase.PREFLOP, moe, BettingMove.CHECKED, False, False)
+        stats.flop_dealt([self.lenny, self.carl, moe])
+        # Both players before Moe fold the flop, so Moe wins it without moving
+        self.lenny.is_folded = self.carl.is_folded = True
+        stats.record_move(Phase.FLOP, self.lenny, BettingMove.FOLDED, False, False)
+        stats.record_move(Phase.FLOP, self.carl, BettingMove.FOLDED, False, False)
+
+        self.assertEqual((1.0, 1.0, 1.0), (stats['Lenny'].saw_flop, stats['Carl'].saw_flop, stats['Moe'].saw_flop))
+        self.assertEqual(0.0, stats['Moe'].wtsd)
+
+    def test_decay(self):
+        stats = StatsTracker(decay=0.5)
+        stats.hand_started([self.lenny])
+        stats.record_move(Phase.PREFLOP, self.lenny, BettingMove.CALLED, True, False)
+        stats.hand_started([self.lenny])
+        stats.record_move(Phase.PREFLOP, self.lenny, BettingMove.FOLDED, True, False)
+
+        # The older hand counts for half as much as the newer one
+        self.assertAlmostEqual(1 / 3, stats['Lenny'].vpip)
+        self.assertAlmostEqual(2 / 3, stats['Lenny'].fold_to_bet(Phase.PREFLOP))
+
+        for _ in range(1000):
+            stats.hand_started([self.lenny])
+            stats.record_move(Phase.PREFLOP, self.lenny, BettingMove.CALLED, True, False)
+        stats.hand_started([self.lenny])
+        stats.record_move(Phase.PREFLOP, self.lenny, BettingMove.FOLDED, True, False)
+
+        self.assertAlmostEqual(1 / 2, stats['Lenny'].vpip)
+        with self.assertRaises(ValueError):
+            StatsTracker(decay=0)
+
+    def test_game_records_hands(self):
+        self.lenny.chips = self.carl.chips = 1000
+        game = Game(presenter=SilentPresenter(), players=[self.lenny, self.carl], big_blind=20)
+        game.stats = StatsTracker()
+        game.dealer = self.carl
+        for _ in range(3):
+            game.reset()
+            # The dealer calls the big blind, and both players check every street after it
+            while not game.is_terminal():
+                game.step(game.legal_actions()[0])
+
+        lenny, carl = game.stats['Lenny'], game.stats['Carl']
+        self.assertEqual(3, game.stats.hands)
+        self.assertEqual((3.0, 3.0), (lenny.hands, carl.hands))
+        # Each player was the dealer, and called, in one or two of the hands
+        self.assertEqual(1.0, lenny.vpip + carl.vpip)
+        self.assertEqual((0.0, 0.0), (lenny.pfr, carl.pfr))
+        self.assertEqual((1.0, 1.0), (lenny.wtsd, carl.wtsd))
+        self.assertGreaterEqual(lenny.wsd + carl.wsd, 1.0)
+
+
+class TestAdaptivePlay(PokerTestCase):
+
+    def setUp(self):
+        self.computer = Computer('Homer', ComputerPlayingStyle.ADAPTIVE)
+        # Equities are sampled, so sample the same deals every time
+        self.computer.equity_calculator = EquityCalculator(num_samples=2000)
+        self.computer.equity_calculator.rng = random.Random(0)
+        self.opponent = RemotePlayer('Lenny')
+        for player in [self.computer, self.opponent]:
+            player.chips = 1000
+        self.game = Game(presenter=SilentPresenter(), players=[self.computer, self.opponent], big_blind=20)
+        self.game.table.reset(self.game.players)
+        self.game.phase = Phase.RIVER
+        self.game.stats = StatsTracker()
+
+    def deal(self, hole, opponent_hole, community):
+        for player, cards in [(self.computer, hole), (self.opponent, opponent_hole)]:
+            for card in cards_from_str(cards):
+                player.hand.append(card)
+                player.hand_evaluator.add(card)
+        self.game.add_to_community(cards_from_str(community))
+
+    def record_river_moves(self, move, facing_bet, raised, times=30):
+        for _ in range(times):
+            self.game.stats.record_move(Phase.RIVER, self.opponent, move, facing_bet, raised)
+
+    def test_bluffs_opponent_who_folds_to_bets(self):
+        self.deal('9H 8D', 'AS KD', 'KS 7C 4D 2H 2C')
+        self.game.table.pots[0][0] = 60
+
+        self.assertIs(BettingMove.CHECKED, self.computer.choose_next_move(40, 0, 0))
+        self.record_river_moves(BettingMove.FOLDED, True, False)
+        self.assertIs(BettingMove.BET, self.computer.choose_next_move(40, 0, 0))
+
+    def test_does_not_bluff_opponent_who_calls_bets(self):
+        self.deal('9H 8D', 'AS KD', 'KS 7C 4D 2H 2C')
+        self.game.table.pots[0][0] = 200
+        self.record_river_moves(BettingMove.CALLED, True, False)
+
+        self.assertIs(BettingMove.CHECKED, self.computer.choose_next_move(40, 0, 0))
+
+    def test_calls_aggressive_opponent_lighter(self):
+        # Short of the equity needed to call the bet of an opponent who bets as often as most do
+        self.deal('QD 6C', 'AS KD', 'KS 7C 4D 2H 2C')
+        self.game.table.pots[0][0] = 22
+        self.opponent.match_bet(100)
+
+        self.assertIs(BettingMove.FOLDED, self.computer.choose_next_move(140, 1, 100))
+        self.record_river_moves(BettingMove.RAISED, True, True)
+        self.assertIs(BettingMove.CALLED, self.computer.choose_next_move(140, 1, 100))
+
+    def test_keeps_statistics_for_a_game_without_them(self):
+        self.game.stats = None
+        self.deal('9H 8D', 'AS KD', 'KS 7C 4D 2H 2C')
+
+        self.computer.choose_next_move(40, 0, 0)
+
+        self.assertIsInstance(self.game.stats, StatsTracker)
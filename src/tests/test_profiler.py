@@ -0,0 +1,107 @@
+import json
+import os
+import tempfile
+
+from src.poker.utils.profiler import Profiler, ThroughputStats, TimerStats
+from src.tests.test_utils.test_utils import PokerTestCase
+
+
+class MockEngine:
+    def __init__(self):
+        self.calls = 0
+
+    def step(self, n):
+        self.calls += n
+        return self.calls
+
+
+class TestTimerStats(PokerTestCase):
+
+    def test_add(self):
+        stats = TimerStats()
+
+        stats.add(0.000003)
+        stats.add(0.000003)
+        stats.add(0.001)
+
+        self.assertEqual(3, stats.calls)
+        self.assertAlmostEqual(0.001006, stats.total)
+        self.assertEqual({2: 2, 10: 1}, stats.histogram)
+        self.assertAlmostEqual(0.000004, stats.percentile(0.5))
+        self.assertAlmostEqual(0.001024, stats.percentile(0.99))
+
+
+class TestThroughputStats(PokerTestCase):
+
+    def test_add(self):
+        stats = ThroughputStats()
+
+        stats.add(300, 0.1)
+        stats.add(100, 0.1)
+
+        self.assertEqual(2, stats.calls)
+        self.assertEqual(400, stats.count)
+        self.assertAlmostEqual(2000, stats.rate())
+        self.assertAlmostEqual(1000, stats.lowest_rate)
+
+
+class TestProfiler(PokerTestCase):
+
+    def test_instrument(self):
+        profiler = Profiler()
+        engine = MockEngine()
+
+        profiler.instrument(engine, ['step'], prefix='engine.')
+        engine.step(2)
+        result = engine.step(3)
+
+        self.assertEqual(5, result)
+        self.assertEqual(2, profiler.stats['engine.step'].calls)
+        self.assertEqual(2, len(profiler.trace_events))
+
+    def test_instrument_namespace(self):
+        profiler = Profiler()
+        namespace = profiler.instrument_namespace(MockEngine(), 'presenter')
+
+        namespace.step(1)
+        namespace.step(1)
+
+        self.assertEqual(2, profiler.stats['presenter.step'].calls)
+        self.assertEqual(2, namespace.calls)
+
+    def test_hand_finished_reports_summary(self):
+        summaries = []
+        profiler = Profiler(summary_interval=0, report=summaries.append)
+
+        profiler.hand_finished()
+        profiler.hand_finished()
+
+        self.assertEqual(2, profiler.hands_played)
+        self.assertEqual(2, len(summaries))
+        self.assertIn('Hands played: 2', summaries[-1])
+
+    def test_record_throughput_in_summary(self):
+        profiler = Profiler()
+
+        profiler.record_throughput('mcts.simulations', 300, 0.1)
+
+        self.assertEqual(1, profiler.throughput['mcts.simulations'].calls)
+        self.assertIn('mcts.simulations', profiler.summary())
+
+    def test_export_chrome_trace(self):
+        profiler = Profiler(max_trace_events=1)
+        engine = MockEngine()
+        profiler.instrument(engine, ['step'])
+        engine.step(1)
+        engine.step(1)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'trace.json')
+            profiler.export_chrome_trace(path)
+            with open(path) as file:
+                trace = json.load(file)
+
+        self.assertEqual(1, len(trace['traceEvents']))
+        self.assertEqual('step', trace['traceEvents'][0]['name'])
+        self.assertEqual('X', trace['traceEvents'][0]['ph'])
+        self.assertEqual(2, profiler.stats['step'].calls)
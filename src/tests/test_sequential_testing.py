@@ -0,0 +1,65 @@
+import random
+import statistics
+
+from src.poker.utils.sequential_testing import BETTER, TOO_CLOSE, WORSE, RunningStats, SequentialComparison
+from src.tests.test_utils.test_utils import PokerTestCase
+
+
+class TestRunningStats(PokerTestCase):
+
+    def test_add(self):
+        values = [4, -7, 12.5, 0, 3, 3, 90]
+        stats = RunningStats()
+
+        for value in values:
+            stats.add(value)
+
+        self.assertEqual(7, stats.count)
+        self.assertAlmostEqual(statistics.mean(values), stats.mean)
+        self.assertAlmostEqual(statistics.variance(values), stats.variance)
+
+
+class TestSequentialComparison(PokerTestCase):
+
+    def test_decide_better_and_worse(self):
+        rng = random.Random(1)
+        comparison = SequentialComparison(['a', 'b'], min_samples=30)
+
+        while not comparison.is_decided():
+            luck = rng.gauss(0, 100)
+            comparison.add({'a': luck + 10 + rng.gauss(0, 5), 'b': -luck + rng.gauss(0, 5)})
+
+        self.assertEqual(BETTER, comparison.decide('a', 'b'))
+        self.assertEqual(WORSE, comparison.decide('b', 'a'))
+        self.assertListEqual(['a', 'b'], comparison.ranking())
+
+    def test_decide_too_close_to_call(self):
+        rng = random.Random(2)
+        comparison = SequentialComparison(['a', 'b'], margin=2)
+
+        for _ in range(5000):
+            comparison.add({'a': rng.gauss(0, 5), 'b': rng.gauss(0, 5)})
+
+        self.assertEqual(TOO_CLOSE, comparison.decide('a', 'b'))
+
+    def test_equal_competitors_rarely_called_different(self):
+        rng = random.Random(32)
+        num_runs = 200
+        num_wrong = 0
+        for _ in range(num_runs):
+            comparison = SequentialComparison(['a', 'b'], alpha=0.05, margin=0.3)
+            # Checked after every sample, as run_until_decided does
+            while comparison.num_samples < 5000 and not comparison.is_decided():
+                comparison.add({'a': rng.gauss(0, 1), 'b': rng.gauss(0, 1)})
+            num_wrong += comparison.decide('a', 'b') in (BETTER, WORSE)
+
+        self.assertLessEqual(num_wrong, 0.05 * num_runs)
+
+    def test_decide_waits_for_min_samples(self):
+        comparison = SequentialComparison(['a', 'b'], min_samples=10)
+
+        for i in range(9):
+            comparison.add({'a': 100 + i, 'b': 0})
+
+        self.assertIsNone(comparison.decide('a', 'b'))
+        self.assertFalse(comparison.is_decided())
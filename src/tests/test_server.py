@@ -0,0 +1,181 @@
+import asyncio
+import random
+
+from src.poker.broadcast import TableReplica
+from src.poker.enums.computer_playing_style import ComputerPlayingStyle
+from src.poker.load_generator import run_load
+from src.poker.server import Connection, PokerServer
+from src.tests.test_utils.test_utils import PokerTestCase
+
+
+class StubTransport:
+    def __init__(self):
+        self.buffer_size = 0
+
+    def get_write_buffer_size(self):
+        return self.buffer_size
+
+
+class StubWriter:
+    def __init__(self):
+        self.transport = StubTransport()
+        self.writes = []
+        self.is_closed = False
+
+    def write(self, data):
+        self.writes.append(data)
+
+    def close(self):
+        self.is_closed = True
+
+
+async def read_until(reader: asyncio.StreamReader, command: str) -> list[str]:
+    while True:
+        words = (await reader.readline()).decode().split()
+        if words and words[0] == command:
+            return words
+
+
+class TestServer(PokerTestCase):
+
+    def test_players_play_tables(self):
+        async def run():
+            server = PokerServer(remote_seats=2, seats=4, playing_styles=[ComputerPlayingStyle.SAFE])
+            port = await server.start()
+            stats = await run_load('127.0.0.1', port, num_players=4, num_idle=200, seconds=1.0, seed=0,
+                                   num_watchers=20)
+            await server.close()
+            return stats
+
+        stats = asyncio.run(run())
+
+        self.assertEqual(224, stats.connected)
+        self.assertGreaterEqual(stats.tables, 4)
+        self.assertGreater(stats.moves, 0)
+        self.assertGreater(stats.watched, 0)
+        self.assertEqual(0, stats.errors)
+
+    def test_errors(self):
+        async def run():
+            server = PokerServer(remote_seats=2)
+            port = await server.start()
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            replies = []
+            for line in ['DANCE', 'MOVE CALLED', 'JOIN two words', 'JOIN Lenny', 'JOIN Carl']:
+                writer.write(f'{line}\n'.encode())
+                replies.append((await reader.readline()).decode().split()[0])
+            other_reader, other_writer = await asyncio.open_connection('127.0.0.1', port)
+            other_writer.write(b'JOIN Lenny\n')
+            replies.append((await other_reader.readline()).decode().strip())
+            writer.close()
+            other_writer.close()
+            await server.close()
+            return replies
+
+        replies = asyncio.run(run())
+
+        self.assertEqual(['ERROR', 'ERROR', 'ERROR', 'WAITING', 'ERROR', 'ERROR The name Lenny is taken.'], replies)
+
+    def test_player_who_does_not_move_checks_or_folds(self):
+        async def run():
+            server = PokerServer(remote_seats=1, seats=2, playing_styles=[ComputerPlayingStyle.SAFE],
+                                 move_timeout=0.01)
+            port = await server.start()
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b'JOIN Lenny\n')
+            seated = await read_until(reader, 'SEATED')
+            hole = await read_until(reader, 'HOLE')
+            await read_until(reader, 'TURN')
+            action = await read_until(reader, 'ACTION')
+            while action[1] != 'Lenny':
+                action = await read_until(reader, 'ACTION')
+            writer.close()
+            await server.close()
+            return seated, hole, action
+
+        seated, hole, action = asyncio.run(run())
+
+        self.assertEqual(['SEATED', '1'], seated[:2])
+        self.assertIn('Lenny', seated)
+        self.assertEqual(3, len(hole))
+        self.assertIn(action[2], ['CHECKED', 'FOLDED'])
+
+    def test_player_out_of_chips_can_join_again(self):
+        async def run():
+            # Deals a game where Carl runs out of chips while Lenny plays on
+            random.seed(0)
+            server = PokerServer(remote_seats=2, seats=3, starting_chips=40,
+                                 playing_styles=[ComputerPlayingStyle.SAFE], move_timeout=0.01)
+            port = await server.start()
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            other_reader, other_writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b'JOIN Lenny\n')
+            other_writer.write(b'JOIN Carl\n')
+            await asyncio.wait_for(read_until(other_reader, 'OUT'), 10)
+            other_writer.write(b'JOIN Moe\n')
+            reply = await read_until(other_reader, 'WAITING')
+            writer.close()
+            other_writer.close()
+            await server.close()
+            return reply
+
+        self.assertEqual(['WAITING', '1'], asyncio.run(run()))
+
+    def test_connection_buffers_lines(self):
+        async def run():
+            writer = StubWriter()
+            connection = Connection(None, writer, max_buffer=100)
+            connection.send_line(b'DELTA 2 pots=30\n')
+            connection.send('TURN', 'CHECKED', 'BET', 'FOLDED')
+            self.assertEqual([], writer.writes)
+            await asyncio.sleep(0)
+            self.assertEqual([b'DELTA 2 pots=30\nTURN CHECKED BET FOLDED\n'], writer.writes)
+            writer.transport.buffer_size = 101
+            connection.send('PHASE', 'FLOP', 'Lenny')
+            await asyncio.sleep(0)
+            return writer
+
+        writer = asyncio.run(run())
+
+        # Disconnected for falling behind
+        self.assertTrue(writer.is_closed)
+
+    def test_watcher_keeps_replica_of_table(self):
+        async def run():
+            server = PokerServer(remote_seats=1, seats=3, playing_styles=[ComputerPlayingStyle.SAFE],
+                                 move_timeout=0.01)
+            port = await server.start()
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b'JOIN Lenny\n')
+            await read_until(reader, 'SEATED')
+            watcher_reader, watcher_writer = await asyncio.open_connection('127.0.0.1', port)
+            watcher_writer.write(b'WATCH 7\nTABLES\nWATCH 1\n')
+            error = await read_until(watcher_reader, 'ERROR')
+            tables = await read_until(watcher_reader, 'TABLES')
+            replica = TableReplica()
+            words = await read_until(watcher_reader, 'KEYFRAME')
+            replica.apply(' '.join(words))
+            seen = set()
+            while len(seen) < 2:
+                line = (await watcher_reader.readline()).decode()
+                replica.apply(line)
+                seen.add(line.split()[0])
+            # The watcher is sent what the players are, apart from their own cards and turns
+            self.assertNotIn('HOLE', seen)
+            self.assertNotIn('TURN', seen)
+            broadcaster = server.tables[1].broadcaster
+            while replica.seq < broadcaster.seq:
+                replica.apply((await watcher_reader.readline()).decode())
+            fields = dict(broadcaster.fields)
+            writer.close()
+            watcher_writer.close()
+            await server.close()
+            return error, tables, replica, fields
+
+        error, tables, replica, fields = asyncio.run(run())
+
+        self.assertEqual(['ERROR', 'There', 'is', 'no', 'table', '7.'], error)
+        self.assertEqual(['TABLES', '1'], tables)
+        self.assertEqual(fields, replica.fields)
+        self.assertEqual(3, len(replica.players()))
+        self.assertIn('Lenny', [name for name, chips, bet, flags in replica.players()])
@@ -0,0 +1,114 @@
+import os
+import random
+import tempfile
+from itertools import combinations
+
+from src.poker.card import Card
+from src.poker.enums.computer_playing_style import ComputerPlayingStyle
+from src.poker.enums.variant import Variant
+from src.poker.game import Game
+from src.poker.hand_state import HandState
+from src.poker.players.computer import Computer
+from src.poker.prompts.silent_prompt import SilentPresenter
+from src.poker.showdown_batch import ShowdownBatch
+from src.poker.utils import short_deck
+from src.poker.utils.hand_evaluator import STRAIGHT, STRAIGHT_FLUSH, get_category
+from src.poker.utils.lookup_tables import LookupTables
+from src.tests.test_utils.test_utils import PokerTestCase, cards_from_str, make_player
+
+
+class TestShortDeckRankings(PokerTestCase):
+
+    def test_ace_plays_low_in_straight(self):
+        self.assertEqual(STRAIGHT, get_category(short_deck.score_hand(cards_from_str('AS 6D 7C 8H 9S KD KC'))))
+        self.assertEqual(STRAIGHT_FLUSH, get_category(short_deck.score_hand(cards_from_str('AS 6S 7S 8S 9S'))))
+        # The lowest straight loses to every other straight
+        self.assertLess(short_deck.score_hand(cards_from_str('AS 6D 7C 8H 9S')),
+                        short_deck.score_hand(cards_from_str('6D 7C 8H 9S 10S')))
+
+    def test_flush_beats_full_house(self):
+        flush = short_deck.score_hand(cards_from_str('AS 10S 7S 8S JS'))
+        full_house = short_deck.score_hand(cards_from_str('AS AD AC KH KS'))
+
+        self.assertGreater(flush, full_house)
+        self.assertEqual('Flush', short_deck.HANDRANKS[get_category(flush)])
+        self.assertEqual('Full House', short_deck.HANDRANKS[get_category(full_house)])
+
+
+class TestShortDeckTables(PokerTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, 'tables.bin')
+        short_deck.build_tables().save(cls.path)
+        cls.tables = LookupTables.attach(cls.path, short_deck.RULES)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tables.close()
+        cls.directory.cleanup()
+
+    def test_score_matches_best_five_cards(self):
+        rng = random.Random(48)
+        for _ in range(500):
+            cards = rng.sample(range(short_deck.LOWEST_CARD, 52), 7)
+
+            expected = max(short_deck.score_hand([Card.from_int(card) for card in combo])
+                           for combo in combinations(cards, 5))
+
+            self.assertEqual(expected, self.tables.score(cards))
+
+
+class TestShortDeckShowdown(PokerTestCase):
+
+    def test_determine_showdown_winner(self):
+        community = cards_from_str('KS KD 8S 9S 7H')
+        john = make_player('John', 'KC 8D')
+        jane = make_player('Jane', 'AS 6S')
+
+        winners = short_deck.determine_showdown_winner([john, jane], community)
+
+        self.assertListEqual([jane], winners)
+        self.assertEqual('Full House', john.best_hand_rank)
+        self.assertEqual('Flush', jane.best_hand_rank)
+        self.assertEqual(cards_from_str('AS KS 9S 8S 6S'), jane.best_hand_cards)
+
+    def test_showdown_batch_scores_with_short_deck_tables(self):
+        community = cards_from_str('KS KD 8S 9S 7H')
+        john = make_player('John', 'KC 8D')
+        jane = make_player('Jane', 'AS 6S')
+        batch = ShowdownBatch()
+
+        batch.submit('table', [[john, jane]], community, Variant.SHORT_DECK)
+
+        self.assertListEqual([[jane]], batch.resolve()['table'])
+        self.assertEqual('Flush', jane.best_hand_rank)
+
+
+class TestShortDeckGame(PokerTestCase):
+
+    def test_follows_the_game_to_the_same_chips(self):
+        players = [Computer(name, ComputerPlayingStyle.RANDOM) for name in ['Homer', 'Bart', 'Lisa']]
+        for player, chips in zip(players, [1000, 1000, 60]):
+            player.chips = chips
+        game = Game(presenter=SilentPresenter(), players=players, big_blind=20, variant=Variant.SHORT_DECK)
+        game.deck.rng = random.Random(0)
+        rng = random.Random(0)
+        for _ in range(10):
+            if len(game.get_active_players()) < 2:
+                break
+            game.reset()
+            self.assertEqual(36 - 2 * len(game.get_active_players()), len(game.deck.cards))
+            betting_players = game.betting_players
+            states = []
+            while not game.is_terminal():
+                states.append(HandState.from_game(game))
+                move = rng.choice(game.legal_actions())
+                game.step(move)
+                for state in states:
+                    state.apply(move)
+
+            for state in states:
+                chips = [chips + won for chips, won in zip(state.chips, state.payouts())]
+                self.assertEqual([player.chips for player in betting_players], chips)
@@ -0,0 +1,67 @@
+import random
+
+from src.poker.deck import Deck
+from src.poker.showdown_batch import ShowdownBatch, score_hands
+from src.poker.utils import hand_ranking_utils
+from src.poker.utils.hand_evaluator import HandEvaluator
+from src.poker.utils.lookup_tables import get_tables
+from src.tests.test_player.test_player import MockConcretePlayerClass
+from src.tests.test_utils.test_utils import PokerTestCase, cards_from_str, make_player
+
+
+class TestScoreHands(PokerTestCase):
+
+    def test_score_hands_matches_hand_evaluator(self):
+        rng = random.Random(30)
+        hands = []
+        for _ in range(500):
+            deck = Deck()
+            rng.shuffle(deck.cards)
+            hands.append(deck.deal(7))
+
+        scores = score_hands(get_tables(), [[card.to_int() for card in hand] for hand in hands])
+
+        self.assertListEqual([HandEvaluator(hand).score() for hand in hands], scores)
+
+
+class TestShowdownBatch(PokerTestCase):
+
+    def test_resolve(self):
+        community_a = cards_from_str('KH 2C 10C 5S JH')
+        john = make_player('John', 'KS 8H')
+        jane = make_player('Jane', 'KD 6C')
+        mary = make_player('Mary', '10D 10S')
+        community_b = cards_from_str('AS KS QS 2D 3D')
+        bill = make_player('Bill', 'JS 10S')
+        bob = make_player('Bob', 'AD AC')
+        batch = ShowdownBatch()
+
+        batch.submit('table a', [[john, jane], [john, jane, mary]], community_a)
+        batch.submit('table b', [[bill, bob]], community_b)
+        winners = batch.resolve()
+
+        self.assertListEqual([[john], [mary]], winners['table a'])
+        self.assertListEqual([[bill]], winners['table b'])
+        self.assertEqual('Royal Flush', bill.best_hand_rank)
+        self.assertEqual([], batch.pending)
+
+    def test_resolve_matches_determine_showdown_winner(self):
+        rng = random.Random(31)
+        batch = ShowdownBatch()
+        expected = {}
+        for table in range(50):
+            deck = Deck()
+            rng.shuffle(deck.cards)
+            community = deck.deal(5)
+            players = [MockConcretePlayerClass(str(i)) for i in range(4)]
+            twins = [MockConcretePlayerClass(str(i)) for i in range(4)]
+            for player, twin in zip(players, twins):
+                player.hand = twin.hand = deck.deal(2)
+            batch.submit(table, [players], community)
+            winners = hand_ranking_utils.determine_showdown_winner(twins, community)
+            expected[table] = [[player.name for player in winners]]
+
+        winners = batch.resolve()
+
+        for table in expected:
+            self.assertListEqual(expected[table], [[player.name for player in pot] for pot in winners[table]])
@@ -0,0 +1,44 @@
+from unittest.mock import patch
+
+from src.poker.enums.computer_playing_style import ComputerPlayingStyle
+from src.poker.game import Game
+from src.poker.simulation import make_lineup, play_duplicate_deck, run_duplicate
+from src.tests.test_utils.test_utils import PokerTestCase
+
+SAFE = ComputerPlayingStyle.SAFE
+RISKY = ComputerPlayingStyle.RISKY
+RANDOM = ComputerPlayingStyle.RANDOM
+
+
+class TestDuplicate(PokerTestCase):
+
+    def test_make_lineup(self):
+        self.assertListEqual([SAFE, RISKY, SAFE, RISKY, SAFE], make_lineup([SAFE, RISKY], 5))
+
+    def test_play_duplicate_deck_rotates_styles_through_the_same_cards(self):
+        deals = []
+        play_hand = Game.play_hand
+
+        def record_deal(game):
+            play_hand(game)
+            deals.append([(player.playing_style, [str(card) for card in player.hand], player.is_dealer)
+                          for player in game.players])
+
+        with patch.object(Game, 'play_hand', autospec=True, side_effect=record_deal):
+            play_duplicate_deck([SAFE, RISKY, RANDOM], deck_seed=7, starting_chips=1000, big_blind=20)
+
+        self.assertEqual(3, len(deals))
+        for rotation, deal in enumerate(deals):
+            self.assertEqual([SAFE, RISKY, RANDOM][rotation], deal[0][0])
+            self.assertEqual(deals[0][0][1], deal[0][1])
+            self.assertEqual(deals[0][2][1], deal[2][1])
+            self.assertTrue(deal[0][2])
+
+    def test_run_duplicate(self):
+        results = run_duplicate([SAFE, RISKY, RANDOM], num_decks=5, seed=1)
+
+        self.assertEqual(5, len(results))
+        for deck in results:
+            self.assertSetEqual({SAFE, RISKY, RANDOM}, set(deck))
+            # Chips only change hands, apart from the odd chip lost splitting a pot
+            self.assertLessEqual(abs(sum(deck.values())), 3 * 3)
@@ -1,7 +1,9 @@
 from unittest.mock import Mock
 
+from src.poker.blind_schedule import BlindLevel, BlindSchedule
 from src.poker.card import Card
 from src.poker.table import Table
+from src.tests.test_player.test_player import MockConcretePlayerClass
 from src.tests.test_utils.test_utils import PokerTestCase
 
 
@@ -44,8 +46,59 @@ class TestTableReset(PokerTestCase):
         table.reset(active_players=[])
 
         self.assertEqual(50, table.big_blind)
+        self.assertEqual(25, table.small_blind)
         self.assertEqual(table.big_blind, table.raise_amount)
 
+    def test_reset_follows_blind_schedule(self):
+        schedule = BlindSchedule([BlindLevel(10, 25, hands=5), BlindLevel(25, 50, ante=5)])
+        table = Table(schedule)
+
+        table.reset(active_players=[])
+        self.assertEqual(10, table.small_blind)
+        self.assertEqual(25, table.big_blind)
+        self.assertEqual(0, table.ante)
+
+        table.hands_played = 5
+        table.reset(active_players=[])
+        self.assertEqual(25, table.small_blind)
+        self.assertEqual(50, table.big_blind)
+        self.assertEqual(5, table.ante)
+        self.assertEqual(table.big_blind, table.raise_amount)
+
+
+class TestTableTakeAntes(PokerTestCase):
+
+    def test_take_antes(self):
+        player_a = MockConcretePlayerClass('John')
+        player_a.chips = 100
+        player_b = MockConcretePlayerClass('Jane')
+        player_b.chips = 3
+        table = Table()
+        table.ante = 5
+        table.reset([player_a, player_b])
+
+        all_in_players = table.take_antes([player_a, player_b])
+
+        self.assertEqual(95, player_a.chips)
+        self.assertEqual(0, player_b.chips)
+        self.assertEqual(0, player_a.bet)
+        self.assertEqual([[6, [player_a, player_b]], [2, [player_a]]], table.pots)
+        self.assertListEqual([player_b], all_in_players)
+        self.assertTrue(player_b.is_all_in)
+
+    def test_take_antes_caps_each_all_in_player_main_pot(self):
+        players = [MockConcretePlayerClass(name) for name in ['John', 'Jane', 'Mary', 'Bill']]
+        for player, chips in zip(players, [100, 3, 5, 1]):
+            player.chips = chips
+        table = Table()
+        table.ante = 5
+        table.reset(players)
+
+        table.take_antes(players)
+
+        john, jane, mary, bill = players
+        self.assertEqual([[4, players], [6, [john, jane, mary]], [4, [john, mary]], [0, [john]]], table.pots)
+
 
 class TestTableCheckIncreaseBigBlind(PokerTestCase):
 
@@ -70,4 +123,11 @@ class TestTableCheckIncreaseBigBlind(PokerTestCase):
         self.assertFalse(table.check_increase_big_blind())
 
         table.hands_played = 11
-        self.assertFalse(table.check_increase_big_blind())
\ No newline at end of file
+        self.assertFalse(table.check_increase_big_blind())
+
+    def test_check_increase_big_blind_returns_false_with_blind_schedule(self):
+        Table.increase_blind_hand_increments = 5
+        table = Table(BlindSchedule([BlindLevel(10, 20)]))
+
+        table.hands_played = 5
+        self.assertFalse(table.check_increase_big_blind())
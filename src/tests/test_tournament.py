@@ -0,0 +1,62 @@
+from src.poker.blind_schedule import BlindLevel, BlindSchedule
+from src.poker.game import generate_computer_names
+from src.poker.tournament import Tournament
+from src.tests.test_utils.test_utils import PokerTestCase
+
+
+class TestGenerateComputerNames(PokerTestCase):
+
+    def test_generate_computer_names_are_unique(self):
+        names = generate_computer_names(50, taken_name='Homer')
+
+        self.assertEqual(50, len(names))
+        self.assertEqual(50, len(set(names)))
+        self.assertNotIn('Homer', names)
+
+
+class TestTournament(PokerTestCase):
+
+    def test_init_seats_balanced_tables(self):
+        tournament = Tournament(num_entrants=40, starting_chips=1000, big_blind=20, seats_per_table=9)
+
+        table_sizes = sorted(len(game.players) for game in tournament.tables.values())
+        self.assertListEqual([8, 8, 8, 8, 8], table_sizes)
+
+    def test_balance_tables_breaks_table(self):
+        tournament = Tournament(num_entrants=18, starting_chips=1000, big_blind=20, seats_per_table=9)
+        for game in tournament.tables.values():
+            for player in game.players[:5]:
+                player.chips = 0
+        for table_number in list(tournament.tables):
+            tournament.eliminate_busted_players(table_number)
+
+        tournament.balance_tables()
+
+        self.assertEqual(8, tournament.num_remaining)
+        self.assertEqual(1, len(tournament.tables))
+        self.assertEqual(8, len(next(iter(tournament.tables.values())).players))
+        self.assertEqual(10, len(tournament.eliminated))
+
+    def test_balance_tables_moves_players(self):
+        tournament = Tournament(num_entrants=27, starting_chips=1000, big_blind=20, seats_per_table=9)
+        game = tournament.tables[0]
+        for player in game.players[:4]:
+            player.chips = 0
+        tournament.eliminate_busted_players(0)
+
+        tournament.balance_tables()
+
+        table_sizes = sorted(len(game.players) for game in tournament.tables.values())
+        self.assertListEqual([7, 8, 8], table_sizes)
+
+    def test_play(self):
+        schedule = BlindSchedule([BlindLevel(10, 20, hands=3), BlindLevel(50, 100, hands=3),
+                                  BlindLevel(200, 400, ante=50)])
+        tournament = Tournament(num_entrants=30, starting_chips=1000, blind_schedule=schedule)
+
+        chip_leaders = tournament.play()
+
+        self.assertEqual(1, len(chip_leaders))
+        self.assertEqual(29, len(tournament.eliminated))
+        self.assertNotIn(chip_leaders[0], tournament.eliminated)
+        self.assertGreater(tournament.hands_played, 0)
@@ -0,0 +1,69 @@
+import random
+
+from src.poker.enums.betting_move import BettingMove
+from src.poker.enums.computer_playing_style import ComputerPlayingStyle
+from src.poker.game import Game
+from src.poker.players.computer import Computer
+from src.poker.prompts.silent_prompt import SilentPresenter
+from src.poker.utils.profiler import Profiler
+from src.poker.utils.tree_search import TreeSearch
+from src.tests.test_utils.test_utils import PokerTestCase
+
+
+class TestTreeSearch(PokerTestCase):
+
+    def setUp(self):
+        self.players = [Computer(name, ComputerPlayingStyle.MCTS) for name in ['Homer', 'Bart']]
+        for player in self.players:
+            player.chips = 1000
+        self.profiler = Profiler()
+        self.game = Game(presenter=SilentPresenter(), players=self.players, big_blind=20, profiler=self.profiler)
+        self.game.deck.rng = random.Random(0)
+        self.search = TreeSearch(iterations=200, rng=random.Random(0))
+
+    def test_choose_legal_move(self):
+        self.game.reset()
+
+        move = self.search.choose_move(self.game, self.game.current_player())
+
+        self.assertIn(move, self.game.legal_actions())
+        self.assertEqual(200, self.search.simulations)
+        self.assertEqual(200, self.search.root.visits)
+        self.assertEqual(200, self.profiler.throughput['mcts.simulations'].count)
+
+    def test_time_limit(self):
+        self.search.iterations = 10 ** 9
+        self.search.time_limit = 0.05
+        self.game.reset()
+
+        self.search.choose_move(self.game, self.game.current_player())
+
+        self.assertLess(self.search.simulations, 10 ** 9)
+
+    def test_reuses_subtree_in_same_hand(self):
+        self.game.reset()
+        player = self.game.current_player()
+        self.search.choose_move(self.game, player)
+        subtree = self.search.root.children[BettingMove.CALLED].children[BettingMove.CHECKED]
+        self.game.step(BettingMove.CALLED)
+        self.game.step(BettingMove.CHECKED)
+
+        self.assertIs(player, self.game.current_player())
+        self.assertIs(subtree, self.search.reuse_subtree(self.game))
+        self.search.choose_move(self.game, player)
+        self.assertIs(subtree, self.search.root)
+
+    def test_new_tree_next_hand(self):
+        self.game.reset()
+        self.search.choose_move(self.game, self.game.current_player())
+        self.game.step(BettingMove.FOLDED)
+        self.game.reset()
+
+        self.assertIsNone(self.search.reuse_subtree(self.game))
+
+    def test_computer_plays_hands(self):
+        for _ in range(3):
+            self.game.play_hand()
+
+        self.assertEqual(2000, sum(player.chips for player in self.players))
+        self.assertGreater(self.profiler.throughput['mcts.simulations'].calls, 0)
@@ -1,6 +1,8 @@
 import re
 from unittest import TestCase
 
+from src.poker.card import Card
+
 
 class PokerTestCase(TestCase):
     def assertEqualStripColor(self, a: str, b: str):
@@ -12,3 +14,19 @@ def _strip_color(s: str):
     """Strips the color-coding sequences from a string"""
     s = re.sub(r'\x1b\[([0-9,A-Z]{1,2}(;[0-9]{1,2})?(;[0-9]{3})?)?[m|K]?', '', s)
     return re.sub(r'\x1b\(B', '', s)
+
+
+def cards_from_str(s: str):
+    """Builds a list of cards from a string like 'AH KH 10D'."""
+    ranks = {'J': 11, 'Q': 12, 'K': 13, 'A': 14}
+    return [Card(ranks.get(c[:-1]) or int(c[:-1]), c[-1]) for c in s.split()]
+
+
+def make_player(name: str, hand: str):
+    """Builds a player holding the cards of a string like 'AH KH'."""
+    # Imported here since the test_player module imports this one
+    from src.tests.test_player.test_player import MockConcretePlayerClass
+
+    player = MockConcretePlayerClass(name)
+    player.hand = cards_from_str(hand)
+    return player
@@ -0,0 +1,88 @@
+import numpy as np
+
+from src.poker.enums.computer_playing_style import ComputerPlayingStyle
+from src.poker.vector_env import (ALL_IN, BET_OR_RAISE, CHECK_OR_CALL, FOLD, OBS_BET, OBS_BOARD, OBS_CHIPS, OBS_HOLE,
+                                  OBS_LAST_BET, OBS_NUM_TIMES_RAISED, OBS_PHASE, OBS_RAISE_AMOUNT, OBS_SIZE, VectorEnv,
+                                  style_policy)
+from src.tests.test_utils.test_utils import PokerTestCase
+
+
+class TestVectorEnv(PokerTestCase):
+
+    def test_reset_observes_first_decisions(self):
+        env = VectorEnv(num_tables=8, num_players=3, seed=1)
+
+        observations = env.reset()
+
+        self.assertEqual((8, OBS_SIZE), observations.shape)
+        self.assertTrue((observations[:, OBS_HOLE] >= 0).all())
+        self.assertTrue((observations[:, OBS_BOARD] == -1).all())
+        self.assertTrue((observations[:, OBS_PHASE] == 1).all())
+        self.assertTrue(env.legal_actions[:, FOLD].all())
+
+    def test_step_returns_preallocated_observations(self):
+        env = VectorEnv(num_tables=4, seed=1)
+        observations = env.reset()
+
+        next_observations, hands_over = env.step(np.full(4, FOLD))
+
+        self.assertIs(observations, next_observations)
+        self.assertEqual((4,), hands_over.shape)
+
+    def test_illegal_action_raises(self):
+        env = VectorEnv(num_tables=1, seed=1)
+        env.reset()
+
+        self.assertFalse(env.legal_actions[0, ALL_IN])
+        with self.assertRaises(ValueError):
+            env.step(np.array([ALL_IN]))
+
+    def test_style_policies_keep_chips(self):
+        env = VectorEnv(num_tables=50, num_players=4, starting_chips=200, seed=2)
+        observations = env.reset()
+        rng = np.random.default_rng(2)
+        hands_played = 0
+        for style in [ComputerPlayingStyle.SAFE, ComputerPlayingStyle.RISKY, ComputerPlayingStyle.RANDOM] * 100:
+            actions = style_policy(style, observations, rng)
+            self.assertTrue(env.legal_actions[np.arange(50), actions].all())
+            observations, hands_over = env.step(actions)
+            hands_played += hands_over.sum()
+
+        chips_in_play = sum(sum(pot[0] for pot in game.table.pots) + sum(player.bet for player in game.players)
+                            for game in env.games)
+        self.assertGreater(hands_played, 50)
+        # Split pots that do not divide evenly lose their odd chips
+        self.assertAlmostEqual(0, env.chips_won().sum() + chips_in_play, delta=hands_played)
+
+
+class TestStylePolicy(PokerTestCase):
+
+    def observations(self, chips, bet, last_bet, raise_amount, num_times_raised, n=20000):
+        observations = np.zeros((n, OBS_SIZE), dtype=np.int64)
+        observations[:, OBS_CHIPS] = chips
+        observations[:, OBS_BET] = bet
+        observations[:, OBS_LAST_BET] = last_bet
+        observations[:, OBS_RAISE_AMOUNT] = raise_amount
+        observations[:, OBS_NUM_TIMES_RAISED] = num_times_raised
+        return observations
+
+    def test_safe_checks_most_of_the_time(self):
+        actions = style_policy(ComputerPlayingStyle.SAFE, self.observations(1000, 20, 20, 40, 0),
+                               np.random.default_rng(0))
+
+        self.assertAlmostEqual(0.7, np.mean(actions == CHECK_OR_CALL), delta=0.02)
+        self.assertAlmostEqual(0.2, np.mean(actions == BET_OR_RAISE), delta=0.02)
+        self.assertAlmostEqual(0.1, np.mean(actions == FOLD), delta=0.02)
+
+    def test_risky_short_stack_goes_all_in(self):
+        actions = style_policy(ComputerPlayingStyle.RISKY, self.observations(10, 0, 20, 40, 0),
+                               np.random.default_rng(0))
+
+        self.assertEqual({ALL_IN, FOLD}, set(actions.tolist()))
+        self.assertAlmostEqual(0.9, np.mean(actions == ALL_IN), delta=0.02)
+
+    def test_capped_raises_only_call_or_fold(self):
+        actions = style_policy(ComputerPlayingStyle.RANDOM, self.observations(1000, 20, 100, 120, 4),
+                               np.random.default_rng(0))
+
+        self.assertEqual({CHECK_OR_CALL, FOLD}, set(actions.tolist()))